@@ -0,0 +1,185 @@
+"""
+Local OpenAI-compatible stub for offline benchmarks.
+
+It serves POST /v1/chat/completions with responses that are valid for the json_schema of the
+request, after a configurable latency, and reports token usage like the real API:
+- declaration extraction requests are answered by running DeclarationParser on the page text
+  (raw HTML pages are reduced with reduce_declaration_html first),
+- multi-person article requests return one entry per listed person,
+- any other schema gets deterministic values derived from the prompt,
+- requests without a response_format get a short markdown summary.
+The first fail_first requests can be answered with an error status instead, to exercise retries.
+
+Usage:
+    python -m benchmarks.fake_openai --port 8765 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python main.py --headless <url>
+"""
+import re
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bs4 import BeautifulSoup
+
+from src.tools.declaration_parser import DeclarationParser
+from src.tools.html_reducer import reduce_declaration_html
+
+
+def schema_value(schema, seed):
+    """Build a deterministic value that validates against a (strict) JSON schema."""
+    if "enum" in schema:
+        return schema["enum"][seed % len(schema["enum"])]
+    if "anyOf" in schema:
+        return schema_value(schema["anyOf"][0], seed)
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        return {name: schema_value(prop, zlib.crc32(f"{seed}{name}".encode()))
+                for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind == "boolean":
+        return seed % 3 == 0
+    if kind == "integer":
+        return seed % 3
+    if kind == "number":
+        return float(seed % 1000)
+    if kind == "string":
+        return "Synthetic response."
+    return None
+
+
+class FakeOpenAIServer:
+    """Threaded OpenAI-compatible chat completions stub."""
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, fail_first=0, fail_status=429,
+                 retry_after=None):
+        """
+        Initialize the FakeOpenAIServer.
+
+        :param port: Port to listen on, 0 picks a free one.
+        :param latency: Seconds every response is delayed by.
+        :param jitter: Random extra delay of up to this many seconds.
+        :param fail_first: Number of first requests answered with fail_status.
+        :param fail_status: HTTP status of the failed requests, e.g. 429 or 503.
+        :param retry_after: Value of the Retry-After header of the failed responses, or None to send none.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.parser = DeclarationParser()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def complete(self, body):
+        """Return the message content answering a chat completion request."""
+        messages = body.get("messages", [])
+        prompt = "\n".join(message.get("content") or "" for message in messages)
+        response_format = body.get("response_format")
+        if not response_format:
+            return "## Summary\nSynthetic summary of the findings."
+        json_schema = response_format["json_schema"]
+        name, schema = json_schema.get("name"), json_schema["schema"]
+        if name == "declaration_extraction":
+            page_text = (messages[-1].get("content") or "").split("\n", 1)[-1]
+            if page_text.lstrip().startswith("<"):
+                soup = BeautifulSoup(page_text, "html.parser")
+                page_text = reduce_declaration_html(soup.find("div", class_="wrapper") or soup)
+            return json.dumps(self.parser.parse_text(page_text)[0], ensure_ascii=False)
+        if name == "article_multi_person_analysis":
+            entry_schema = schema["properties"]["persons"]["items"]
+            persons = []
+            for person in re.findall(r'^\s*- "(.*)"$', prompt, flags=re.MULTILINE):
+                entry = schema_value(entry_schema, zlib.crc32((person + prompt).encode()))
+                entry["person_name"] = person
+                persons.append(entry)
+            return json.dumps({"persons": persons}, ensure_ascii=False)
+        return json.dumps(schema_value(schema, zlib.crc32(prompt.encode())), ensure_ascii=False)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    failed = server.requests <= server.fail_first
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.latency + random.uniform(0, server.jitter))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                if failed:
+                    error = json.dumps({"error": {"message": "Synthetic failure.", "type": "fake_error"}}).encode("utf-8")
+                    self.send_response(server.fail_status)
+                    self.send_header("Content-Type", "application/json")
+                    if server.retry_after is not None:
+                        self.send_header("Retry-After", str(server.retry_after))
+                    self.send_header("Content-Length", str(len(error)))
+                    self.end_headers()
+                    self.wfile.write(error)
+                    return
+                content = server.complete(body)
+                prompt_tokens = sum(len(message.get("content") or "") for message in body.get("messages", [])) // 4
+                completion_tokens = len(content) // 4
+                data = json.dumps({
+                    "id": f"chatcmpl-fake-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},
+                }, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(port=args.port, latency=args.latency, jitter=args.jitter)
+    print(f"Serving a fake OpenAI API on {fake.base_url}")
+    fake.start()._thread.join()
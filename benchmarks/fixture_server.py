@@ -0,0 +1,204 @@
+"""
+Local HTTP server replaying youcontrol and bihus.info pages from the templates in
+benchmarks/fixtures, so scraping benchmarks run offline and deterministically.
+
+The templates keep the markup the scrapers read (div.wrapper with label/value tables and section
+tables on youcontrol, the admin-ajax article list and div.bi-single-content on Bihus). Routes:
+- /person/<i>/                               politician page linking their declarations
+- /catalog/individuals/declaration/<i>-<k>/  declaration page
+- /wp-admin/admin-ajax.php                   Bihus article list (JSON with an "html" field)
+- /news/<i>/                                 Bihus article page
+
+Politicians are the people of benchmarks.synthetic_corpus, so their names match the synthetic corpus.
+Article pages can be made to fail a number of times with a 503, to exercise retries and failed fetches.
+
+Usage:
+    python -m benchmarks.fixture_server --port 8766
+"""
+import os
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from string import Template
+from datetime import date, timedelta
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic_corpus import people, WORDS, ORGS, PLACES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_template(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def table_rows(rows):
+    return "\n".join("    <tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+
+
+class FixtureServer:
+    """Threaded server for the youcontrol and Bihus fixtures."""
+    def __init__(self, host="127.0.0.1", port=0, n_people=2000, declarations_per_person=4, llm_every=4,
+                 n_articles=5000, latency=0.0, article_failures=None):
+        """
+        Initialize the FixtureServer.
+
+        :param n_people: Number of politicians with a page.
+        :param declarations_per_person: Number of declarations linked from every politician page.
+        :param llm_every: Every llm_every-th declaration misses a field, so its extraction falls back to the LLM.
+                          0 keeps every declaration on the rule-based fast path.
+        :param n_articles: Number of articles in the Bihus list. Crawls should stop at a date within the
+                           list, since BihusParser only stops paging when it reaches an older article.
+        :param latency: Seconds every response is delayed by.
+        :param article_failures: {article index: n}, the first n requests of these article pages are answered with a 503.
+        """
+        self.people = people(n_people)
+        self.declarations_per_person = declarations_per_person
+        self.llm_every = llm_every
+        self.n_articles = n_articles
+        self.latency = latency
+        self.article_failures = dict(article_failures or {})
+        self.templates = {name: load_template(f"{name}.html")
+                          for name in ["youcontrol_person", "youcontrol_declaration", "bihus_list_item", "bihus_article"]}
+        self.requests = 0
+        self.paths = []
+        self.article_requests = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def person_url(self, i):
+        return f"{self.base_url}/person/{i}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def person_page(self, i):
+        links = "\n".join(f'    <a href="/catalog/individuals/declaration/{i}-{k}/">Декларація за {2024 - k} рік</a>'
+                          for k in range(self.declarations_per_person))
+        return self.templates["youcontrol_person"].substitute(full_name=self._full_name(i), declaration_links=links)
+
+    def declaration_page(self, i, k):
+        rng = random.Random(i * 1000 + k)
+        on_fast_path = not self.llm_every or (i + k) % self.llm_every
+        return self.templates["youcontrol_declaration"].substitute(
+            full_name=self._full_name(i),
+            year=2024 - k,
+            place_of_work=rng.choice(ORGS),
+            position_row="    <tr><td>Займана посада</td><td>Народний депутат</td></tr>" if on_fast_path else "",
+            spouse=f"{rng.choice(people(50))} {rng.choice(['Олександрівна', 'Петрівна'])}",
+            real_estate_rows=table_rows(
+                [["Квартира", f"{rng.randint(40, 200)}", rng.choice(PLACES), f"{rng.randint(5, 90) * 100000}", "UAH"]
+                 for _ in range(rng.randint(1, 3))]),
+            vehicle_rows=table_rows(
+                [[rng.choice(["Toyota Camry", "BMW X5", "Skoda Octavia"]), f"{rng.randint(3, 60) * 10000}", "USD"]]),
+            income_rows=table_rows(
+                [[rng.choice(ORGS), "Заробітна плата", f"{rng.randint(2, 30) * 100000}", "UAH"],
+                 [rng.choice(people(50)), "Подарунок у грошовій формі", f"{rng.randint(0, 5) * 50000}", "UAH"]]),
+            asset_rows=table_rows(
+                [["Готівкові кошти", f"{rng.randint(1, 50) * 10000}", rng.choice(["USD", "UAH", "EUR"])]]),
+        )
+
+    @staticmethod
+    def article_date(i):
+        """Publication date of the i-th newest article (three articles a day)."""
+        return (date(2024, 12, 31) - timedelta(days=i // 3)).isoformat()
+
+    def bihus_list(self, offset, per_page):
+        items = []
+        for i in range(offset, min(offset + per_page, self.n_articles)):
+            items.append(self.templates["bihus_list_item"].substitute(
+                link=f"{self.base_url}/news/{i}/", title=f"Розслідування {i}", date=self.article_date(i)))
+        return json.dumps({"html": "\n".join(items)}, ensure_ascii=False)
+
+    def bihus_article(self, i):
+        rng = random.Random(i)
+        paragraphs = "\n".join(
+            f"    <p>{rng.choice(self.people)} {' '.join(rng.choices(WORDS, k=40))}.</p>" for _ in range(8))
+        return self.templates["bihus_article"].substitute(title=f"Розслідування {i}", paragraphs=paragraphs)
+
+    def _full_name(self, i):
+        name, surname = self.people[i % len(self.people)].split(" ", 1)
+        return f"{surname} {name} Іванович"
+
+    def route(self, path, query):
+        """Return (status, content type, body) for a request path."""
+        parts = [part for part in path.split("/") if part]
+        if parts[:1] == ["person"] and len(parts) == 2:
+            return 200, "text/html; charset=utf-8", self.person_page(int(parts[1]))
+        if parts[:3] == ["catalog", "individuals", "declaration"] and len(parts) == 4:
+            i, k = parts[3].split("-")
+            return 200, "text/html; charset=utf-8", self.declaration_page(int(i), int(k))
+        if path == "/wp-admin/admin-ajax.php":
+            offset = int(query.get("offset", ["0"])[0])
+            per_page = int(query.get("posts_per_page", ["24"])[0])
+            return 200, "application/json", self.bihus_list(offset, per_page)
+        if parts[:1] == ["news"] and len(parts) == 2:
+            i = int(parts[1])
+            with self._lock:
+                self.article_requests[i] += 1
+                failed = self.article_requests[i] <= self.article_failures.get(i, 0)
+            if failed:
+                return 503, "text/plain", "Service unavailable"
+            return 200, "text/html; charset=utf-8", self.bihus_article(i)
+        return 404, "text/plain", "Not found"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server.paths.append(urlparse(self.path).path)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.latency)
+                    url = urlparse(self.path)
+                    status, content_type, body = server.route(url.path, parse_qs(url.query))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fixtures = FixtureServer(port=args.port, latency=args.latency)
+    print(f"Serving fixtures on {fixtures.base_url} (e.g. {fixtures.person_url(0)})")
+    fixtures.start()._thread.join()
@@ -0,0 +1,65 @@
+"""
+Benchmark of the import time of the entry points and src.tools modules, each measured in a fresh
+interpreter, and whether importing them pulls in the UI and plotting libraries.
+
+Usage:
+    python -m benchmarks.import_time --repeat 5
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+MODULES = [
+    "main",
+    "src.tools.bulk_screening",
+    "src.tools.shared_tools",
+    "src.tools.report_generator",
+    "src.tools.declaration_scrapping",
+    "src.tools.declaration_analysis",
+    "src.tools.bihus_analyser",
+    "src.tools.bihus_pipeline",
+]
+HEAVY_MODULES = ["gradio", "plotly", "spacy"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """Import a module in repeat fresh interpreters and return its timings and the heavy modules it loaded."""
+    timings = []
+    loaded = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {"module": module, "error": completed.stderr.strip().splitlines()[-1]}
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        loaded = result["loaded"]
+    return {
+        "module": module,
+        "median_seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "heavy_modules_loaded": loaded,
+    }
+
+
+def benchmark(modules, repeat):
+    return {"benchmark": "import_time", "repeat": repeat, "results": [measure(module, repeat) for module in modules]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--module", action="append", default=None, help="Module to measure. All entry points if omitted.")
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.module or MODULES, args.repeat), indent=2))
@@ -0,0 +1,86 @@
+"""
+Benchmark of spaCy NER throughput: the per-document loop used before versus batched nlp.pipe
+with the components NER does not need disabled.
+
+Usage:
+    python -m benchmarks.ner_throughput --corpus-dir ./bihus_parsed_data --docs 500 --n-process 4
+"""
+import os
+import json
+import time
+import random
+import argparse
+
+import spacy
+
+from src.tools.bihus_post_processing import NER_COMPONENTS
+
+WORDS = ["депутат", "міністерство", "розслідування", "компанія", "контракт", "тендер", "бюджет",
+         "квартира", "декларація", "суд", "прокуратура", "власність", "мільйонів", "гривень"]
+NAMES = ["Петро Іваненко", "Олена Шевченко", "Віктор Мельник", "Андрій Коваленко", "Наталія Бондаренко"]
+PLACES = ["Київ", "Львів", "Одеса", "Харків", "Дніпро"]
+
+
+def synthetic_corpus(n_docs, paragraphs=8, seed=0):
+    """Generate Bihus-like article bodies mentioning persons, places and organizations."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n_docs):
+        lines = []
+        for _ in range(paragraphs):
+            words = rng.choices(WORDS, k=30)
+            words.insert(rng.randrange(len(words)), rng.choice(NAMES))
+            words.insert(rng.randrange(len(words)), rng.choice(PLACES))
+            lines.append(" ".join(words).capitalize() + ".")
+        docs.append("\n".join(lines))
+    return docs
+
+
+def load_corpus(corpus_dir, n_docs):
+    """Load the content of up to n_docs per-article JSON files."""
+    docs = []
+    for file in sorted(os.listdir(corpus_dir)):
+        if file.endswith(".json"):
+            with open(os.path.join(corpus_dir, file), "r", encoding="utf-8") as f:
+                docs.append(json.load(f).get("content", ""))
+            if len(docs) >= n_docs:
+                break
+    return docs
+
+
+def benchmark(docs, model_name, batch_size, n_process):
+    nlp = spacy.load(model_name)
+    start = time.perf_counter()
+    for doc in docs:
+        nlp(doc)
+    loop_seconds = time.perf_counter() - start
+
+    nlp.select_pipes(disable=[name for name in nlp.pipe_names if name not in NER_COMPONENTS])
+    start = time.perf_counter()
+    for _ in nlp.pipe(docs, batch_size=batch_size, n_process=n_process):
+        pass
+    pipe_seconds = time.perf_counter() - start
+
+    return {
+        "benchmark": "ner_throughput",
+        "model": model_name,
+        "docs": len(docs),
+        "batch_size": batch_size,
+        "n_process": n_process,
+        "loop_docs_per_second": len(docs) / loop_seconds,
+        "pipe_docs_per_second": len(docs) / pipe_seconds,
+        "speedup": loop_seconds / pipe_seconds,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="uk_core_news_sm")
+    parser.add_argument("--corpus-dir", default=None, help="Directory of per-article JSON files. Synthetic if omitted.")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir, args.docs) if args.corpus_dir else synthetic_corpus(args.docs)
+    print(json.dumps(benchmark(corpus, args.model, args.batch_size, args.n_process), indent=2))
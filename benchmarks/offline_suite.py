@@ -0,0 +1,321 @@
+"""
+Offline end-to-end benchmark suite.
+
+Everything runs against local stand-ins: a fake OpenAI-compatible API with configurable latency
+(benchmarks.fake_openai), youcontrol and Bihus fixture pages (benchmarks.fixture_server) and a
+synthetic article corpus (benchmarks.synthetic_corpus), inside a temporary working directory so
+no cache, store or index of the checkout is read or written.
+
+Benchmarks:
+- analyzer_load:   ArticleAnalyzer start-up on the synthetic ArticleStore, cold and with a saved index
+- analyzer_match:  person index lookups and analyze_person with the fake LLM
+- merge_variants:  IdentityIdentifier variant merging against the pairwise baseline
+- scraping:        ScrapingTool.extract_declarations_data, fresh and with stored declarations
+- bihus_crawl:     BihusParser crawl of the fixture article list
+- analyze_url:     full per-politician pipeline throughput (main.analyze_url when plotly is
+                   installed, screen_politician otherwise)
+
+Results are printed as JSON together with the commit they were measured on; --output writes them
+to a file and --compare prints the change of every number against an earlier results file.
+
+Usage:
+    python -m benchmarks.offline_suite --articles 20000 --politicians 20 --latency 0.05 --output bench.json
+    python -m benchmarks.offline_suite --only merge_variants --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+from fuzzywuzzy import fuzz
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.synthetic_corpus import generate_articles, write_store, people, name_variant, ORGS, PLACES
+
+BENCHMARKS = ["analyzer_load", "analyzer_match", "merge_variants", "scraping", "bihus_crawl", "analyze_url"]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def pairwise_merge(entity_list, threshold=80):
+    """The original all-pairs merge_variants loop, kept as the baseline."""
+    unique_entities = []
+    for entity in entity_list:
+        if not any(fuzz.ratio(entity, unique_entity) > threshold for unique_entity in unique_entities):
+            unique_entities.append(entity)
+    return unique_entities
+
+
+def bench_analyzer_load(context):
+    from src.tools.bihus_analyser import ArticleAnalyzer
+
+    start = time.perf_counter()
+    written = write_store("./bihus_store", generate_articles(context["articles"], context["people"]))
+    generation_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer = ArticleAnalyzer(verdicts_path=None)
+    cold_seconds = time.perf_counter() - start
+    analyzer.person_index.save()
+
+    start = time.perf_counter()
+    analyzer = ArticleAnalyzer(verdicts_path=None, max_workers=8)
+    warm_seconds = time.perf_counter() - start
+    context["analyzer"] = analyzer
+    return {
+        "articles": written,
+        "corpus_generation_seconds": generation_seconds,
+        "cold_load_seconds": cold_seconds,
+        "warm_load_seconds": warm_seconds,
+    }
+
+
+def bench_analyzer_match(context):
+    analyzer = context["analyzer"]
+    rng = random.Random(1)
+    population = people(context["people"])
+    targets = [name_variant(rng.choice(population), rng) for _ in range(context["lookups"])]
+
+    start = time.perf_counter()
+    matches = sum(len(analyzer.person_index.lookup(target)) for target in targets)
+    lookup_seconds = time.perf_counter() - start
+
+    analyzed_names = population[:context["analyzed_people"]]
+    start = time.perf_counter()
+    analyzed_articles = sum(len(analyzer.analyze_person(name)["detailed_results"]) for name in analyzed_names)
+    analyze_seconds = time.perf_counter() - start
+    return {
+        "lookups": len(targets),
+        "lookups_per_second": len(targets) / lookup_seconds,
+        "mean_matches": matches / len(targets),
+        "analyzed_people": len(analyzed_names),
+        "analyzed_articles": analyzed_articles,
+        "analyzed_articles_per_second": analyzed_articles / analyze_seconds if analyze_seconds else None,
+        "analyze_seconds": analyze_seconds,
+    }
+
+
+def bench_merge_variants(context):
+    from src.tools.entity_clustering import merge_entity_variants
+
+    rng = random.Random(2)
+    population = people(context["people"])
+    results = []
+    for size in context["merge_sizes"]:
+        entities = [rng.choice([name_variant(rng.choice(population), rng), rng.choice(ORGS), rng.choice(PLACES)])
+                    for _ in range(size)]
+        start = time.perf_counter()
+        merged = merge_entity_variants(entities)
+        clustered_seconds = time.perf_counter() - start
+        row = {"entities": size, "clusters": len(merged), "clustered_seconds": clustered_seconds}
+        if size <= context["baseline_max"]:
+            start = time.perf_counter()
+            baseline = pairwise_merge(entities)
+            row["pairwise_seconds"] = time.perf_counter() - start
+            row["speedup"] = row["pairwise_seconds"] / clustered_seconds if clustered_seconds else None
+            row["same_clusters"] = baseline == merged
+        results.append(row)
+    return {"sizes": results}
+
+
+def bench_scraping(context):
+    from src.tools.declaration_scrapping import ScrapingTool
+
+    fixtures = context["fixtures"]
+    tool = ScrapingTool(store_path="./declarations_scraping_bench.sqlite", reduce_html=True,
+                        use_fast_path=True)
+    tool.base_url = fixtures.base_url
+    urls = [fixtures.person_url(i) for i in range(context["politicians"])]
+    timings = {}
+    declarations = 0
+    for run in ["fresh", "stored"]:
+        start = time.perf_counter()
+        declarations = sum(len(tool.extract_declarations_data(url) or []) for url in urls)
+        timings[run] = time.perf_counter() - start
+    return {
+        "politicians": len(urls),
+        "declarations": declarations,
+        "fresh_seconds": timings["fresh"],
+        "fresh_declarations_per_second": declarations / timings["fresh"],
+        "stored_seconds": timings["stored"],
+        "fast_path_ratio": tool.fast_path_ratio(),
+    }
+
+
+def bench_bihus_crawl(context):
+    from src.tools.bihus_scrapper import BihusParser
+
+    fixtures = context["fixtures"]
+    parser = BihusParser(base_url=f"{fixtures.base_url}/wp-admin/admin-ajax.php", save_dir="./bihus_crawl_bench",
+                         store_dir="./bihus_crawl_store", state_path="./bihus_crawl_state.json", min_interval=0)
+    until_date = fixtures.article_date(context["crawl_articles"])
+    start = time.perf_counter()
+    parser.parse_until_date(until_date, posts_per_page=50)
+    crawl_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parser.parse_until_date(until_date, posts_per_page=50)
+    refresh_seconds = time.perf_counter() - start
+    return {
+        "articles": len(parser.store),
+        "crawl_seconds": crawl_seconds,
+        "articles_per_second": len(parser.store) / crawl_seconds,
+        "incremental_refresh_seconds": refresh_seconds,
+    }
+
+
+def bench_analyze_url(context):
+    from src.tools.shared_tools import get_shared_tools
+    from src.tools.bulk_screening import screen_politician
+
+    fixtures = context["fixtures"]
+    tools = get_shared_tools()
+    tools.scraping_tool.base_url = fixtures.base_url
+    tools.scraping_tool.reduce_html = True
+    offset = context["politicians"]  # Politicians the scraping benchmark did not see
+    urls = [fixtures.person_url(offset + i) for i in range(context["politicians"])]
+    try:
+        import plotly  # noqa: F401
+        import main
+
+        def run(url):
+            for _ in main.analyze_url(url):
+                pass
+        mode = "analyze_url"
+    except ImportError:
+        def run(url):
+            screen_politician(url, tools.scraping_tool, tools.declaration_analysis_tool, tools.analyzer)
+        mode = "screen_politician"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=context["workers"]) as executor:
+        list(executor.map(run, urls))
+    seconds = time.perf_counter() - start
+
+    # Check the run analyzed real politicians; declarations and LLM responses are cached by now
+    matched_articles = []
+    for url in urls:
+        result = screen_politician(url, tools.scraping_tool, tools.declaration_analysis_tool, tools.analyzer)
+        assert result.get("politician", "").strip(), f"No politician name extracted from {url}: {result.get('error')}"
+        matched_articles.append(len(result["bihus_analysis"]["detailed_results"]))
+        assert matched_articles[-1], f"{result['politician']} ({url}) matched no articles"
+    return {
+        "mode": mode,
+        "politicians": len(urls),
+        "workers": context["workers"],
+        "seconds": seconds,
+        "politicians_per_minute": len(urls) / seconds * 60,
+        "mean_matched_articles": sum(matched_articles) / len(matched_articles),
+    }
+
+
+def compare(results, previous):
+    """Print the relative change of every number shared by two results files."""
+    def numbers(data, prefix=""):
+        if isinstance(data, dict):
+            for key, value in data.items():
+                yield from numbers(value, f"{prefix}.{key}" if prefix else key)
+        elif isinstance(data, list):
+            for i, value in enumerate(data):
+                yield from numbers(value, f"{prefix}[{i}]")
+        elif isinstance(data, (int, float)) and not isinstance(data, bool):
+            yield prefix, data
+
+    old = dict(numbers(previous["results"]))
+    print(f"Compared with {previous.get('commit')}:")
+    for key, value in numbers(results["results"]):
+        if key in old and old[key]:
+            print(f"  {key}: {old[key]:.4g} -> {value:.4g} ({(value - old[key]) / old[key] * 100:+.1f}%)")
+
+
+def run_suite(args):
+    workdir = tempfile.mkdtemp(prefix="govwatcher_bench_")
+    cwd = os.getcwd()
+    fake_openai = FakeOpenAIServer(latency=args.latency, jitter=args.latency / 2).start()
+    fixtures = FixtureServer(n_people=args.people, latency=args.http_latency).start()
+    os.environ.update({
+        "OPENAI_BASE_URL": fake_openai.base_url,
+        "OPENAI_API_KEY": "fake",
+        "LLM_CACHE_PATH": os.path.join(workdir, ".llm_cache.sqlite"),
+    })
+    context = {
+        "fixtures": fixtures,
+        "articles": args.articles,
+        "people": args.people,
+        "lookups": args.lookups,
+        "analyzed_people": args.analyzed_people,
+        "merge_sizes": args.merge_sizes,
+        "baseline_max": args.baseline_max,
+        "politicians": args.politicians,
+        "workers": args.workers,
+        "crawl_articles": args.crawl_articles,
+    }
+    selected = args.only or BENCHMARKS
+    if "analyzer_match" in selected or "analyze_url" in selected:
+        selected = list(dict.fromkeys(["analyzer_load"] + selected))
+    results = {}
+    try:
+        os.chdir(workdir)
+        for name in BENCHMARKS:
+            if name not in selected:
+                continue
+            print(f"Running {name}...", file=sys.stderr)
+            requests_before = fake_openai.requests
+            with redirect_stdout(sys.stderr):  # Keep stdout for the JSON results
+                results[name] = globals()[f"bench_{name}"](context)
+            results[name]["llm_requests"] = fake_openai.requests - requests_before
+    finally:
+        os.chdir(cwd)
+        fake_openai.stop()
+        fixtures.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "suite": "offline",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "only")},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--people", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--analyzed-people", type=int, default=5)
+    parser.add_argument("--merge-sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--baseline-max", type=int, default=2000, help="Largest size the pairwise baseline runs on.")
+    parser.add_argument("--politicians", type=int, default=20)
+    parser.add_argument("--crawl-articles", type=int, default=500, help="Approximate number of Bihus articles crawled.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of fake OpenAI latency.")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Seconds of fixture server latency.")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=None)
+    parser.add_argument("--output", default=None, help="JSON file to write the results to.")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare with.")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
@@ -0,0 +1,122 @@
+"""
+Synthetic Bihus corpus generator: articles with PER/ORG/LOC entities written to an ArticleStore
+or to the per-article JSON layout, scaling to 100k+ articles with bounded memory.
+
+Usage:
+    python -m benchmarks.synthetic_corpus --articles 100000 --output ./bench_store
+    python -m benchmarks.synthetic_corpus --articles 5000 --output ./bench_json --layout json
+"""
+import os
+import json
+import random
+import argparse
+from datetime import date, timedelta
+
+from src.tools.article_store import ArticleStore
+
+NAMES = ["Петро", "Олена", "Віктор", "Андрій", "Наталія", "Ігор", "Юлія", "Сергій", "Оксана", "Максим",
+         "Ірина", "Олександр", "Тетяна", "Дмитро", "Світлана", "Богдан", "Галина", "Роман", "Марія", "Василь"]
+SURNAMES = ["Іваненко", "Шевченко", "Мельник", "Коваленко", "Бондаренко", "Ткаченко", "Кравченко", "Олійник",
+            "Шевчук", "Поліщук", "Бойко", "Ткачук", "Марченко", "Руденко", "Савченко", "Лисенко", "Петренко",
+            "Клименко", "Павленко", "Кравчук", "Гончаренко", "Левченко", "Литвиненко", "Сидоренко", "Мороз"]
+ORGS = ["Укроборонпром", "Міністерство оборони", "НАБУ", "САП", "ДБР", "Нафтогаз", "Укрзалізниця",
+        "Офіс президента", "Верховна Рада", "Київська міська рада", "АРМА", "Державна митна служба"]
+PLACES = ["Київ", "Львів", "Одеса", "Харків", "Дніпро", "Запоріжжя", "Вінниця", "Полтава", "Чернігів"]
+WORDS = ["депутат", "міністерство", "розслідування", "компанія", "контракт", "тендер", "бюджет",
+         "квартира", "декларація", "суд", "прокуратура", "власність", "мільйонів", "гривень", "схема"]
+
+
+def people(n_people, seed=0):
+    """Return n_people distinct "Name Surname" strings."""
+    pool = [f"{name} {surname}" for surname in SURNAMES for name in NAMES]
+    rng = random.Random(seed)
+    rng.shuffle(pool)
+    while len(pool) < n_people:
+        pool.append(f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}-{len(pool)}")
+    return pool[:n_people]
+
+
+def name_variant(person, rng):
+    """Return a spelling variant of a person name, as NER finds them in real articles."""
+    name, surname = person.split(" ", 1)
+    variant = rng.random()
+    if variant < 0.2:
+        return f"{surname} {name}"
+    if variant < 0.35:
+        return f"{name[0]}. {surname}"
+    if variant < 0.5:
+        return f"{name} {surname}а"
+    return person
+
+
+def generate_articles(n_articles, n_people=2000, paragraphs=6, persons_per_article=3, seed=0):
+    """
+    Generate Bihus-like articles lazily.
+
+    :return: Generator of (article_id, article) pairs with title, link, date, content and entities_included.
+    """
+    rng = random.Random(seed)
+    population = people(n_people, seed)
+    day = date(2024, 12, 31)
+    ids_per_day = {}
+    for i in range(n_articles):
+        if rng.random() < 0.3:
+            day -= timedelta(days=1)
+        mentioned = rng.sample(population, k=min(persons_per_article, len(population)))
+        per = [name_variant(person, rng) for person in mentioned for _ in range(rng.randint(1, 3))]
+        orgs = rng.sample(ORGS, k=2)
+        places = rng.sample(PLACES, k=2)
+        lines = []
+        for p in range(paragraphs):
+            words = rng.choices(WORDS, k=25)
+            words.insert(rng.randrange(len(words)), per[p % len(per)])
+            words.insert(rng.randrange(len(words)), orgs[p % 2])
+            words.insert(rng.randrange(len(words)), places[p % 2])
+            lines.append(" ".join(words).capitalize() + ".")
+        day_str = day.strftime("%d-%m-%Y")
+        count = ids_per_day.get(day_str, 0)
+        ids_per_day[day_str] = count + 1
+        article_id = f"{day_str}.json" if count == 0 else f"{day_str}_{count}.json"
+        yield article_id, {
+            "date": day.isoformat(),
+            "title": f"{orgs[0]}: {rng.choice(WORDS)} {mentioned[0]}",
+            "link": f"https://bihus.info/news/synthetic-{i}/",
+            "content": "\n".join(lines),
+            "entities_included": {"PER": list(dict.fromkeys(per)), "ORG": orgs, "LOC": places},
+        }
+
+
+def write_store(path, articles):
+    """Write articles to an ArticleStore and return the number written."""
+    store = ArticleStore(path)
+    count = 0
+    for article_id, article in articles:
+        store.put(article_id, article)
+        count += 1
+    store.close()
+    return count
+
+
+def write_json(path, articles):
+    """Write articles to the per-article JSON layout and return the number written."""
+    os.makedirs(path, exist_ok=True)
+    count = 0
+    for article_id, article in articles:
+        with open(os.path.join(path, article_id), "w", encoding="utf-8") as f:
+            json.dump(article, f, ensure_ascii=False)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--people", type=int, default=2000)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--layout", choices=["store", "json"], default="store")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generated = generate_articles(args.articles, args.people, seed=args.seed)
+    written = (write_store if args.layout == "store" else write_json)(args.output, generated)
+    print(json.dumps({"articles": written, "layout": args.layout, "output": args.output}))
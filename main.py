@@ -1,60 +1,117 @@
-import gradio as gr
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
 from dotenv import load_dotenv
 
-from src.tools.declaration_scrapping import ScrapingTool
-from src.tools.declaration_analysis import DeclarationAnalysisTool
-from src.tools.bihus_analyser import ArticleAnalyzer
 from src.tools.report_generator import ReportGenerator
+from src.tools.shared_tools import SharedTools, get_shared_tools
+from src.tools.bulk_screening import add_score, screen_politician
+from src.tools.instrumentation import Trace, use_trace, span, propagate, start_metrics_server
+from src.const import ARTICLE_ANALYSIS_MAX_WORKERS, OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE
 load_dotenv()
 
 
 def analyze_url(url: str):
-    scraping_tool = ScrapingTool()
-    declarations_data = scraping_tool.extract_declarations_data(url)
-    print("scrapped declarations")
-
-    declaration_analysis_tool = DeclarationAnalysisTool()
-    declarations_analysis = declaration_analysis_tool.analyze_declarations(declarations_data)
-    print("analyzed declarations")
-
-    bihus_analysis_tool = ArticleAnalyzer()
-    bihus_analysis = bihus_analysis_tool.analyze_person(declarations_data[0]["politician_name"] + " " + declarations_data[0]["politician_surname"])
-    print("analyzed bihus")
-
-    score = 0
-    for key, details in declarations_analysis.items():
-        value = details.get("value")
-        if isinstance(value, bool):
-            score += int(value)
-        elif isinstance(value, (int, float)):
-            score += value
-
-    bihus_final_score = bihus_analysis["aggregated_metrics"].get("final_score", {})
-    for key, value in bihus_final_score.items():
-        if isinstance(value, bool):
-            score += int(value)
-        elif isinstance(value, (int, float)):
-            score += value
-
-    print("final score", score)
-
-    report_gen = ReportGenerator(bihus_analysis, declarations_analysis, score)
-    report = report_gen.generate_report()
-
-    gauge = report_gen.create_score_gauge()
-
-    return gauge, report
-
-demo = gr.Interface(
-    fn=analyze_url,
-    inputs=gr.Textbox(label="Enter URL"),
-    outputs=[
-        gr.Plot(label="Suspicion Gauge"),
-        gr.HTML(label="Summary Report")
-    ],
-    title="Declaration Analysis Tool",
-    description="Enter a URL to a politician's declarations page and get an analysis."
-)
+    """
+    Analyze a politician and stream partial results: the gauge and the declaration findings first,
+    then the media mentions, then the summary.
+
+    The tools and the Bihus corpus are shared by all requests of the process; the request holds the
+    current ArticleAnalyzer until it is done, so a corpus reload does not close it. The Bihus analysis
+    starts as soon as the first declaration (and so the politician's name) is available, running
+    concurrently with the declaration analysis.
+    """
+    tools = get_shared_tools()
+    with tools.use_analyzer() as analyzer:
+        result_trace = Trace()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bihus_futures = []
+
+            def start_bihus_analysis(declaration):
+                name = declaration["politician_name"] + " " + declaration["politician_surname"]
+                bihus_futures.append(executor.submit(propagate(analyzer.analyze_person), name))
+
+            with use_trace(result_trace):
+                declarations_data = tools.scraping_tool.extract_declarations_data(url, on_first_result=start_bihus_analysis)
+                if declarations_data:
+                    print("scrapped declarations")
+                    with span("declaration_analysis"):
+                        declarations_analysis = tools.declaration_analysis_tool.analyze_declarations(declarations_data)
+                    print("analyzed declarations")
+            if not declarations_data:
+                yield None, "<p>Failed to fetch declarations for this URL.</p>"
+                return
+
+            score = add_score(0, (details.get("value") for details in declarations_analysis.values()))
+            report_gen = ReportGenerator({}, declarations_analysis, score, client=tools.client)
+            yield report_gen.create_score_gauge(), report_gen.generate_partial_report("Analyzing media mentions...")
+
+            bihus_analysis = bihus_futures[0].result()
+            print("analyzed bihus")
+
+        bihus_final_score = bihus_analysis["aggregated_metrics"].get("final_score", {})
+        score = add_score(score, bihus_final_score.values())
+        print("final score", score)
+
+        report_gen.bihus_analysis = bihus_analysis
+        report_gen.score = score
+        gauge = report_gen.create_score_gauge()
+        yield gauge, report_gen.generate_partial_report()
+
+        with use_trace(result_trace), span("report"):
+            report = report_gen.generate_report()
+        print("metrics", json.dumps(result_trace.to_dict()))
+        yield gauge, report
+
+
+def build_demo():
+    """Build the Gradio interface. gradio is imported here so headless runs never load it."""
+    import gradio as gr
+
+    return gr.Interface(
+        fn=analyze_url,
+        inputs=gr.Textbox(label="Enter URL"),
+        outputs=[
+            gr.Plot(label="Suspicion Gauge"),
+            gr.HTML(label="Summary Report")
+        ],
+        title="Declaration Analysis Tool",
+        description="Enter a URL to a politician's declarations page and get an analysis."
+    )
+
+
+def run_headless(urls, **options):
+    """
+    Score politicians without the UI and print one JSON result per line.
+
+    :param options: SharedTools arguments, e.g. the article analysis concurrency and rate limits.
+    """
+    tools = SharedTools(reload_interval=None, **options)
+    for url in urls:
+        result = screen_politician(url, tools.scraping_tool, tools.declaration_analysis_tool, tools.analyzer)
+        print(json.dumps(result, ensure_ascii=False))
+
 
 if __name__ == "__main__":
-    demo.launch()
+    arg_parser = argparse.ArgumentParser(description="Declaration Analysis Tool")
+    arg_parser.add_argument("--headless", nargs="+", metavar="URL",
+                            help="Analyze the given declarations page URLs without starting the UI.")
+    arg_parser.add_argument("--article-workers", type=int, default=ARTICLE_ANALYSIS_MAX_WORKERS,
+                            help="Number of articles analyzed concurrently.")
+    arg_parser.add_argument("--requests-per-minute", type=int, default=OPENAI_REQUESTS_PER_MINUTE,
+                            help="OpenAI requests-per-minute limit of the article analysis.")
+    arg_parser.add_argument("--tokens-per-minute", type=int, default=OPENAI_TOKENS_PER_MINUTE,
+                            help="OpenAI tokens-per-minute limit of the article analysis.")
+    arg_parser.add_argument("--metrics-port", type=int, default=None,
+                            help="Serve stage timings and LLM usage on /metrics (Prometheus) and /metrics.json.")
+    args = arg_parser.parse_args()
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+    analyzer_options = {"max_workers": args.article_workers, "requests_per_minute": args.requests_per_minute,
+                        "tokens_per_minute": args.tokens_per_minute}
+    if args.headless:
+        run_headless(args.headless, **analyzer_options)
+    else:
+        get_shared_tools(**analyzer_options)
+        build_demo().launch()
@@ -200,3 +200,62 @@ DECLARATIONS_ANALYSIS_RESPONSE_SCHEMA = {
     ],
     "additionalProperties": False
 }
+
+# Approximate official NBU exchange rates on 31 December of every declaration year (UAH per unit),
+# used to normalize declared amounts to UAH. Years missing here use the nearest year and are flagged.
+CURRENCY_RATES_UAH_BY_YEAR = {
+    2012: {"USD": 7.99, "EUR": 10.54, "GBP": 12.89, "CHF": 8.73, "PLN": 2.58, "RUB": 0.263},
+    2013: {"USD": 7.99, "EUR": 11.04, "GBP": 13.17, "CHF": 9.00, "PLN": 2.66, "RUB": 0.244},
+    2014: {"USD": 15.77, "EUR": 19.23, "GBP": 24.55, "CHF": 15.99, "PLN": 4.50, "RUB": 0.280},
+    2015: {"USD": 24.00, "EUR": 26.22, "GBP": 35.38, "CHF": 24.24, "PLN": 6.15, "RUB": 0.329},
+    2016: {"USD": 27.19, "EUR": 28.42, "GBP": 33.55, "CHF": 26.73, "PLN": 6.50, "RUB": 0.448},
+    2017: {"USD": 28.07, "EUR": 33.50, "GBP": 37.92, "CHF": 28.79, "PLN": 8.06, "RUB": 0.487},
+    2018: {"USD": 27.69, "EUR": 31.71, "GBP": 35.30, "CHF": 28.11, "PLN": 7.37, "RUB": 0.398},
+    2019: {"USD": 23.69, "EUR": 26.42, "GBP": 31.27, "CHF": 24.47, "PLN": 6.25, "RUB": 0.383},
+    2020: {"USD": 28.27, "EUR": 34.74, "GBP": 38.62, "CHF": 31.98, "PLN": 7.58, "RUB": 0.383},
+    2021: {"USD": 27.28, "EUR": 30.92, "GBP": 36.83, "CHF": 29.88, "PLN": 6.77, "RUB": 0.367},
+    2022: {"USD": 36.57, "EUR": 38.95, "GBP": 44.17, "CHF": 39.53, "PLN": 8.35},
+    2023: {"USD": 37.98, "EUR": 42.21, "GBP": 48.35, "CHF": 45.22, "PLN": 9.66},
+    2024: {"USD": 42.04, "EUR": 43.93, "GBP": 52.63, "CHF": 46.35, "PLN": 10.18},
+}
+
+LARGE_GIFT_THRESHOLD_UAH = 100000
+SUDDEN_CHANGE_MIN_UAH = 200000
+
+DECLARATIONS_SUMMARY_ANALYSIS_PROMPT = """
+You are an analyst tasked with evaluating a politician’s declarations data for potential corruption indicators. \
+The declarations were pre-processed and all amounts were converted to UAH with the rates of their declaration year. \
+Amounts in unknown currencies were left out and rates of missing years were approximated, see "currency_conversion". \
+You have the following computed summary (one row per declaration, in chronological order, plus computed indicators):
+
+###
+{declarations_summary}
+###
+
+Please analyze this summary and determine:
+
+1. Presence of large gifts.
+2. Sudden change in declared cash/money in accounts.
+3. Discrepancy between income and property, using the scale 0 to 2:
+   - 0: still acceptable,
+   - 1: suspicious (it would have taken a long time to save money),
+   - 2: unrealistic to accumulate with such salary/income.
+   Note: Real estate declared with 0 price is already ignored.
+
+Rely on the computed numbers instead of recomputing them, and refer to declarations by their number and year.
+"""
+
+# USD per 1M (prompt, completion) tokens, used to estimate the cost of LLM calls
+OPENAI_PRICES_USD_PER_1M_TOKENS = {
+    "gpt-4o-2024-08-06": (2.5, 10.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+}
+
+# Concurrency and OpenAI rate limits of the Bihus article analysis in the app and in bulk screening
+ARTICLE_ANALYSIS_MAX_WORKERS = 8
+OPENAI_REQUESTS_PER_MINUTE = 500
+OPENAI_TOKENS_PER_MINUTE = 200000
+
+# Maximum number of persons of an article analyzed with a single OpenAI request
+MAX_PERSONS_PER_REQUEST = 8
@@ -0,0 +1,251 @@
+import os
+import json
+import mmap
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from tqdm import tqdm
+
+
+def content_hash(content):
+    """Return the SHA-256 hex digest identifying an article content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """
+    Single on-disk store for Bihus articles.
+
+    The store is a directory with two files:
+    - content.bin: UTF-8 article bodies appended one after another.
+    - metadata.sqlite: one row per article with its id, its metadata (title, link, date,
+      entities_included, ...) as JSON and the offset/length of its body in content.bin.
+
+    Opening the store only reads the ids and body locations; metadata is decoded on demand and
+    bodies are read lazily through mmap. A metadata.jsonl table written by earlier versions is
+    imported on first open.
+    """
+    CONTENT_FILE = "content.bin"
+    METADATA_FILE = "metadata.sqlite"
+    LEGACY_METADATA_FILE = "metadata.jsonl"
+
+    def __init__(self, path="./bihus_store"):
+        """
+        Initialize the ArticleStore.
+
+        :param path: Path to the store directory. Created if it does not exist.
+        """
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+        self.content_path = os.path.join(self.path, self.CONTENT_FILE)
+        self.metadata_path = os.path.join(self.path, self.METADATA_FILE)
+        self._offsets = {}
+        self._mmap = None
+        self._mmap_size = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.metadata_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "id TEXT PRIMARY KEY, offset INTEGER NOT NULL, length INTEGER NOT NULL, link TEXT, metadata TEXT NOT NULL)"
+        )
+        self._connection.commit()
+        self._import_legacy_metadata()
+        self._offsets = {article_id: (offset, length) for article_id, offset, length
+                         in self._connection.execute("SELECT id, offset, length FROM articles ORDER BY rowid")}
+
+    def __contains__(self, article_id):
+        return article_id in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _import_legacy_metadata(self):
+        """
+        Import the metadata.jsonl table of an older store, keeping the last record of every id.
+
+        A crash while appending could leave an incomplete last line; that record is skipped, as its
+        write never completed.
+        """
+        legacy_path = os.path.join(self.path, self.LEGACY_METADATA_FILE)
+        if not os.path.exists(legacy_path):
+            return
+        records = {}
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        for i, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                if i < len(lines) - 1:
+                    raise
+                print(f"Skipping incomplete last record of {legacy_path}")
+                continue
+            records[record["id"]] = record
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO articles (id, offset, length, link, metadata) VALUES (?, ?, ?, ?, ?)",
+                [(article_id, record["offset"], record["length"], record["metadata"].get("link"),
+                  json.dumps(record["metadata"], ensure_ascii=False)) for article_id, record in records.items()]
+            )
+            self._connection.commit()
+        os.replace(legacy_path, f"{legacy_path}.imported")
+
+    @property
+    def stale_bytes(self):
+        """Size of the bodies in content.bin no longer referenced by any article."""
+        if not os.path.exists(self.content_path):
+            return 0
+        return os.path.getsize(self.content_path) - sum(length for _, length in self._offsets.values())
+
+    def ids(self):
+        """Return the ids of all stored articles in insertion order."""
+        return list(self._offsets)
+
+    def metadata(self, article_id):
+        """Return the metadata of an article without its content."""
+        with self._lock:
+            row = self._connection.execute("SELECT metadata FROM articles WHERE id = ?", (article_id,)).fetchone()
+        if row is None:
+            raise KeyError(article_id)
+        return json.loads(row[0])
+
+    def iter_metadata(self):
+        """Iterate over (article_id, metadata) pairs in insertion order."""
+        with self._lock:
+            rows = self._connection.execute("SELECT id, metadata FROM articles ORDER BY rowid").fetchall()
+        return ((article_id, json.loads(metadata)) for article_id, metadata in rows)
+
+    def links(self):
+        """Return the set of article links present in the store."""
+        with self._lock:
+            return {link for link, in self._connection.execute("SELECT link FROM articles")}
+
+    def read_content(self, article_id):
+        """Read the body of an article from content.bin."""
+        offset, length = self._offsets[article_id]
+        if length == 0:
+            return ""
+        with self._lock:
+            if self._mmap is None or offset + length > self._mmap_size:
+                self._remap()
+            return self._mmap[offset:offset + length].decode("utf-8")
+
+    def get(self, article_id):
+        """Return the full article, including its content."""
+        article = self.metadata(article_id)
+        article["content"] = self.read_content(article_id)
+        return article
+
+    def put(self, article_id, article):
+        """
+        Write an article to the store.
+
+        :param article_id: Id of the article, e.g. the file name used by the JSON layout.
+        :param article: Article data (dict). If it has no "content", the stored body is kept.
+        """
+        metadata = {key: value for key, value in article.items() if key != "content"}
+        with self._lock:
+            if "content" in article:
+                data = article["content"].encode("utf-8")
+                with open(self.content_path, "ab") as f:
+                    offset = f.tell()
+                    f.write(data)
+                location = (offset, len(data))
+            else:
+                location = self._offsets.get(article_id, (0, 0))
+            self._write_row(article_id, metadata, location)
+
+    def update_entities(self, article_id, entities):
+        """Set the entities_included of a stored article without rewriting its content."""
+        metadata = self.metadata(article_id)
+        metadata["entities_included"] = entities
+        with self._lock:
+            self._write_row(article_id, metadata, self._offsets[article_id])
+
+    def compact(self):
+        """
+        Rewrite content.bin with only the bodies still referenced, dropping the ones replaced by a later put.
+
+        The bodies are copied to a temporary file that replaces content.bin, and the new offsets are
+        committed right after. Should only run while no other process reads or writes the store.
+        """
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+                self._mmap_size = 0
+            tmp_path = f"{self.content_path}.tmp"
+            offsets = {}
+            with open(tmp_path, "wb") as out:
+                if os.path.exists(self.content_path):
+                    with open(self.content_path, "rb") as f:
+                        for article_id, (offset, length) in self._offsets.items():
+                            f.seek(offset)
+                            offsets[article_id] = (out.tell(), length)
+                            out.write(f.read(length))
+            self._connection.executemany("UPDATE articles SET offset = ? WHERE id = ?",
+                                         [(offset, article_id) for article_id, (offset, _) in offsets.items()])
+            os.replace(tmp_path, self.content_path)
+            self._connection.commit()
+            self._offsets.update(offsets)
+
+    def new_id(self, date_str):
+        """Return a free id following the BihusParser file naming (dd-mm-YYYY[_n].json)."""
+        date_str = datetime.strptime(date_str, "%Y-%m-%d").strftime("%d-%m-%Y")
+        article_id = f"{date_str}.json"
+        counter = 1
+        while article_id in self._offsets:
+            article_id = f"{date_str}_{counter}.json"
+            counter += 1
+        return article_id
+
+    def import_json(self, input_dir):
+        """Import every per-article JSON file of a directory, using the file names as ids."""
+        for file in tqdm(sorted(os.listdir(input_dir)), desc="Importing articles", unit="file"):
+            if file.endswith(".json"):
+                with open(os.path.join(input_dir, file), "r", encoding="utf-8") as f:
+                    self.put(file, json.load(f))
+
+    def export_json(self, output_dir):
+        """Export the store back to the per-article JSON layout."""
+        os.makedirs(output_dir, exist_ok=True)
+        for article_id in tqdm(self.ids(), desc="Exporting articles", unit="article"):
+            with open(os.path.join(output_dir, article_id), "w", encoding="utf-8") as f:
+                json.dump(self.get(article_id), f, ensure_ascii=False, indent=2)
+
+    def close(self):
+        """Release the content mapping and close the metadata database."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+                self._mmap_size = 0
+            self._connection.close()
+
+    def _write_row(self, article_id, metadata, location):
+        # An upsert keeps the rowid, and so the insertion order, of an overwritten article
+        self._connection.execute(
+            "INSERT INTO articles (id, offset, length, link, metadata) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET offset = excluded.offset, length = excluded.length, "
+            "link = excluded.link, metadata = excluded.metadata",
+            (article_id, location[0], location[1], metadata.get("link"), json.dumps(metadata, ensure_ascii=False))
+        )
+        self._connection.commit()
+        self._offsets[article_id] = location
+
+    def _remap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.content_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap_size = len(self._mmap)
+
+
+if __name__ == "__main__":
+    store = ArticleStore("./bihus_store")
+    store.import_json("./bihus_modified_identity_data")
+    store.compact()
+    print(f"Stored {len(store)} articles in {store.path}")
@@ -4,32 +4,107 @@ from fuzzywuzzy import fuzz
 from tqdm import tqdm
 import json
 from textwrap import dedent
-import openai
-from src.tools.openai_bihus import openai_request
+from concurrent.futures import ThreadPoolExecutor
+from src.tools.openai_bihus import openai_request, openai_request_multi
+from src.tools.person_index import PersonIndex
+from src.tools.article_store import ArticleStore, content_hash
+from src.tools.llm_utils import RateLimiter, openai_client
+from src.tools.verdict_store import VerdictStore
+from src.tools.mention_windows import extract_mention_windows
+from src.tools.instrumentation import span, propagate
+from src.const import MAX_PERSONS_PER_REQUEST
 
 class ArticleAnalyzer:
-    def __init__(self, data_dir="./bihus_modified_identity_data"):
+    def __init__(self, data_dir="./bihus_modified_identity_data", index_path="./bihus_person_index.json",
+                 store_dir="./bihus_store", max_workers=1, requests_per_minute=None, tokens_per_minute=None,
+                 use_cache=True, verdicts_path="./bihus_verdicts.sqlite", mention_context=None, client=None,
+                 rate_limiter=None):
         """
         Initialize the ArticleAnalyzer class.
 
-        :param data_dir: Path to the folder containing JSON files.
-        :param openai_interface: Placeholder function to integrate with OpenAI for analysis.
+        :param data_dir: Path to the folder containing JSON files. Used when there is no article store.
+        :param index_path: Path to the person index written by IdentityIdentifier.
+        :param store_dir: Path to the ArticleStore. If it exists, only article metadata is loaded
+                          and the content of matched articles is read lazily.
+        :param max_workers: Number of articles analyzed concurrently.
+        :param requests_per_minute: OpenAI requests-per-minute limit shared by the workers. Ignored when
+                                    rate_limiter is given.
+        :param tokens_per_minute: OpenAI tokens-per-minute limit shared by the workers. Ignored when
+                                  rate_limiter is given.
+        :param use_cache: Whether to reuse cached OpenAI responses for unchanged articles.
+        :param verdicts_path: Path to the VerdictStore filled by VerdictPrecomputer. If it exists,
+                              precomputed verdicts are used instead of live OpenAI calls.
+        :param mention_context: If set, only the paragraphs mentioning the person, plus this many paragraphs
+                                around them, are sent to OpenAI. None sends the full article content.
+        :param client: OpenAI client to use, e.g. one shared with other analyzers. It is not closed by close().
+                       Defaults to a new client owned by the analyzer.
+        :param rate_limiter: RateLimiter to use, e.g. one shared with other analyzers. Defaults to a new one
+                             built from requests_per_minute and tokens_per_minute.
         """
-        client = openai.OpenAI()
         self.data_dir = data_dir
+        self.store = ArticleStore(store_dir) if store_dir and os.path.isdir(store_dir) else None
         self.articles = []
-        self._client = client
+        self.article_ids = []
+        self._positions = {}
+        self._owns_client = client is None
+        self._client = client or openai_client()
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter(requests_per_minute, tokens_per_minute)
+        self.use_cache = use_cache
+        self.mention_context = mention_context
+        self.verdicts = VerdictStore(verdicts_path) if verdicts_path and os.path.exists(verdicts_path) else None
         self._load_articles()
+        self.person_index = PersonIndex(index_path)
+        self._update_index()
+
+    def close(self):
+        """Release the article store mapping, the verdict store connection and the OpenAI client it owns."""
+        if self.store is not None:
+            self.store.close()
+        if self.verdicts is not None:
+            self.verdicts.close()
+        if self._owns_client:
+            self._client.close()
 
     def _load_articles(self):
-        """Load all articles from the data directory."""
-        for file in os.listdir(self.data_dir):
-            if file.endswith(".json"):
-                file_path = os.path.join(self.data_dir, file)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    self.articles.append(json.load(f))
+        """Load article metadata from the store, or all articles from the data directory."""
+        if self.store is not None:
+            for article_id, metadata in self.store.iter_metadata():
+                self.article_ids.append(article_id)
+                self.articles.append(metadata)
+        else:
+            for file in os.listdir(self.data_dir):
+                if file.endswith(".json"):
+                    file_path = os.path.join(self.data_dir, file)
+                    with open(file_path, "r", encoding="utf-8") as f:
+                        self.articles.append(json.load(f))
+                    self.article_ids.append(file)
+        self._positions = {article_id: i for i, article_id in enumerate(self.article_ids)}
         print(f"Loaded {len(self.articles)} articles.")
 
+    def _matched_articles(self, article_ids):
+        """Return the (article id, article) pairs of the given ids in corpus order, skipping unknown ids."""
+        positions = sorted(self._positions[article_id] for article_id in article_ids if article_id in self._positions)
+        return [(self.article_ids[i], self.articles[i]) for i in positions]
+
+    def _full_article(self, article_id, article):
+        """Return the article with its content, reading it from the store if needed."""
+        if "content" in article or self.store is None:
+            return article
+        return self.store.get(article_id)
+
+    def content_hash(self, article_id, article):
+        """Return the hash of an article content, reading it from the store if needed."""
+        if "content" in article or self.store is None:
+            return content_hash(article["content"])
+        return content_hash(self.store.read_content(article_id))
+
+    def _update_index(self):
+        """Add articles missing from the person index, e.g. ones processed after it was saved."""
+        for article_id, article in zip(self.article_ids, self.articles):
+            if article_id not in self.person_index:
+                self.person_index.add_article(article_id, article.get("entities_included", {}).get("PER", []))
+
     def is_fuzzy_match(self, target, candidate, threshold=75):
         """Check if two strings match based on a fuzzy matching threshold."""
         return fuzz.ratio(target, candidate) >= threshold
@@ -42,19 +117,22 @@ class ArticleAnalyzer:
         :return: Dictionary with aggregated metrics and detailed article analysis.
         """
         self.target_name = target_name
-        mentioned_articles = []
-        for article in self.articles:
-            persons = article.get("entities_included", {}).get("PER", [])
-            for person in persons:
-                if self.is_fuzzy_match(target_name, person):
-                    mentioned_articles.append(article)
-                    break
+        with span("article_matching"):
+            mentioned_articles = self._matched_articles(self.person_index.lookup(target_name))
         print(f"{target_name} was mentioned in {len(mentioned_articles)} articles.")
 
-        detailed_results = []
-        for article in tqdm(mentioned_articles, desc="Analyzing articles", unit="article"):
-            result = self._analyze_article(article)
-            detailed_results.append(result)
+        def analyze(item):
+            article_id, article = item
+            verdict = self._stored_verdict(target_name, article_id, article)
+            if verdict is not None:
+                return {"title": article["title"], "link": article["link"], **verdict}
+            return self._analyze_article(self._full_article(article_id, article), target_name)
+
+        with span("article_analysis"), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            detailed_results = list(tqdm(executor.map(propagate(analyze), mentioned_articles),
+                                         total=len(mentioned_articles), desc="Analyzing articles", unit="article"))
+        if self.mention_context is not None:
+            print(f"Saved ~{sum(result.get('prompt_tokens_saved', 0) for result in detailed_results)} prompt tokens.")
         aggregated_metrics = self._aggregate_metrics(detailed_results)
         return {
             "target_name": target_name,
@@ -62,15 +140,78 @@ class ArticleAnalyzer:
             "detailed_results": detailed_results
         }
 
-    def _analyze_article(self, article):
+    def analyze_people(self, target_names):
+        """
+        Analyze several persons at once, sending every matched article to OpenAI only once.
+
+        Each article is analyzed with a single request covering all target names it mentions.
+
+        :param target_names: Full names of the persons to analyze.
+        :return: Dictionary mapping every target name to the analyze_person result for it.
+        """
+        article_targets = {}
+        with span("article_matching"):
+            for target_name in dict.fromkeys(target_names):
+                for article_id in self.person_index.lookup(target_name):
+                    article_targets.setdefault(article_id, []).append(target_name)
+            mentioned_articles = self._matched_articles(article_targets)
+        print(f"{len(target_names)} persons were mentioned in {len(mentioned_articles)} articles.")
+
+        def analyze(item):
+            article_id, article = item
+            names = article_targets[article_id]
+            results = {}
+            for name in names:
+                verdict = self._stored_verdict(name, article_id, article)
+                if verdict is not None:
+                    results[name] = {"title": article["title"], "link": article["link"], **verdict}
+            missing = [name for name in names if name not in results]
+            if missing:
+                results.update(self._analyze_article_persons(self._full_article(article_id, article), missing))
+            return results
+
+        detailed_results = {target_name: [] for target_name in target_names}
+        with span("article_analysis"), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for results in tqdm(executor.map(propagate(analyze), mentioned_articles), total=len(mentioned_articles),
+                                desc="Analyzing articles", unit="article"):
+                for name, result in results.items():
+                    detailed_results[name].append(result)
+        return {
+            target_name: {
+                "target_name": target_name,
+                "aggregated_metrics": self._aggregate_metrics(results),
+                "detailed_results": results
+            }
+            for target_name, results in detailed_results.items()
+        }
+
+    def _stored_verdict(self, target_name, article_id, article):
+        """Return the precomputed verdict of a person matching the target name in an article, if any."""
+        if self.verdicts is None:
+            return None
+        matching_names = set(self.person_index.matching_names(target_name))
+        article_hash = None
+        for person in article.get("entities_included", {}).get("PER", []):
+            if person in matching_names:
+                article_hash = article_hash or self.content_hash(article_id, article)
+                verdict = self.verdicts.get(person, article_id, article_hash)
+                if verdict is not None:
+                    return verdict
+        return None
+
+    def _analyze_article(self, article, target_name=None):
         """
         Analyze a single article to extract specific metrics.
 
         :param article: Article data (dict).
+        :param target_name: Name of the person to analyze. Defaults to the last analyzed person.
         :return: Extracted metrics for the article.
         """
-        response = openai_request(article=article, person_name=self.target_name, client=self._client)
-        return {
+        target_name = target_name or self.target_name
+        prompt_article, tokens_saved = self._prompt_article(article, [target_name])
+        response = openai_request(article=prompt_article, person_name=target_name,
+                                  client=self._client, rate_limiter=self.rate_limiter, use_cache=self.use_cache)
+        result = {
             "title": article["title"],
             "link": article["link"],
             "negative_mentions": response.get("negative_mentions", False),
@@ -78,6 +219,45 @@ class ArticleAnalyzer:
             "suspicious_gifts_and_other": response.get("suspicious_gifts_and_other", False),
             "finished_investigation": response.get("finished_investigation", False)
         }
+        if self.mention_context is not None:
+            result["prompt_tokens_saved"] = tokens_saved
+        return result
+
+    def _analyze_article_persons(self, article, person_names):
+        """
+        Analyze several persons of a single article with one OpenAI request per MAX_PERSONS_PER_REQUEST persons.
+
+        :param article: Article data (dict).
+        :param person_names: Names of the persons to analyze.
+        :return: Dictionary mapping every person name to its extracted metrics.
+        """
+        if len(person_names) == 1:
+            return {person_names[0]: self._analyze_article(article, person_names[0])}
+        results = {}
+        for start in range(0, len(person_names), MAX_PERSONS_PER_REQUEST):
+            batch = person_names[start:start + MAX_PERSONS_PER_REQUEST]
+            if len(batch) == 1:
+                results[batch[0]] = self._analyze_article(article, batch[0])
+                continue
+            prompt_article, tokens_saved = self._prompt_article(article, batch)
+            responses = openai_request_multi(article=prompt_article, person_names=batch, client=self._client,
+                                             rate_limiter=self.rate_limiter, use_cache=self.use_cache)
+            for name, flags in responses.items():
+                results[name] = {"title": article["title"], "link": article["link"], **flags}
+                if self.mention_context is not None:
+                    results[name]["prompt_tokens_saved"] = tokens_saved
+        return results
+
+    def _prompt_article(self, article, person_names):
+        """
+        Return the article to send to OpenAI and the estimated number of prompt tokens saved.
+
+        With mention_context set, the content is reduced to the paragraphs mentioning the persons.
+        """
+        if self.mention_context is None:
+            return article, 0
+        content, tokens_saved = extract_mention_windows(article["content"], person_names, context=self.mention_context)
+        return dict(article, content=content), tokens_saved
 
     def _aggregate_metrics(self, detailed_results):
         """
@@ -0,0 +1,173 @@
+# SHOULD BE RAN SEPARATELY
+
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+from src.tools.bihus_scrapper import BihusParser
+from src.tools.bihus_post_processing import IdentityIdentifier
+
+_DONE = object()
+
+
+class BihusPipeline:
+    """
+    Streaming ingestion of new Bihus articles: crawl -> fetch and clean -> NER and variant merge ->
+    article store -> person index.
+
+    Every article flows through the stages one by one. A producer thread pages through the listing
+    lazily and fetches the bodies of new articles with a bounded number of requests in flight, handing
+    them over through a bounded queue to the NER stage (nlp.pipe), whose output is written to the store
+    and the person index right away. The next listing page is only requested once the fetches have
+    caught up, so memory is bounded by the buffer sizes, not by the size of the archive, and there are
+    no intermediate directories. Articles that fail to fetch are skipped and fetched again on the next run.
+    """
+    def __init__(self, parser, identifier, queue_size=64, checkpoint_size=50):
+        """
+        Initialize the BihusPipeline.
+
+        :param parser: BihusParser configured with an article store; its crawl state is used.
+        :param identifier: IdentityIdentifier whose model, person index and manifest are used. Its input_dir,
+                           output_dir and store_dir are not, as articles go straight to the parser's store.
+        :param queue_size: Maximum number of fetched articles waiting for NER, and of requests in flight.
+        :param checkpoint_size: Number of stored articles between saves of the crawl state, index and manifest.
+        """
+        if parser.store is None:
+            raise ValueError("BihusPipeline needs a BihusParser with a store_dir.")
+        self.parser = parser
+        self.identifier = identifier
+        self.store = parser.store
+        self.queue_size = queue_size
+        self.checkpoint_size = checkpoint_size
+
+    @staticmethod
+    def _put(buffer, item, stop):
+        """Queue an item, waiting for room until the consumer stops. Return whether the item was queued."""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self, articles, buffer, errors, stop):
+        """
+        Fetch article bodies, keeping at most queue_size requests in flight, and queue them in order.
+
+        Once stop is set (the consumer finished or failed), pending fetches are cancelled and the
+        producer returns instead of waiting on a full buffer nobody reads.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.parser.max_workers)
+        try:
+            in_flight = deque()
+            for article in articles:
+                in_flight.append((article, executor.submit(self.parser.fetch_article_content, article["link"])))
+                if len(in_flight) >= self.queue_size:
+                    pending_article, future = in_flight.popleft()
+                    if not self._put(buffer, dict(pending_article, content=future.result()), stop):
+                        return
+            while in_flight:
+                pending_article, future = in_flight.popleft()
+                if not self._put(buffer, dict(pending_article, content=future.result()), stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._put(buffer, _DONE, stop)
+
+    @staticmethod
+    def _drain(buffer, failed):
+        while True:
+            article = buffer.get()
+            if article is _DONE:
+                return
+            if article["content"] is None:
+                failed.append(article["link"])
+                continue
+            yield article["link"], article
+
+    def _new_articles(self, until_date, posts_per_page, listing):
+        """List the articles not saved yet lazily, recording the newest listed one in listing["first"]."""
+        state = self.parser.state
+        for article in self.parser.iter_paginated_articles(until_date, posts_per_page, stop_link=state.last_link,
+                                                           stop_date=state.last_date):
+            listing.setdefault("first", article)
+            listing["count"] += 1
+            if article["link"] not in state:
+                yield article
+
+    def _checkpoint(self):
+        self.parser.state.save()
+        self.identifier.person_index.save()
+        self.identifier.save_manifest()
+
+    def run(self, until_date, posts_per_page=24):
+        """
+        Ingest the articles published since the last crawl (or since until_date on the first run).
+
+        :return: Ids of the stored articles.
+        """
+        state = self.parser.state
+        listing = {"count": 0}
+        new_articles = self._new_articles(until_date, posts_per_page, listing)
+
+        buffer = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        failed = []
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(new_articles, buffer, errors, stop), daemon=True)
+        producer.start()
+
+        stored_ids = []
+        try:
+            processed = self.identifier.process_articles(self._drain(buffer, failed))
+            for link, article in tqdm(processed, desc="Ingesting articles", unit="article"):
+                article_id = self.store.new_id(article["date"])
+                self.store.put(article_id, article)
+                self.identifier.person_index.add_article(article_id, article["entities_included"].get("PER", []))
+                article_hash = self.identifier.content_hash(article)
+                self.identifier.manifest[article_id] = self.identifier._manifest_entry(article_hash)
+                state.add(link)
+                stored_ids.append(article_id)
+                if len(stored_ids) % self.checkpoint_size == 0:
+                    self._checkpoint()
+        except BaseException:
+            # Keep what was stored so far, so the next run does not fetch it again
+            self._checkpoint()
+            raise
+        finally:
+            stop.set()
+            producer.join()
+        if errors:
+            self._checkpoint()
+            raise errors[0]
+        if failed:
+            print(f"{len(failed)} articles failed to fetch and will be retried on the next run.")
+        elif "first" in listing and self.parser.listing_complete:
+            state.set_watermark(listing["first"]["link"], listing["first"]["date"])
+        self._checkpoint()
+        print(f"{listing['count']} articles listed, stored {len(stored_ids)} new articles.")
+        return stored_ids
+
+    def watch(self, until_date, interval=300, posts_per_page=24):
+        """Run the pipeline every interval seconds, so new articles become queryable within minutes."""
+        while True:
+            self.run(until_date, posts_per_page)
+            time.sleep(interval)
+
+
+if __name__ == "__main__":
+    headers = {
+            "User-Agent": (
+                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
+            )
+        }
+    parser = BihusParser(headers=headers, store_dir="./bihus_store")
+    identifier = IdentityIdentifier()
+    pipeline = BihusPipeline(parser, identifier)
+    pipeline.run("2013-01-01", posts_per_page=100)
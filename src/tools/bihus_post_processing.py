@@ -1,26 +1,75 @@
 import os
 import json
-from fuzzywuzzy import fuzz
 import spacy
 from tqdm import tqdm
+from src.tools.person_index import PersonIndex
+from src.tools.article_store import ArticleStore, content_hash
+from src.tools.entity_clustering import merge_entity_variants
+
+NER_COMPONENTS = ("tok2vec", "transformer", "ner", "entity_ruler")
 
 class IdentityIdentifier:
-    def __init__(self, input_dir, output_dir, model_name="uk_core_news_sm"):
+    def __init__(self, input_dir=None, output_dir=None, model_name="uk_core_news_sm", index_path="./bihus_person_index.json",
+                 store_dir=None, batch_size=64, n_process=1, manifest_path="./bihus_ner_manifest.json"):
         """
         Initialize the IdentityIdentifier.
 
-        :param input_dir: Path to the folder containing JSON files.
-        :param output_dir: Path to the folder to save modified JSON files.
+        :param input_dir: Path to the folder containing JSON files. Only read by process_all_jsons; leave it
+                          None when the articles come from a store (process_store, BihusPipeline).
+        :param output_dir: Path to the folder to save modified JSON files, created if needed. Only written by
+                           process_all_jsons, like input_dir.
         :param model_name: Name of the spaCy model to use.
+        :param index_path: Path to the person index updated with the PER entities of each article.
+        :param store_dir: Path to the ArticleStore processed by process_store.
+        :param batch_size: Number of articles per nlp.pipe batch.
+        :param n_process: Number of processes used by nlp.pipe.
+        :param manifest_path: Path to the manifest recording the content hash and spaCy model of every
+                              processed article, used to skip unchanged articles.
         """
         self.input_dir = input_dir
         self.output_dir = output_dir
-        os.makedirs(self.output_dir, exist_ok=True)
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
         self.nlp = spacy.load(model_name)
+        self.nlp.select_pipes(disable=[name for name in self.nlp.pipe_names if name not in NER_COMPONENTS])
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.person_index = PersonIndex(index_path)
+        self.store = ArticleStore(store_dir) if store_dir else None
+        self.model_name = f"{self.nlp.meta.get('lang', '')}_{self.nlp.meta.get('name', model_name)}"
+        self.model_version = self.nlp.meta.get("version", "")
+        self.manifest_path = manifest_path
+        self.manifest = {}
+        if manifest_path and os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def _manifest_entry(self, content_hash):
+        return {"hash": content_hash, "model": self.model_name, "version": self.model_version}
+
+    @staticmethod
+    def content_hash(article):
+        """Hash of the text NER runs on, so a reformatted JSON file or a rewritten store record is not reprocessed."""
+        return content_hash(article.get("content", ""))
+
+    def is_up_to_date(self, article_id, content_hash):
+        """Check if an article was already processed with the same content and spaCy model."""
+        return self.manifest.get(article_id) == self._manifest_entry(content_hash)
+
+    def save_manifest(self):
+        """Persist the manifest of processed articles."""
+        if not self.manifest_path:
+            return
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
 
     def extract_entities(self, content):
         """Extract all entities grouped by their labels."""
-        doc = self.nlp(content)
+        return self._entities_from_doc(self.nlp(content))
+
+    def _entities_from_doc(self, doc):
         entities = {}
         for ent in doc.ents:
             label = ent.label_
@@ -33,16 +82,7 @@ class IdentityIdentifier:
         """Merge entity variants for all entity types."""
         merged_entities = {}
         for label, entity_list in entities.items():
-            unique_entities = []
-            for entity in entity_list:
-                is_variant = False
-                for unique_entity in unique_entities:
-                    if fuzz.ratio(entity, unique_entity) > 80:  # Threshold for merging
-                        is_variant = True
-                        break
-                if not is_variant:
-                    unique_entities.append(entity)
-            merged_entities[label] = unique_entities
+            merged_entities[label] = merge_entity_variants(entity_list, threshold=80)  # Threshold for merging
         return merged_entities
 
     def process_article(self, article):
@@ -53,17 +93,79 @@ class IdentityIdentifier:
         article["entities_included"] = merged_entities
         return article
 
-    def process_all_jsons(self):
-        """Process all JSON files in the input folder and save them to the output folder."""
-        for file in tqdm(os.listdir(self.input_dir), desc="Processing JSON files", unit="file", total=len(os.listdir(self.input_dir))):
+    def process_articles(self, items):
+        """
+        Process articles in batches with nlp.pipe.
+
+        :param items: Iterable of (article_id, article) pairs.
+        :return: Generator of (article_id, article) pairs with entities_included set, in input order.
+        """
+        texts = ((article.get("content", ""), (article_id, article)) for article_id, article in items)
+        for doc, (article_id, article) in self.nlp.pipe(texts, as_tuples=True, batch_size=self.batch_size,
+                                                        n_process=self.n_process):
+            article["entities_included"] = self.merge_variants(self._entities_from_doc(doc))
+            yield article_id, article
+
+    def process_all_jsons(self, force=False):
+        """
+        Process the JSON files of the input folder and save them to the output folder.
+
+        Files whose content hash and spaCy model match the manifest, and whose output exists, are skipped.
+
+        :param force: Reprocess every file regardless of the manifest.
+        """
+        if not self.input_dir or not self.output_dir:
+            raise ValueError("process_all_jsons needs an IdentityIdentifier with an input_dir and an output_dir.")
+        pending = {}
+        for file in os.listdir(self.input_dir):
             if file.endswith(".json"):
-                input_path = os.path.join(self.input_dir, file)
-                output_path = os.path.join(self.output_dir, file)
-                with open(input_path, "r", encoding="utf-8") as f:
-                    article = json.load(f)
-                modified_article = self.process_article(article)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(modified_article, f, ensure_ascii=False, indent=2)
+                with open(os.path.join(self.input_dir, file), "r", encoding="utf-8") as f:
+                    article_hash = self.content_hash(json.load(f))
+                output_exists = os.path.exists(os.path.join(self.output_dir, file))
+                if force or not output_exists or not self.is_up_to_date(file, article_hash):
+                    pending[file] = article_hash
+        print(f"{len(pending)} new or changed articles to process.")
+
+        def load_articles():
+            for file in pending:
+                with open(os.path.join(self.input_dir, file), "r", encoding="utf-8") as f:
+                    yield file, json.load(f)
+
+        for file, modified_article in tqdm(self.process_articles(load_articles()), desc="Processing JSON files",
+                                           unit="file", total=len(pending)):
+            output_path = os.path.join(self.output_dir, file)
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(modified_article, f, ensure_ascii=False, indent=2)
+            self.person_index.add_article(file, modified_article["entities_included"].get("PER", []))
+            self.manifest[file] = self._manifest_entry(pending[file])
+        self.person_index.save()
+        self.save_manifest()
+
+    def process_store(self, force=False):
+        """
+        Process the articles of the article store and write their entities back to it.
+
+        Articles whose content hash and spaCy model match the manifest are skipped.
+
+        :param force: Reprocess every article regardless of the manifest.
+        """
+        if self.store is None:
+            raise ValueError("process_store needs an IdentityIdentifier with a store_dir.")
+        pending = {}
+        for article_id in self.store.ids():
+            article_hash = self.content_hash({"content": self.store.read_content(article_id)})
+            if force or not self.is_up_to_date(article_id, article_hash):
+                pending[article_id] = article_hash
+        print(f"{len(pending)} new or changed articles to process.")
+
+        items = ((article_id, self.store.get(article_id)) for article_id in pending)
+        for article_id, article in tqdm(self.process_articles(items), desc="Processing stored articles",
+                                        unit="article", total=len(pending)):
+            self.store.update_entities(article_id, article["entities_included"])
+            self.person_index.add_article(article_id, article["entities_included"].get("PER", []))
+            self.manifest[article_id] = self._manifest_entry(pending[article_id])
+        self.person_index.save()
+        self.save_manifest()
 
 
 if __name__ == "__main__":
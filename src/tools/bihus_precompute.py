@@ -0,0 +1,74 @@
+# SHOULD BE RAN SEPARATELY
+
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+
+from src.tools.bihus_analyser import ArticleAnalyzer
+from src.tools.verdict_store import VerdictStore
+
+
+class VerdictPrecomputer:
+    """
+    Batch job that precomputes the ArticleAnalyzer verdict of every (person, article) pair of the corpus.
+
+    All pending persons of an article are analyzed with a single request. Articles are processed in
+    checkpoints: each checkpoint is analyzed on a thread pool and committed to the VerdictStore in one
+    transaction, so an interrupted run resumes from the last committed checkpoint. Pairs already present
+    in the store for the current article content are skipped, so later runs only compute new pairs and
+    pairs of articles whose content changed.
+    """
+    def __init__(self, analyzer, verdicts_path="./bihus_verdicts.sqlite", max_workers=4, checkpoint_size=100):
+        """
+        Initialize the VerdictPrecomputer.
+
+        :param analyzer: ArticleAnalyzer holding the corpus.
+        :param verdicts_path: Path to the VerdictStore database.
+        :param max_workers: Number of articles analyzed concurrently.
+        :param checkpoint_size: Number of articles committed to the store at once.
+        """
+        self.analyzer = analyzer
+        self.store = VerdictStore(verdicts_path)
+        self.max_workers = max_workers
+        self.checkpoint_size = checkpoint_size
+
+    def pending_articles(self):
+        """
+        Return the articles with persons that have no verdict for the current article content yet.
+
+        :return: List of (article_id, article, content_hash, persons) tuples.
+        """
+        done = self.store.keys()
+        pending = []
+        for article_id, article in zip(self.analyzer.article_ids, self.analyzer.articles):
+            persons = list(dict.fromkeys(article.get("entities_included", {}).get("PER", [])))
+            if not persons:
+                continue
+            article_hash = self.analyzer.content_hash(article_id, article)
+            persons = [person for person in persons if done.get((person, article_id)) != article_hash]
+            if persons:
+                pending.append((article_id, article, article_hash, persons))
+        return pending
+
+    def _compute(self, item):
+        article_id, article, article_hash, persons = item
+        results = self.analyzer._analyze_article_persons(self.analyzer._full_article(article_id, article), persons)
+        return [(person, article_id, article_hash, result) for person, result in results.items()]
+
+    def run(self):
+        """Compute and store the verdicts of all pending pairs."""
+        pending = self.pending_articles()
+        print(f"{sum(len(persons) for *_, persons in pending)} (person, article) pairs in {len(pending)} articles "
+              f"to compute, {len(self.store)} already stored.")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                tqdm(total=len(pending), desc="Precomputing verdicts", unit="article") as progress:
+            for start in range(0, len(pending), self.checkpoint_size):
+                checkpoint = pending[start:start + self.checkpoint_size]
+                self.store.put_many(verdict for verdicts in executor.map(self._compute, checkpoint) for verdict in verdicts)
+                progress.update(len(checkpoint))
+        print(f"Stored {len(self.store)} verdicts.")
+
+
+if __name__ == "__main__":
+    analyzer = ArticleAnalyzer(requests_per_minute=500, tokens_per_minute=200000)
+    precomputer = VerdictPrecomputer(analyzer, max_workers=8)
+    precomputer.run()
@@ -1,27 +1,89 @@
 # SHOULD BE RAN SEPARATELY
 
-import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import os
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
+from src.tools.article_store import ArticleStore
+from src.tools.crawl_state import CrawlState
+from src.tools.http_client import HttpFetcher
 
 class BihusParser:
-    def __init__(self, base_url="https://bihus.info/wp-admin/admin-ajax.php", save_dir="./bihus_parsed_data", headers=None):
+    def __init__(self, base_url="https://bihus.info/wp-admin/admin-ajax.php", save_dir="./bihus_parsed_data", headers=None,
+                 store_dir=None, state_path="./bihus_crawl_state.json", max_workers=8, max_per_host=4,
+                 min_interval=0.25, timeout=30, retries=3):
+        """
+        Initialize the BihusParser.
+
+        :param base_url: URL of the paginated article listing.
+        :param save_dir: Folder the articles are saved to when no store is configured.
+        :param headers: Headers sent with every request.
+        :param store_dir: Path to the ArticleStore the articles are saved to.
+        :param state_path: Path to the crawl state used by incremental crawls.
+        :param max_workers: Number of article pages fetched concurrently.
+        :param max_per_host: Maximum number of concurrent requests to bihus.info.
+        :param min_interval: Minimum number of seconds between two requests to bihus.info.
+        :param timeout: Timeout of a single request in seconds.
+        :param retries: Number of retries of a failed request.
+        """
         self.base_url = base_url
         self.headers = headers
         self.save_dir = save_dir
+        self.max_workers = max_workers
+        self.fetcher = HttpFetcher(headers=headers, max_workers=max_workers, max_per_host=max_per_host,
+                                   timeout=timeout, retries=retries, min_interval=min_interval)
+        self.store = ArticleStore(store_dir) if store_dir else None
         os.makedirs(self.save_dir, exist_ok=True)
+        self.state = CrawlState(state_path)
+        self.listing_complete = False
+        if not self.state.known_links:
+            self.state.known_links = self._saved_links()
+
+    def _saved_links(self):
+        """Collect the links of already saved articles, used to seed an empty crawl state."""
+        if self.store is not None:
+            return {link for link in self.store.links() if link}
+        links = set()
+        for file in os.listdir(self.save_dir):
+            if file.endswith(".json"):
+                with open(os.path.join(self.save_dir, file), "r", encoding="utf-8") as f:
+                    link = json.load(f).get("link")
+                if link:
+                    links.add(link)
+        return links
+
+    def fetch_paginated_articles(self, until_date, posts_per_page=24, stop_link=None, stop_date=None):
+        """
+        Fetch articles until a specific date.
+
+        :param until_date: Oldest date to fetch.
+        :param stop_link: Link of an already crawled article; paging stops when it is reached.
+        :param stop_date: Date of the last crawl watermark; paging stops at older articles.
+        """
+        news_data = list(self.iter_paginated_articles(until_date, posts_per_page, stop_link, stop_date))
+        print(f"Fetched {len(news_data)} articles.")
+        return news_data
+
+    def iter_paginated_articles(self, until_date, posts_per_page=24, stop_link=None, stop_date=None):
+        """
+        Fetch articles until a specific date lazily, one listing page at a time.
+
+        Takes the arguments of fetch_paginated_articles. listing_complete is set once the generator
+        is exhausted at its stopping point, rather than at a failed page.
 
-    def fetch_paginated_articles(self, until_date, posts_per_page=24):
-        """Fetch articles until a specific date."""
-        news_data = []
+        :return: Generator of listed articles (date, title and link), newest first.
+        """
+        self.listing_complete = False
         offset = 0
         page = 0
         if isinstance(until_date, str):
             until_date = datetime.strptime(until_date, "%Y-%m-%d")
+        if isinstance(stop_date, str):
+            stop_date = datetime.strptime(stop_date, "%Y-%m-%d")
         while True:
             print(f"Fetching page {page}...")
             params = {
@@ -42,10 +104,14 @@ class BihusParser:
                 "action": "alm_get_posts",
                 "query_type": "standard",
             }
-            response = requests.get(self.base_url, headers=self.headers, params=params)
+            response = self.fetcher.get(self.base_url, params=params)
+            if response is None:
+                print(f"Failed to fetch page {page}")
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch page {page}: {response.status_code}")
-                break
+                return
+            reached_end = False
             try:
                 json_response = response.json()
                 html_content = json_response.get("html", "")
@@ -62,40 +128,81 @@ class BihusParser:
                     link = link_element["href"] if link_element else "No Link"
                     if article_date < until_date:
                         print(f"Reached article before {until_date}. Stopping...")
-                        news_data.extend(page_articles)
-                        return news_data
+                        reached_end = True
+                        break
+                    if link == stop_link or (stop_date and article_date < stop_date):
+                        print("Reached already crawled articles. Stopping...")
+                        reached_end = True
+                        break
                     page_articles.append({"date": date_str, "title": title, "link": link})
-                if page_articles:
+                if page_articles and not reached_end:
                     print(f"Page {page} - First Article:\n{page_articles[0]}")
                     print(f"Page {page} - Last Article:\n{page_articles[-1]}\n\n")
-                news_data.extend(page_articles)
             except Exception as e:
                 print(f"Error parsing response for page {page}: {e}")
-                break
+                return
+            yield from page_articles
+            if reached_end:
+                self.listing_complete = True
+                return
             offset += posts_per_page
             page += 1
-        print(f"Fetched {len(news_data)} articles.")
-        return news_data
 
     def fetch_article_content(self, link):
-        """Fetch and clean the content of a single article."""
+        """
+        Fetch and clean the content of a single article.
+
+        :return: The cleaned content, or None if the article could not be fetched or has no content.
+        """
         try:
-            response = requests.get(link, headers=self.headers)
+            response = self.fetcher.get(link)
+            if response is None:
+                print(f"Failed to fetch article {link}")
+                return None
             if response.status_code != 200:
-                return f"Failed to fetch article: {response.status_code}"
+                print(f"Failed to fetch article {link}: {response.status_code}")
+                return None
             soup = BeautifulSoup(response.text, "html.parser")
             content_div = soup.find("div", class_="bi-single-content")
             if not content_div:
-                return "No content found in the article"
+                print(f"No content found in the article {link}")
+                return None
             raw_content = content_div.get_text(separator="\n")
             clean_content = re.sub(r"\s*\n\s*", "\n", raw_content).strip()
             clean_content = re.sub(r"\n{2,}", "\n", clean_content)
             return clean_content
         except Exception as e:
-            return f"Error: {str(e)}"
+            print(f"Error fetching article {link}: {e}")
+            return None
+
+    def fetch_article_contents(self, links, max_in_flight=None):
+        """
+        Fetch the contents of articles concurrently, with a bounded number of requests in flight.
+
+        :param links: Links of the articles, read lazily.
+        :param max_in_flight: Maximum number of submitted fetches whose content was not yielded yet.
+                              Defaults to twice max_workers.
+        :return: Generator of contents (None for failed articles) in the order of the links; a content is
+                 yielded as soon as it and every previous one are fetched, so the caller saves them while
+                 later ones are fetched.
+        """
+        max_in_flight = max_in_flight or 2 * self.max_workers
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = deque()
+            for link in links:
+                in_flight.append(executor.submit(self.fetch_article_content, link))
+                if len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
 
     def save_article_to_file(self, article):
-        """Save a single article to a file."""
+        """Save a single article to a file, or to the article store if one is configured."""
+        if self.store is not None:
+            article_id = self.store.new_id(article["date"])
+            self.store.put(article_id, article)
+            print(f"Saved article to {self.store.path} as {article_id}")
+            return
         date_str = datetime.strptime(article["date"], "%Y-%m-%d").strftime("%d-%m-%Y")
         base_filename = f"{date_str}.json"
         filepath = os.path.join(self.save_dir, base_filename)
@@ -107,14 +214,44 @@ class BihusParser:
             json.dump(article, f, ensure_ascii=False, indent=2)
         print(f"Saved article to {filepath}")
 
-    def parse_until_date(self, until_date, posts_per_page=24):
-        """Parse articles until a specific date and save them."""
-        articles = self.fetch_paginated_articles(until_date, posts_per_page)
-        for article in tqdm(articles, desc="Processing each Articles", unit="article"):
-            print(f"Fetching content for: {article['title']}")
-            content = self.fetch_article_content(article["link"])
+    def parse_until_date(self, until_date, posts_per_page=24, full=False, checkpoint_size=50):
+        """
+        Parse articles until a specific date and save them.
+
+        Unless full is set, paging stops at the watermark of the last completed crawl and articles
+        whose link is already saved are not fetched again. Articles that fail to fetch are neither saved
+        nor marked as known, so they are fetched again next time. The watermark only moves when the
+        listing reached its stopping point and every article was saved, so a crawl cut short by a failed
+        page or article is resumed next time.
+
+        :param full: Ignore the crawl watermark and page back to until_date.
+        :param checkpoint_size: Number of saved articles between crawl state checkpoints.
+        """
+        if full:
+            articles = self.fetch_paginated_articles(until_date, posts_per_page)
+        else:
+            articles = self.fetch_paginated_articles(until_date, posts_per_page, stop_link=self.state.last_link,
+                                                     stop_date=self.state.last_date)
+        new_articles = [article for article in articles if article["link"] not in self.state]
+        print(f"{len(articles)} articles listed, {len(new_articles)} not saved yet.")
+        contents = self.fetch_article_contents([article["link"] for article in new_articles])
+        saved = failed = 0
+        for article, content in tqdm(zip(new_articles, contents), desc="Processing each Articles",
+                                     unit="article", total=len(new_articles)):
+            if content is None:
+                failed += 1
+                continue
             article["content"] = content
             self.save_article_to_file(article)
+            self.state.add(article["link"])
+            saved += 1
+            if saved % checkpoint_size == 0:
+                self.state.save()
+        if failed:
+            print(f"{failed} articles failed to fetch and will be retried on the next crawl.")
+        if articles and self.listing_complete and not failed:
+            self.state.set_watermark(articles[0]["link"], articles[0]["date"])
+        self.state.save()
         print("All articles have been processed and saved.")
 
 if __name__ == "__main__":
@@ -124,5 +261,5 @@ if __name__ == "__main__":
                 "(KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
             )
         }
-    parser = BihusParser()
+    parser = BihusParser(headers=headers)
     parser.parse_until_date("2013-01-01", posts_per_page=100)
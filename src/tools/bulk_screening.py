@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from tqdm import tqdm
+
+from src.tools.declaration_scrapping import ScrapingTool
+from src.tools.declaration_analysis import DeclarationAnalysisTool
+from src.tools.bihus_analyser import ArticleAnalyzer
+from src.tools.instrumentation import trace, span, propagate, dump_metrics
+from src.const import ARTICLE_ANALYSIS_MAX_WORKERS, OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE
+
+
+def add_score(score, values):
+    for value in values:
+        if isinstance(value, bool):
+            score += int(value)
+        elif isinstance(value, (int, float)):
+            score += value
+    return score
+
+
+def politician_name(declaration):
+    return declaration["politician_name"] + " " + declaration["politician_surname"]
+
+
+def screening_result(url, politician, declarations_analysis, bihus_analysis, metrics):
+    """Combine the declaration and Bihus analyses of a politician into a scored result."""
+    score = add_score(0, (details.get("value") for details in declarations_analysis.values()))
+    score = add_score(score, bihus_analysis["aggregated_metrics"].get("final_score", {}).values())
+    return {
+        "url": url,
+        "politician": politician,
+        "score": score,
+        "declarations_analysis": declarations_analysis,
+        "bihus_analysis": {
+            "aggregated_metrics": bihus_analysis["aggregated_metrics"],
+            "detailed_results": bihus_analysis["detailed_results"],
+        },
+        "metrics": metrics,
+    }
+
+
+def screen_politician(url, scraping_tool, declaration_analysis_tool, analyzer):
+    """
+    Score a politician without rendering a report.
+
+    The Bihus analysis starts as soon as the first declaration (and so the politician's name) is
+    available, and runs concurrently with the rest of the declaration pipeline.
+
+    :param url: URL of the politician's youcontrol declarations page.
+    :return: Dictionary with the score, findings and "metrics" (stage timings and LLM usage), or
+             with an "error" if no declarations were found.
+    """
+    with trace() as result_trace, ThreadPoolExecutor(max_workers=1) as executor:
+        bihus_futures = []
+        names = []
+
+        def start_bihus_analysis(declaration):
+            names.append(politician_name(declaration))
+            bihus_futures.append(executor.submit(propagate(analyzer.analyze_person), names[0]))
+
+        declarations_data = scraping_tool.extract_declarations_data(url, on_first_result=start_bihus_analysis)
+        if not declarations_data:
+            return {"url": url, "error": "Failed to fetch declarations for this URL.", "metrics": result_trace.to_dict()}
+        with span("declaration_analysis"):
+            declarations_analysis = declaration_analysis_tool.analyze_declarations(declarations_data)
+        bihus_analysis = bihus_futures[0].result()
+
+    return screening_result(url, names[0], declarations_analysis, bihus_analysis, result_trace.to_dict())
+
+
+class BulkScreener:
+    """
+    Screen many politicians from a list of youcontrol URLs.
+
+    The workers share one ScrapingTool, DeclarationAnalysisTool and ArticleAnalyzer, so HTTP
+    connections, OpenAI clients, caches and the Bihus corpus are set up once. Politicians are screened
+    in batches: the declarations of a batch are extracted and analyzed concurrently, then the Bihus
+    articles of the whole batch are analyzed with one ArticleAnalyzer.analyze_people call, so an
+    article mentioning several politicians is sent to OpenAI once. Results are appended to a JSONL
+    file as soon as their batch is done; the file doubles as the checkpoint, so a rerun skips every
+    URL that already has a successful result.
+    """
+    def __init__(self, output_path="./screening_results.jsonl", max_workers=4, scraping_tool=None,
+                 declaration_analysis_tool=None, analyzer=None, article_workers=ARTICLE_ANALYSIS_MAX_WORKERS,
+                 requests_per_minute=OPENAI_REQUESTS_PER_MINUTE, tokens_per_minute=OPENAI_TOKENS_PER_MINUTE,
+                 batch_size=16):
+        """
+        Initialize the BulkScreener.
+
+        :param output_path: Path to the JSONL file the results are appended to.
+        :param max_workers: Number of politicians whose declarations are processed concurrently.
+        :param scraping_tool: Shared ScrapingTool, created if not given.
+        :param declaration_analysis_tool: Shared DeclarationAnalysisTool, created if not given.
+        :param analyzer: Shared ArticleAnalyzer, created if not given.
+        :param article_workers: Number of articles the created ArticleAnalyzer analyzes concurrently.
+        :param requests_per_minute: OpenAI requests-per-minute limit of the created ArticleAnalyzer,
+                                    shared by all politicians.
+        :param tokens_per_minute: OpenAI tokens-per-minute limit of the created ArticleAnalyzer.
+        :param batch_size: Number of politicians whose Bihus articles are analyzed together.
+        """
+        self.output_path = output_path
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.scraping_tool = scraping_tool or ScrapingTool()
+        self.declaration_analysis_tool = declaration_analysis_tool or DeclarationAnalysisTool()
+        self.analyzer = analyzer or ArticleAnalyzer(max_workers=article_workers,
+                                                    requests_per_minute=requests_per_minute,
+                                                    tokens_per_minute=tokens_per_minute)
+
+    def completed_urls(self):
+        """Return the URLs that already have a successful result in the output file."""
+        completed = set()
+        if not os.path.exists(self.output_path):
+            return completed
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Line cut short by an interrupted run
+                if "error" not in record:
+                    completed.add(record["url"])
+        return completed
+
+    def _end_last_line(self):
+        """Terminate a last line cut short by an interrupted run, so the next result starts on its own line."""
+        if not os.path.exists(self.output_path) or not os.path.getsize(self.output_path):
+            return
+        with open(self.output_path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _screen_declarations(self, url):
+        """Extract and analyze the declarations of a politician, returning a partial result or an error."""
+        try:
+            with trace() as result_trace:
+                declarations_data = self.scraping_tool.extract_declarations_data(url)
+                if not declarations_data:
+                    return {"url": url, "error": "Failed to fetch declarations for this URL.",
+                            "metrics": result_trace.to_dict()}
+                with span("declaration_analysis"):
+                    declarations_analysis = self.declaration_analysis_tool.analyze_declarations(declarations_data)
+            return {"url": url, "politician": politician_name(declarations_data[0]),
+                    "declarations_analysis": declarations_analysis, "metrics": result_trace.to_dict()}
+        except Exception as e:
+            return {"url": url, "error": f"{type(e).__name__}: {e}"}
+
+    def screen_batch(self, urls, executor):
+        """
+        Screen a batch of politicians.
+
+        The Bihus analysis of the batch is recorded in the process-wide metrics; the "metrics" of every
+        result only cover its own declarations.
+
+        :return: One result per URL, in order.
+        """
+        partial = list(executor.map(self._screen_declarations, urls))
+        screened = [result for result in partial if "error" not in result]
+        try:
+            with span("bihus_batch_analysis"):
+                bihus_analyses = self.analyzer.analyze_people([result["politician"] for result in screened])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            return [result if "error" in result else {"url": result["url"], "error": error} for result in partial]
+        return [
+            result if "error" in result else
+            screening_result(result["url"], result["politician"], result["declarations_analysis"],
+                             bihus_analyses[result["politician"]], result["metrics"])
+            for result in partial
+        ]
+
+    def run(self, urls):
+        """
+        Screen the URLs that are not completed yet.
+
+        :param urls: youcontrol declarations page URLs.
+        :return: Number of politicians screened successfully in this run.
+        """
+        completed = self.completed_urls()
+        pending = [url for url in dict.fromkeys(urls) if url not in completed]
+        print(f"{len(completed)} politicians already screened, {len(pending)} to go.")
+
+        self._end_last_line()
+        start = time.time()
+        screened = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                open(self.output_path, "a", encoding="utf-8") as f, \
+                tqdm(total=len(pending), desc="Screening politicians", unit="politician") as progress:
+            for batch_start in range(0, len(pending), self.batch_size):
+                for result in self.screen_batch(pending[batch_start:batch_start + self.batch_size], executor):
+                    f.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    if "error" in result:
+                        print(f"Failed to screen {result['url']}: {result['error']}")
+                    else:
+                        screened += 1
+                    progress.update(1)
+                f.flush()
+                progress.set_postfix(per_minute=f"{screened / max(time.time() - start, 1e-9) * 60:.1f}")
+
+        minutes = (time.time() - start) / 60
+        print(f"Screened {screened} politicians in {minutes:.1f} minutes "
+              f"({screened / minutes if minutes else 0:.1f} politicians per minute).")
+        return screened
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description="Screen politicians from a file of youcontrol URLs.")
+    arg_parser.add_argument("urls_file", help="File with one youcontrol declarations page URL per line.")
+    arg_parser.add_argument("--output", default="./screening_results.jsonl", help="JSONL file for the results.")
+    arg_parser.add_argument("--workers", type=int, default=4,
+                            help="Number of politicians whose declarations are processed concurrently.")
+    arg_parser.add_argument("--batch-size", type=int, default=16,
+                            help="Number of politicians whose Bihus articles are analyzed together.")
+    arg_parser.add_argument("--article-workers", type=int, default=ARTICLE_ANALYSIS_MAX_WORKERS,
+                            help="Number of articles analyzed concurrently.")
+    arg_parser.add_argument("--requests-per-minute", type=int, default=OPENAI_REQUESTS_PER_MINUTE,
+                            help="OpenAI requests-per-minute limit of the article analysis.")
+    arg_parser.add_argument("--tokens-per-minute", type=int, default=OPENAI_TOKENS_PER_MINUTE,
+                            help="OpenAI tokens-per-minute limit of the article analysis.")
+    arg_parser.add_argument("--metrics", default=None, help="JSON file for the stage timings and LLM usage of the run.")
+    args = arg_parser.parse_args()
+
+    with open(args.urls_file, "r", encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    BulkScreener(args.output, max_workers=args.workers, batch_size=args.batch_size,
+                 article_workers=args.article_workers, requests_per_minute=args.requests_per_minute,
+                 tokens_per_minute=args.tokens_per_minute).run(urls)
+    if args.metrics:
+        dump_metrics(args.metrics)
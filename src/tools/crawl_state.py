@@ -0,0 +1,62 @@
+import os
+import json
+
+
+class CrawlState:
+    """
+    Persisted state of the incremental Bihus crawl.
+
+    The watermark (link and date of the newest article of the last completed crawl) tells the next
+    crawl where to stop paging, and the known links tell it which article bodies are already saved.
+    The watermark only moves once a crawl has saved every article it listed, so an interrupted crawl
+    is picked up again on the next run.
+    """
+    def __init__(self, path="./bihus_crawl_state.json"):
+        """
+        Initialize the CrawlState.
+
+        :param path: Path to the JSON file holding the state.
+        """
+        self.path = path
+        self.last_link = None
+        self.last_date = None
+        self.known_links = set()
+        self.load()
+
+    def __contains__(self, link):
+        return link in self.known_links
+
+    def __len__(self):
+        return len(self.known_links)
+
+    def load(self):
+        """Load the state from disk if it exists."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.last_link = data.get("last_link")
+        self.last_date = data.get("last_date")
+        self.known_links = set(data.get("known_links", []))
+
+    def save(self):
+        """Persist the state atomically."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "last_link": self.last_link,
+                "last_date": self.last_date,
+                "known_links": sorted(self.known_links),
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def add(self, link):
+        """Record the link of a saved article."""
+        self.known_links.add(link)
+
+    def set_watermark(self, link, date_str):
+        """Record the newest article of a completed crawl."""
+        self.last_link = link
+        self.last_date = date_str
@@ -1,14 +1,19 @@
 from typing import List
-import openai
 from textwrap import dedent
 import json
 
-from src.const import DECLARATIONS_ANALYSIS_RESPONSE_SCHEMA, DECLARATIONS_ANALYSIS_PROMPT
+from src.const import DECLARATIONS_ANALYSIS_RESPONSE_SCHEMA, DECLARATIONS_ANALYSIS_PROMPT, DECLARATIONS_SUMMARY_ANALYSIS_PROMPT
+from src.tools.llm_utils import cached_chat_completion, openai_client
+from src.tools.declaration_metrics import compute_declaration_indicators
+
+INDICATORS = ["presence_of_large_gifts", "sudden_changes_in_declared_money", "discrepancy_between_income_and_property"]
 
 
 class DeclarationAnalysisTool:
-    def __init__(self):
-        self.client = openai.OpenAI()
+    def __init__(self, use_cache=True, precompute=True):
+        self.client = openai_client()
+        self.use_cache = use_cache
+        self.precompute = precompute
         self.model = "gpt-4o-2024-08-06"
         self.response_format = {
             "type": "json_schema",
@@ -21,24 +26,48 @@ class DeclarationAnalysisTool:
         }
         self.prompt = DECLARATIONS_ANALYSIS_PROMPT
 
-    def get_response(self, declarations_data_str):
-        response = self.client.chat.completions.create(
+    def get_response(self, declarations_data_str, prompt=None):
+        prompt = prompt or self.prompt.format(declarations_data=declarations_data_str)
+        return cached_chat_completion(
+            self.client,
+            use_cache=self.use_cache,
+            call_site="declaration_analysis",
             model=self.model,
             messages=[
                 {
                     "role": "system",
-                    "content": dedent(self.prompt.format(declarations_data=declarations_data_str))
+                    "content": dedent(prompt)
                 },
             ],
             response_format=self.response_format,
             temperature=0
         )
 
-        event = response.choices[0].message
-        return event.content
-
     def analyze_declarations(self, declarations_data: List[dict]):
-        declarations_data_str = json.dumps(declarations_data, ensure_ascii=False, indent=4)
-        chat_response = self.get_response(declarations_data_str)
-        result = json.loads(chat_response)
+        if not self.precompute:
+            declarations_data_str = json.dumps(declarations_data, ensure_ascii=False, indent=4)
+            chat_response = self.get_response(declarations_data_str)
+            result = json.loads(chat_response)
+            return result
+
+        indicators = compute_declaration_indicators(declarations_data)
+        if indicators["clearly_zero"]:
+            print("All computed indicators are clearly zero, skipping the LLM analysis")
+            result = {
+                key: {
+                    "value": indicators[key]["value"],
+                    "explanation": "Computed locally: no gifts, no significant cash changes and property well covered by income.",
+                    "references": []
+                }
+                for key in INDICATORS
+            }
+        else:
+            summary = {key: value for key, value in indicators.items() if key != "clearly_zero"}
+            summary_str = json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
+            chat_response = self.get_response(
+                summary_str, prompt=DECLARATIONS_SUMMARY_ANALYSIS_PROMPT.format(declarations_summary=summary_str)
+            )
+            result = json.loads(chat_response)
+        for key in INDICATORS:
+            result[key]["computed"] = indicators[key]
         return result
@@ -0,0 +1,152 @@
+import re
+import numpy as np
+
+from src.const import CURRENCY_RATES_UAH_BY_YEAR, LARGE_GIFT_THRESHOLD_UAH, SUDDEN_CHANGE_MIN_UAH
+from src.tools.declaration_parser import parse_currency
+
+GIFT_PATTERN = re.compile(r"подарун|gift", re.IGNORECASE)
+
+
+def _declaration_year(declaration):
+    match = re.search(r"\b(?:19|20)\d{2}\b", str(declaration.get("year", "")))
+    return int(match.group()) if match else None
+
+
+def _new_conversion():
+    return {"unknown_currencies": set(), "unconverted_items": 0, "approximate_rate_years": set()}
+
+
+def _rate(currency, year, conversion):
+    """
+    Return the UAH rate of a currency in a declaration year, recording uncertain conversions.
+
+    An empty currency is UAH. An unrecognized currency gets rate 0 and is listed in
+    conversion["unknown_currencies"]; a year (or currency) missing from CURRENCY_RATES_UAH_BY_YEAR
+    uses the nearest year with a rate and is listed in conversion["approximate_rate_years"].
+    """
+    code = parse_currency(currency, default=None) if currency else "UAH"
+    if code == "UAH":
+        return 1.0
+    years = [rate_year for rate_year, rates in CURRENCY_RATES_UAH_BY_YEAR.items() if code in rates]
+    if code is None or not years:
+        conversion["unknown_currencies"].add(str(currency))
+        conversion["unconverted_items"] += 1
+        return 0.0
+    if year in years:
+        return CURRENCY_RATES_UAH_BY_YEAR[year][code]
+    rate_year = min(years, key=lambda y: abs(y - year)) if year is not None else max(years)
+    conversion["approximate_rate_years"].add(year)
+    return CURRENCY_RATES_UAH_BY_YEAR[rate_year][code]
+
+
+def _per_declaration(items, years, conversion, reducer=np.add):
+    """
+    Reduce (declaration index, amount, currency) triples to one UAH value per declaration.
+
+    :param items: List of (declaration index, amount, currency) tuples.
+    :param years: Declaration year of every declaration (None if unknown).
+    :param conversion: Dictionary collecting the uncertain conversions, see _rate.
+    :param reducer: NumPy ufunc combining amounts of the same declaration (np.add or np.maximum).
+    """
+    values = np.zeros(len(years))
+    if items:
+        index, amounts, currencies = zip(*items)
+        rates = np.array([_rate(currency, years[i], conversion) for i, currency in zip(index, currencies)], dtype=float)
+        reducer.at(values, np.array(index), np.asarray(amounts, dtype=float) * rates)
+    return values
+
+
+def compute_declaration_indicators(declarations):
+    """
+    Compute the corruption indicators of a politician's declarations deterministically.
+
+    All amounts are normalized to UAH with the CURRENCY_RATES_UAH_BY_YEAR rates of their declaration
+    year. Amounts in unrecognized currencies are left out and, like rates taken from another year,
+    reported under "currency_conversion". Property is the value of real estate
+    and vehicles declared with a non-zero price; since owned property is re-declared every year, the
+    largest yearly total is compared against the income accumulated over all declarations.
+
+    :param declarations: Extracted declarations in chronological order.
+    :return: Dictionary with the per-declaration table, the three indicators (each with a "value"
+             and the numbers it was derived from), "currency_conversion" and "clearly_zero", set when
+             no indicator fires with any margin and every amount was converted with its year's rate.
+    """
+    n = len(declarations)
+    years = [_declaration_year(declaration) for declaration in declarations]
+    conversion = _new_conversion()
+    income, gifts, assets, estate, vehicles = [], [], [], [], []
+    for i, declaration in enumerate(declarations):
+        financial_data = declaration.get("financial_data", {})
+        for item in financial_data.get("income_including_gifts", []):
+            income.append((i, item.get("amount", 0), item.get("currency", "")))
+            if GIFT_PATTERN.search(f"{item.get('type', '')} {item.get('source', '')}"):
+                gifts.append((i, item.get("amount", 0), item.get("currency", "")))
+        for item in financial_data.get("assets", []):
+            assets.append((i, item.get("amount", 0), item.get("currency", "")))
+        for item in declaration.get("real_estate", []):
+            estate.append((i, item.get("price", 0), item.get("currency", "")))
+        for item in declaration.get("vehicles", []):
+            vehicles.append((i, item.get("price", 0), item.get("currency", "")))
+
+    income_uah = _per_declaration(income, years, conversion)
+    # Gifts are also income items, whose conversions are already recorded
+    max_gift_uah = _per_declaration(gifts, years, _new_conversion(), np.maximum)
+    cash_uah = _per_declaration(assets, years, conversion)
+    property_uah = _per_declaration(estate, years, conversion) + _per_declaration(vehicles, years, conversion)
+    uncertain = bool(conversion["unknown_currencies"] or conversion["approximate_rate_years"])
+
+    cash_change_uah = np.diff(cash_uah, prepend=cash_uah[:1]) if n else cash_uah
+    sudden = (np.abs(cash_change_uah) > np.maximum(income_uah, SUDDEN_CHANGE_MIN_UAH))
+    if n:
+        sudden[0] = False
+
+    cumulative_income = float(income_uah.sum())
+    max_property = float(property_uah.max()) if n else 0.0
+    if max_property == 0:
+        ratio = 0.0
+    elif cumulative_income == 0:
+        ratio = float("inf")
+    else:
+        ratio = max_property / cumulative_income
+    discrepancy = 0 if ratio <= 1 else (1 if ratio <= 3 else 2)
+
+    largest_gift = float(max_gift_uah.max()) if n else 0.0
+    largest_change = float(np.abs(cash_change_uah[1:]).max()) if n > 1 else 0.0
+    return {
+        "declarations": [
+            {
+                "number": i + 1,
+                "year": declaration.get("year", ""),
+                "income_uah": round(float(income_uah[i]), 2),
+                "largest_gift_uah": round(float(max_gift_uah[i]), 2),
+                "cash_and_assets_uah": round(float(cash_uah[i]), 2),
+                "cash_change_uah": round(float(cash_change_uah[i]), 2),
+                "property_uah": round(float(property_uah[i]), 2),
+            }
+            for i, declaration in enumerate(declarations)
+        ],
+        "presence_of_large_gifts": {
+            "value": largest_gift >= LARGE_GIFT_THRESHOLD_UAH,
+            "largest_gift_uah": round(largest_gift, 2),
+            "threshold_uah": LARGE_GIFT_THRESHOLD_UAH,
+        },
+        "sudden_changes_in_declared_money": {
+            "value": bool(sudden.any()),
+            "largest_change_uah": round(largest_change, 2),
+            "declarations_with_sudden_change": [int(i) + 1 for i in np.flatnonzero(sudden)],
+            "threshold_uah": SUDDEN_CHANGE_MIN_UAH,
+        },
+        "discrepancy_between_income_and_property": {
+            "value": discrepancy,
+            "max_property_uah": round(max_property, 2),
+            "cumulative_income_uah": round(cumulative_income, 2),
+            "property_to_income_ratio": round(ratio, 2) if ratio != float("inf") else None,
+        },
+        "currency_conversion": {
+            "unknown_currencies": sorted(conversion["unknown_currencies"]),
+            "unconverted_items": conversion["unconverted_items"],
+            "approximate_rate_years": sorted(conversion["approximate_rate_years"], key=lambda year: year or 0),
+        },
+        "clearly_zero": (not uncertain and largest_gift == 0 and largest_change < SUDDEN_CHANGE_MIN_UAH / 2
+                         and ratio <= 0.5),
+    }
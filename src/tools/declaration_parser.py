@@ -0,0 +1,241 @@
+import re
+
+from src.tools.html_reducer import reduce_declaration_html
+
+SCALAR_FIELDS = ["politician_name", "politician_surname", "type_dec", "year",
+                 "registration_place", "place_of_work", "position_held"]
+
+FIELD_PATTERNS = {
+    "full_name": r"(?:прізвище,? ім['’ʼ]я,? по батькові|піб)",
+    "type_dec": r"(?:вид|тип) декларації",
+    "year": r"(?:звітний рік|звітний період|рік)",
+    "registration_place": r"(?:місце реєстрації|зареєстроване місце проживання|місце проживання)",
+    "place_of_work": r"(?:місце роботи|місце роботи або проходження служби)",
+    "position_held": r"(?:займана посада|посада)",
+}
+
+# Headings of the general information block, which has no section table
+INFO_HEADING_PATTERN = r"загальні відомості|відомості про (?:суб['’ʼ]єкта|декларанта)|^#+ декларація"
+
+SECTION_PATTERNS = {
+    "family_members": r"член(?:и|ів) сім['’ʼ]ї",
+    "real_estate": r"об['’ʼ]єкти нерухомості|нерухоме майно",
+    "vehicles": r"транспортні засоби",
+    "income_including_gifts": r"доходи",
+    "assets": r"грошові активи",
+}
+
+COLUMN_PATTERNS = {
+    "family_members": {
+        "connection": r"зв['’ʼ]яз|ступінь|родин",
+        "full_name": r"піб|прізвище,? ім",
+        "surname": r"^прізвище$",
+        "name": r"^ім['’ʼ]я$",
+        "nationality": r"громадянство",
+    },
+    "real_estate": {
+        "area": r"площа",
+        "location": r"місце|адреса|розташування",
+        "price": r"вартість|ціна",
+        "currency": r"валюта",
+    },
+    "vehicles": {
+        "model": r"марка|модель",
+        "price": r"вартість|ціна",
+        "currency": r"валюта",
+    },
+    "income_including_gifts": {
+        "source": r"джерело",
+        "type": r"^вид|^тип",
+        "amount": r"розмір|сума",
+        "currency": r"валюта",
+    },
+    "assets": {
+        "type": r"^вид|^тип",
+        "amount": r"розмір|сума",
+        "currency": r"валюта",
+    },
+}
+
+REQUIRED_COLUMNS = {
+    "family_members": ["connection"],
+    "real_estate": ["area", "location"],
+    "vehicles": ["model"],
+    "income_including_gifts": ["type", "amount"],
+    "assets": ["type", "amount"],
+}
+
+CURRENCY_PATTERNS = [
+    ("UAH", r"uah|грн|гривн"),
+    ("USD", r"usd|\$|долар|дол\.? сша"),
+    ("EUR", r"eur|€|євро"),
+    ("GBP", r"gbp|£|фунт"),
+    ("CHF", r"chf|франк"),
+    ("PLN", r"pln|злот"),
+    ("RUB", r"rub|руб|₽"),
+]
+
+
+def parse_number(text):
+    """Parse the first number of a text, e.g. '1 250 000,50 грн' -> 1250000.5. Returns 0 if there is none."""
+    match = re.search(r"\d[\d\s\xa0]*(?:[.,]\d+)?", text or "")
+    if not match:
+        return 0
+    return float(re.sub(r"[\s\xa0]", "", match.group()).replace(",", "."))
+
+
+def parse_currency(text, default="UAH"):
+    """Detect the currency mentioned in a text, returning default if none is recognized."""
+    text = (text or "").lower()
+    for currency, pattern in CURRENCY_PATTERNS:
+        if re.search(pattern, text):
+            return currency
+    return default
+
+
+class DeclarationParser:
+    """
+    Rule-based extractor filling SCRAPING_RESPONSE_SCHEMA from a youcontrol declaration page.
+
+    It reads the compact text produced by reduce_declaration_html: "label: value" lines and
+    two-cell table rows give the scalar fields, and the tables under the family, real estate,
+    vehicles, income and monetary assets sections give the lists. The returned confidence is the
+    fraction of scalar fields and section tables found, so a missing section lowers it. It is set to 0
+    when a heading is not recognized or a known section has a table with unrecognized columns, since
+    the data under them would be silently dropped; callers fall back to the LLM in both cases.
+    """
+    def parse(self, wrapper):
+        """
+        Parse a declaration page node.
+
+        :param wrapper: BeautifulSoup node of the declaration (div.wrapper).
+        :return: Tuple of the extracted declaration (dict) and a confidence between 0 and 1.
+        """
+        return self.parse_text(reduce_declaration_html(wrapper))
+
+    def parse_text(self, text):
+        """Parse the compact text of a declaration page."""
+        lines = text.split("\n")
+        result = {field: "" for field in SCALAR_FIELDS}
+        result.update({"family_members": [], "real_estate": [], "vehicles": [],
+                       "financial_data": {"income_including_gifts": [], "assets": []}})
+
+        for label, value in self._label_values(lines):
+            for field, pattern in FIELD_PATTERNS.items():
+                if re.fullmatch(pattern, label, flags=re.IGNORECASE):
+                    self._set_field(result, field, value)
+                    break
+
+        tables, known_layout = self._section_tables(lines)
+        for section, rows in tables.items():
+            items = self._parse_table(section, rows)
+            if items is None:
+                known_layout = False
+                continue
+            if section in result["financial_data"]:
+                result["financial_data"][section].extend(items)
+            else:
+                result[section].extend(items)
+
+        found = sum(1 for field in SCALAR_FIELDS if result[field]) + len(tables)
+        confidence = found / (len(SCALAR_FIELDS) + len(SECTION_PATTERNS)) if known_layout else 0.0
+        return result, confidence
+
+    def _label_values(self, lines):
+        for line in lines:
+            cells = self._cells(line)
+            if cells is not None and len(cells) == 2:
+                yield cells[0].rstrip(":").strip().lower(), cells[1]
+            elif cells is None and ":" in line:
+                label, value = line.split(":", 1)
+                if value.strip():
+                    yield label.strip().lower(), value.strip()
+
+    def _set_field(self, result, field, value):
+        if field == "full_name":
+            parts = value.split()
+            if len(parts) >= 2:
+                result["politician_surname"], result["politician_name"] = parts[0], parts[1]
+        elif field == "year":
+            match = re.search(r"\b(19|20)\d{2}\b", value)
+            if match:
+                result["year"] = match.group()
+        elif not result[field]:
+            result[field] = value
+
+    def _section_tables(self, lines):
+        """
+        Group the table rows following every known section heading.
+
+        :return: Tuple of the rows per section and whether every heading was recognized.
+        """
+        tables = {}
+        known_layout = True
+        section = None
+        for line in lines:
+            if line.startswith("#"):
+                section = None
+                for name, pattern in SECTION_PATTERNS.items():
+                    if re.search(pattern, line, flags=re.IGNORECASE):
+                        section = name
+                        break
+                if section is None and not re.search(INFO_HEADING_PATTERN, line, flags=re.IGNORECASE):
+                    known_layout = False
+            elif section is not None:
+                cells = self._cells(line)
+                if cells is not None:
+                    tables.setdefault(section, []).append(cells)
+        return tables, known_layout
+
+    def _parse_table(self, section, rows):
+        """Parse the rows of a section table, or return None if its columns are not recognized."""
+        header, body = [cell.lower() for cell in rows[0]], rows[1:]
+        columns = {}
+        for field, pattern in COLUMN_PATTERNS[section].items():
+            for i, cell in enumerate(header):
+                if re.search(pattern, cell) and i not in columns.values():
+                    columns[field] = i
+                    break
+        if not all(field in columns for field in REQUIRED_COLUMNS[section]):
+            return None
+
+        def cell(row, field):
+            i = columns.get(field)
+            return row[i] if i is not None and i < len(row) else ""
+
+        def currency(row, value):
+            # An unrecognized currency column is kept as is, so it is flagged instead of read as UAH
+            return parse_currency(cell(row, "currency") or value, default=None) or cell(row, "currency") or "UAH"
+
+        items = []
+        for row in body:
+            if section == "family_members":
+                surname, name = cell(row, "surname"), cell(row, "name")
+                if not (surname or name):
+                    parts = cell(row, "full_name").split()
+                    surname, name = (parts + ["", ""])[:2]
+                items.append({"connection": cell(row, "connection"), "name": name, "surname": surname,
+                              "nationality": cell(row, "nationality")})
+            elif section == "real_estate":
+                price = cell(row, "price")
+                items.append({"area": parse_number(cell(row, "area")), "location": cell(row, "location"),
+                              "price": parse_number(price), "currency": currency(row, price)})
+            elif section == "vehicles":
+                price = cell(row, "price")
+                items.append({"model": cell(row, "model"), "price": parse_number(price),
+                              "currency": currency(row, price)})
+            elif section == "income_including_gifts":
+                amount = cell(row, "amount")
+                items.append({"source": cell(row, "source"), "type": cell(row, "type"),
+                              "amount": parse_number(amount), "currency": currency(row, amount)})
+            else:
+                amount = cell(row, "amount")
+                items.append({"type": cell(row, "type"), "amount": parse_number(amount),
+                              "currency": currency(row, amount)})
+        return items
+
+    @staticmethod
+    def _cells(line):
+        if line.startswith("|") and line.endswith("|"):
+            return [cell.strip() for cell in line[1:-1].split("|")]
+        return None
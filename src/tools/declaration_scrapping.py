@@ -1,6 +1,7 @@
-from typing import List, Optional
-import openai
-import requests
+from typing import Callable, List, Optional, Tuple
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from textwrap import dedent
 import json
@@ -8,12 +9,30 @@ import json
 from tqdm import tqdm
 
 from src.const import SCRAPING_RESPONSE_SCHEMA, SCRAPING_PROMPT
+from src.tools.llm_utils import cached_chat_completion, openai_client
+from src.tools.http_client import HttpFetcher
+from src.tools.html_reducer import reduce_declaration_html
+from src.tools.declaration_parser import DeclarationParser
+from src.tools.declaration_store import DeclarationStore
+from src.tools.instrumentation import span, propagate, record_span
 
 
 class ScrapingTool:
-    def __init__(self):
-        self.client = openai.OpenAI()
+    def __init__(self, use_cache=True, max_workers=8, max_per_host=4, timeout=30, retries=3, reduce_html=True,
+                 use_fast_path=False, fast_path_threshold=1.0, extraction_workers=4,
+                 store_path="./declarations.sqlite"):
+        self.client = openai_client()
+        self.use_cache = use_cache
+        self.reduce_html = reduce_html
+        self.use_fast_path = use_fast_path
+        self.fast_path_threshold = fast_path_threshold
+        self.parser = DeclarationParser()
+        self.fast_path_stats = {"fast_path": 0, "llm": 0}
+        self.extraction_workers = extraction_workers
+        self._stats_lock = threading.Lock()
+        self.store = DeclarationStore(store_path) if store_path else None
         self.model = "gpt-4o-2024-08-06"
+        self.base_url = "https://youcontrol.com.ua"
         self.headers = {
             "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -32,10 +51,12 @@ class ScrapingTool:
             }
         }
         self.prompt = SCRAPING_PROMPT
+        self.fetcher = HttpFetcher(headers=self.headers, max_workers=max_workers, max_per_host=max_per_host,
+                                   timeout=timeout, retries=retries)
 
     def get_declarations_urls(self, url: str) -> List[str]:
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
+        response = self.fetcher.get(url)
+        if response is not None and response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
             link_elements = soup.select("a[href]")
             urls = []
@@ -44,24 +65,31 @@ class ScrapingTool:
                 if "/catalog/individuals/declaration/" in url:
                     urls.append(url)
         else:
-            print(f"Failed to fetch the webpage. Status code: {response.status_code}")
+            print(f"Failed to fetch the webpage. Status code: {getattr(response, 'status_code', None)}")
             urls = []
         return urls
 
     def scrape_declaration(self, urls: List[str]) -> List[str]:
-        wrappers = []
-        for url in tqdm(urls, desc="Scraping declarations", unit="declaration"):
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
+        return [wrapper for _, wrapper, _ in self._scrape_declarations(urls)]
+
+    def _scrape_declarations(self, urls: List[str]) -> List[Tuple[str, object, float]]:
+        """Fetch declaration pages and return (url, wrapper, fetch seconds) for every successful one."""
+        scraped = []
+        responses = self.fetcher.fetch_all(urls)
+        for url, response in tqdm(zip(urls, responses), total=len(urls), desc="Scraping declarations", unit="declaration"):
+            if response is not None and response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 wrapper_div = soup.find('div', class_='wrapper')
-                wrappers.append(wrapper_div)
+                scraped.append((url, wrapper_div, response.elapsed.total_seconds()))
             else:
-                print(f"Failed to fetch the webpage. Status code: {response.status_code}")
-        return wrappers
+                print(f"Failed to fetch {url}. Status code: {getattr(response, 'status_code', None)}")
+        return scraped
 
     def get_response(self, question):
-        response = self.client.chat.completions.create(
+        return cached_chat_completion(
+            self.client,
+            use_cache=self.use_cache,
+            call_site="declaration_extraction",
             model=self.model,
             messages=[
                 {
@@ -75,28 +103,107 @@ class ScrapingTool:
             ],
             response_format=self.response_format)
 
-        event = response.choices[0].message
-        return event.content
+    def build_question(self, wrapper) -> str:
+        # tests/test_html_reducer.py checks that the reduced text keeps every visible token of the saved pages
+        if not self.reduce_html:
+            return f"Extract information from this refined HTML response:\n{wrapper}"
+        html_size = len(str(wrapper))
+        text = reduce_declaration_html(wrapper)
+        print(f"Reduced declaration HTML from {html_size} to {len(text)} characters "
+              f"({100 * (1 - len(text) / max(html_size, 1)):.0f}% smaller).")
+        return f"Extract information from this declaration page content:\n{text}"
+
+    def extract_declaration(self, wrapper) -> dict:
+        return self._extract_declaration(wrapper)[0]
+
+    def _extract_declaration(self, wrapper) -> Tuple[dict, str]:
+        """Extract a declaration and return it with the path that served it ("fast_path" or "llm")."""
+        path = "llm"
+        # The rule-based fast path is opt-in until it is checked against saved real youcontrol pages
+        if self.use_fast_path:
+            result, confidence = self.parser.parse(wrapper)
+            if confidence >= self.fast_path_threshold:
+                path = "fast_path"
+        if path == "llm":
+            question = self.build_question(wrapper)
+            chat_response = self.get_response(question)
+            result = json.loads(chat_response)
+        with self._stats_lock:
+            self.fast_path_stats[path] += 1
+        return result, path
+
+    def _extract_recorded(self, item) -> Optional[dict]:
+        """
+        Extract one scraped declaration, isolating failures.
 
-    def extract_declarations_data(self, url) -> Optional[List[dict]]:
-        declarations_urls = self.get_declarations_urls(url)
-        if not declarations_urls:
+        The page fetch and the extraction are recorded as spans: declaration_page_fetch, then
+        declaration_extraction_fast_path, declaration_extraction_llm or declaration_extraction_error.
+        """
+        url, wrapper, fetch_seconds = item
+        record_span("declaration_page_fetch", fetch_seconds)
+        start = time.perf_counter()
+        try:
+            result, path = self._extract_declaration(wrapper)
+        except Exception as e:
+            print(f"Failed to extract {url}: {e}")
+            result, path = None, "error"
+        record_span(f"declaration_extraction_{path}", time.perf_counter() - start)
+        return result
+
+    def fast_path_ratio(self) -> float:
+        total = self.fast_path_stats["fast_path"] + self.fast_path_stats["llm"]
+        return self.fast_path_stats["fast_path"] / total if total else 0.0
+
+    def extract_declarations_data(self, url, on_first_result: Optional[Callable[[dict], None]] = None) -> Optional[List[dict]]:
+        """
+        Extract all declarations of a politician.
+
+        :param url: URL of the politician's youcontrol declarations page.
+        :param on_first_result: Called once with the first available declaration (stored or freshly
+                                extracted), so callers can start work that only needs the politician's name.
+        :return: Extracted declarations in chronological order.
+        """
+        with span("index_fetch"):
+            declarations_paths = self.get_declarations_urls(url)
+        if not declarations_paths:
             print("Failed to fetch declarations")
             return None
-        declarations_urls = ["https://youcontrol.com.ua" + url for url in declarations_urls[::-1]]
+        declarations_paths = declarations_paths[::-1]
+        stored = self.store.get_many(declarations_paths) if self.store is not None else {}
+        new_paths = [path for path in declarations_paths if path not in stored]
+        print(f"{len(stored)} declarations already stored, {len(new_paths)} new.")
+        declarations_urls = {self.base_url + path: path for path in new_paths}
+        first_result = next((stored[path] for path in declarations_paths if path in stored), None)
+        if first_result is not None and on_first_result is not None:
+            on_first_result(first_result)
 
-        scraped_declaration = self.scrape_declaration(declarations_urls)
-        if not scraped_declaration:
+        with span("declaration_fetch"):
+            scraped_declaration = self._scrape_declarations(list(declarations_urls))
+        if not scraped_declaration and not stored:
             print("Failed to scrape declarations")
             return None
 
-        results = []
-        for wrapper in tqdm(scraped_declaration, desc="Extracting data from declarations", unit="declaration"):
-            question = f"Extract information from this refined HTML response:\n{wrapper}"
-            chat_response = self.get_response(question)
-            result = json.loads(chat_response)
-            results.append(result)
+        extracted = []
+        with span("extraction"), ThreadPoolExecutor(max_workers=self.extraction_workers) as executor:
+            for (url, _, _), result in tqdm(zip(scraped_declaration,
+                                                executor.map(propagate(self._extract_recorded), scraped_declaration)),
+                                            total=len(scraped_declaration), desc="Extracting data from declarations",
+                                            unit="declaration"):
+                if result is not None and first_result is None:
+                    first_result = result
+                    if on_first_result is not None:
+                        on_first_result(result)
+                extracted.append((url, result))
+        for url, result in extracted:
+            if result is not None:
+                stored[declarations_urls[url]] = result
+                if self.store is not None:
+                    self.store.put(declarations_urls[url], result)
+
+        results = [stored[path] for path in declarations_paths if path in stored]
         if not results:
             print("Failed to extract information")
+        elif scraped_declaration and self.use_fast_path:
+            print(f"Fast path served {self.fast_path_ratio():.0%} of declarations.")
 
         return results
@@ -0,0 +1,57 @@
+import json
+import time
+import sqlite3
+import threading
+
+
+class DeclarationStore:
+    """
+    SQLite store of extracted declarations keyed by their youcontrol path
+    (e.g. /catalog/individuals/declaration/<id>/). Filed declarations are immutable,
+    so a stored extraction never needs to be recomputed.
+    """
+    def __init__(self, path="./declarations.sqlite"):
+        """
+        Initialize the DeclarationStore.
+
+        :param path: Path to the SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS declarations ("
+            "declaration_path TEXT PRIMARY KEY, data TEXT NOT NULL, extracted_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def __contains__(self, declaration_path):
+        return self.get(declaration_path) is not None
+
+    def get(self, declaration_path):
+        """Return the extracted declaration stored for a path, or None."""
+        return self.get_many([declaration_path]).get(declaration_path)
+
+    def get_many(self, declaration_paths):
+        """Return a dictionary of the stored declarations among the given paths."""
+        declaration_paths = list(declaration_paths)
+        found = {}
+        with self._lock:
+            for start in range(0, len(declaration_paths), 500):
+                chunk = declaration_paths[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT declaration_path, data FROM declarations "
+                    f"WHERE declaration_path IN ({', '.join('?' for _ in chunk)})",
+                    chunk
+                )
+                found.update((path, json.loads(data)) for path, data in rows)
+        return found
+
+    def put(self, declaration_path, data):
+        """Store the extracted declaration of a path."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO declarations (declaration_path, data, extracted_at) VALUES (?, ?, ?)",
+                (declaration_path, json.dumps(data, ensure_ascii=False), time.time())
+            )
+            self._connection.commit()
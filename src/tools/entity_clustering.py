@@ -0,0 +1,82 @@
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from src.tools.person_index import gram_counts, max_common_subsequence, can_reach_ratio
+
+
+class _GramBlocks:
+    """
+    Padded character unigram and n-gram postings of the kept entities, {(n, gram): (entity ids, counts, size)}.
+
+    The postings are NumPy arrays grown by doubling, so the shared grams of a new entity with every
+    kept entity are counted with one vectorized update per gram.
+    """
+    def __init__(self, n=2):
+        self.n = n
+        self.size = 0
+        self.lengths = np.zeros(16, dtype=np.int64)
+        self.postings = {}
+
+    def grams(self, entity):
+        return {1: gram_counts(entity, 1), self.n: gram_counts(entity, self.n)}
+
+    def add(self, entity, grams):
+        if self.size == len(self.lengths):
+            self.lengths = np.concatenate([self.lengths, np.zeros_like(self.lengths)])
+        self.lengths[self.size] = len(entity)
+        for n, counts in grams.items():
+            for gram, count in counts.items():
+                if (n, gram) not in self.postings:
+                    self.postings[(n, gram)] = (np.zeros(4, dtype=np.int64), np.zeros(4, dtype=np.int64), 0)
+                entity_ids, gram_totals, size = self.postings[(n, gram)]
+                if size == len(entity_ids):
+                    entity_ids = np.concatenate([entity_ids, np.zeros_like(entity_ids)])
+                    gram_totals = np.concatenate([gram_totals, np.zeros_like(gram_totals)])
+                entity_ids[size], gram_totals[size] = self.size, count
+                self.postings[(n, gram)] = (entity_ids, gram_totals, size + 1)
+        self.size += 1
+
+    def candidates(self, entity, grams, threshold):
+        """Return the ids of kept entities whose shared characters and n-grams with the entity can reach the threshold."""
+        lengths = self.lengths[:self.size]
+        max_common = np.minimum(lengths, len(entity))
+        for n, counts in grams.items():
+            shared = np.zeros(self.size, dtype=np.int64)
+            for gram, count in counts.items():
+                if (n, gram) in self.postings:
+                    entity_ids, gram_totals, size = self.postings[(n, gram)]
+                    shared[entity_ids[:size]] += np.minimum(gram_totals[:size], count)
+            max_common = np.minimum(max_common, max_common_subsequence(shared, len(entity), lengths, n))
+        return np.flatnonzero(can_reach_ratio(max_common, len(entity), lengths, threshold))
+
+
+def merge_entity_variants(entity_list, threshold=80):
+    """
+    Merge variants of the same entity, keeping the first occurrence of every cluster.
+
+    Keeps the semantics of the pairwise merge (an entity is dropped if its rapidfuzz ratio with an
+    already kept entity, rounded, is above the threshold) without comparing every pair:
+    1. exact duplicates are dropped first, they would always be merged;
+    2. a q-gram count filter over the kept entities (see PersonIndex) bounds the ratio every kept
+       entity can reach from the characters and bigrams it shares with the new one. The bound never
+       drops a kept entity that would be merged, so the clusters are the same as comparing every pair;
+    3. the remaining candidates are scored at once with rapidfuzz cdist.
+
+    :param entity_list: Entity texts in order of appearance.
+    :param threshold: Entities with a ratio above this value are merged.
+    :return: List of kept entities in order of appearance.
+    """
+    unique_entities = []
+    seen = set()
+    blocks = _GramBlocks()
+    for entity in entity_list:
+        if entity in seen:
+            continue
+        seen.add(entity)
+        grams = blocks.grams(entity)
+        candidates = [unique_entities[i] for i in blocks.candidates(entity, grams, threshold + 1)]
+        if candidates and round(process.cdist([entity], candidates, scorer=fuzz.ratio).max()) > threshold:
+            continue
+        blocks.add(entity, grams)
+        unique_entities.append(entity)
+    return unique_entities
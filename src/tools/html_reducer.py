@@ -0,0 +1,74 @@
+import re
+import copy
+from bs4 import NavigableString, Comment
+
+DROPPED_TAGS = [
+    "script", "style", "noscript", "svg", "img", "picture", "video", "iframe", "canvas",
+    "button", "form", "input", "select", "link", "meta", "nav", "header", "footer", "aside"
+]
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+BLOCK_TAGS = {
+    "div", "p", "section", "article", "main", "ul", "ol", "dl", "dt", "dd", "br", "hr", "tr", "table"
+}
+
+
+def _cell_text(cell):
+    return " ".join(cell.get_text(separator=" ").split())
+
+
+def _table_to_text(table):
+    rows = []
+    for row in table.find_all("tr"):
+        cells = [_cell_text(cell) for cell in row.find_all(["th", "td"])]
+        if any(cells):
+            rows.append("| " + " | ".join(cells) + " |")
+    return "\n".join(rows)
+
+
+def _render(node, parts):
+    for child in node.children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, NavigableString):
+            parts.append(str(child))
+        elif child.name in BLOCK_TAGS:
+            parts.append("\n")
+            _render(child, parts)
+            parts.append("\n")
+        else:
+            _render(child, parts)
+
+
+def reduce_declaration_html(wrapper):
+    """
+    Turn a declaration page node into compact, structure-preserving text for the extraction prompt.
+
+    Scripts, styles, SVGs, media, navigation and all attributes are dropped. Headings are kept as
+    markdown headings, tables as pipe-separated rows and list items as bullets, so the sections and
+    the label/value pairs the extraction schema needs stay recognizable.
+
+    :param wrapper: BeautifulSoup node of the declaration (div.wrapper). It is not modified.
+    :return: Compact text of the declaration.
+    """
+    if wrapper is None:
+        return ""
+    node = copy.copy(wrapper)
+    for tag in node.find_all(DROPPED_TAGS):
+        tag.decompose()
+    for table in node.find_all("table"):
+        if table.find_parent("table") is None:
+            table.replace_with(NavigableString(f"\n{_table_to_text(table)}\n"))
+    for heading in node.find_all(HEADING_TAGS):
+        level = int(heading.name[1])
+        heading.replace_with(NavigableString(f"\n{'#' * level} {_cell_text(heading)}\n"))
+    for item in node.find_all("li"):
+        item.replace_with(NavigableString(f"\n- {_cell_text(item)}\n"))
+
+    parts = []
+    _render(node, parts)
+    lines = []
+    for line in "".join(parts).split("\n"):
+        line = re.sub(r"[ \t\xa0]+", " ", line).strip()
+        if line and (not lines or lines[-1] != line):
+            lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,100 @@
+import time
+import random
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class HttpFetcher:
+    """
+    Pooled keep-alive HTTP client fetching pages concurrently.
+
+    Requests share one requests.Session, are capped (and optionally spaced) per host, and are
+    retried on connection errors, timeouts and transient status codes with jittered exponential backoff.
+    """
+    def __init__(self, headers=None, max_workers=8, max_per_host=4, timeout=30, retries=3, backoff=1.0,
+                 min_interval=0.0):
+        """
+        Initialize the HttpFetcher.
+
+        :param headers: Headers sent with every request.
+        :param max_workers: Number of requests running concurrently.
+        :param max_per_host: Maximum number of concurrent requests to a single host.
+        :param timeout: Timeout of a single request in seconds.
+        :param retries: Number of retries of a failed request.
+        :param backoff: Delay before the first retry in seconds, doubled on every attempt.
+        :param min_interval: Minimum number of seconds between the starts of two requests to the same host.
+        """
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.min_interval = min_interval
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots = {}
+        self._next_request_at = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _wait_turn(self, url):
+        """Sleep until min_interval has passed since the previous request to the host was started."""
+        if not self.min_interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at.get(host, 0.0))
+            self._next_request_at[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def get(self, url, **kwargs):
+        """
+        Fetch a URL with retries.
+
+        :return: The last response (which may have a non-200 status), or None if every attempt raised.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        response = None
+        for attempt in range(self.retries + 1):
+            try:
+                with self._host_slot(url):
+                    self._wait_turn(url)
+                    response = self.session.get(url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                reason = f"status code {response.status_code}"
+            except requests.RequestException as e:
+                response = None
+                reason = str(e)
+            if attempt < self.retries:
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                print(f"Failed to fetch {url} ({reason}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+        return response
+
+    def fetch_all(self, urls, **kwargs):
+        """Fetch URLs concurrently and return the responses in the order of the URLs."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda url: self.get(url, **kwargs), urls))
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
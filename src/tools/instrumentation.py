@@ -0,0 +1,219 @@
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.const import OPENAI_PRICES_USD_PER_1M_TOKENS
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """Estimate the USD cost of an LLM call, 0 for models without a known price."""
+    prompt_price, completion_price = OPENAI_PRICES_USD_PER_1M_TOKENS.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class Metrics:
+    """
+    Thread-safe aggregate of stage timings and LLM usage.
+
+    Stages are keyed by name, LLM usage by call site (e.g. "declaration_extraction"). The process-wide
+    instance from get_metrics() accumulates everything; a Trace collects the same data for one result.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.llm = {}
+
+    def record_span(self, name, seconds):
+        with self._lock:
+            stage = self.stages.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stage["count"] += 1
+            stage["total_seconds"] += seconds
+            stage["max_seconds"] = max(stage["max_seconds"], seconds)
+
+    def _call_site(self, call_site):
+        return self.llm.setdefault(call_site, {
+            "calls": 0, "cache_hits": 0, "errors": 0, "latency_seconds": 0.0,
+            "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+        })
+
+    def record_llm_call(self, call_site, model, seconds, prompt_tokens=0, completion_tokens=0, error=False):
+        with self._lock:
+            site = self._call_site(call_site)
+            site["calls"] += 1
+            site["errors"] += int(error)
+            site["latency_seconds"] += seconds
+            site["prompt_tokens"] += prompt_tokens
+            site["completion_tokens"] += completion_tokens
+            site["cost_usd"] += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def record_cache_hit(self, call_site):
+        with self._lock:
+            self._call_site(call_site)["cache_hits"] += 1
+
+    def to_dict(self):
+        """Return a JSON-serializable copy of the metrics."""
+        with self._lock:
+            return json.loads(json.dumps({"stages": self.stages, "llm": self.llm}))
+
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = []
+
+        def add(name, help_text, kind, samples):
+            lines.append(f"# HELP govwatcher_{name} {help_text}")
+            lines.append(f"# TYPE govwatcher_{name} {kind}")
+            lines.extend(f'govwatcher_{name}{{{label}="{key}"}} {value}' for label, key, value in samples)
+
+        stages = data["stages"].items()
+        add("stage_seconds_total", "Time spent in each pipeline stage.", "counter",
+            [("stage", name, stage["total_seconds"]) for name, stage in stages])
+        add("stage_runs_total", "Number of runs of each pipeline stage.", "counter",
+            [("stage", name, stage["count"]) for name, stage in stages])
+        add("stage_seconds_max", "Longest run of each pipeline stage.", "gauge",
+            [("stage", name, stage["max_seconds"]) for name, stage in stages])
+        sites = data["llm"].items()
+        for field, help_text in [
+            ("calls", "LLM API calls."),
+            ("cache_hits", "LLM responses served from the cache."),
+            ("errors", "Failed LLM API calls."),
+            ("latency_seconds", "Time spent waiting for LLM API calls."),
+            ("prompt_tokens", "Prompt tokens sent to the LLM API."),
+            ("completion_tokens", "Completion tokens received from the LLM API."),
+            ("cost_usd", "Estimated cost of the LLM API calls in USD."),
+        ]:
+            add(f"llm_{field}_total", help_text, "counter", [("call_site", name, site[field]) for name, site in sites])
+        return "\n".join(lines) + "\n"
+
+
+class Trace(Metrics):
+    """Metrics of a single result, plus the ordered list of its spans."""
+    def __init__(self):
+        super().__init__()
+        self.spans = []
+        self.started_at = time.time()
+
+    def record_span(self, name, seconds):
+        super().record_span(name, seconds)
+        with self._lock:
+            self.spans.append({"stage": name, "seconds": seconds})
+
+    def to_dict(self):
+        data = super().to_dict()
+        with self._lock:
+            data["spans"] = list(self.spans)
+        data["total_seconds"] = time.time() - self.started_at
+        return data
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Return the process-wide Metrics."""
+    return _metrics
+
+
+def current_trace():
+    """Return the Trace of the result being computed in this context, or None."""
+    return _current_trace.get()
+
+
+@contextmanager
+def use_trace(active):
+    """Collect the spans and LLM usage of everything run in this block into an existing Trace."""
+    token = _current_trace.set(active)
+    try:
+        yield active
+    finally:
+        _current_trace.reset(token)
+
+
+def trace():
+    """Collect the spans and LLM usage of everything run in this block into a new Trace."""
+    return use_trace(Trace())
+
+
+def _targets():
+    active = current_trace()
+    return (_metrics, active) if active is not None else (_metrics,)
+
+
+@contextmanager
+def span(name):
+    """Time a pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def record_span(name, seconds):
+    """Record a stage timed elsewhere, e.g. the elapsed time of an HTTP response."""
+    for target in _targets():
+        target.record_span(name, seconds)
+
+
+def record_llm_call(call_site, model, seconds, prompt_tokens=0, completion_tokens=0, error=False):
+    """Record the latency and token usage of an LLM API call."""
+    for target in _targets():
+        target.record_llm_call(call_site, model, seconds, prompt_tokens, completion_tokens, error)
+
+
+def record_cache_hit(call_site):
+    """Record an LLM response served from the cache."""
+    for target in _targets():
+        target.record_cache_hit(call_site)
+
+
+def propagate(fn):
+    """
+    Wrap a function submitted to a thread pool so it runs in the caller's context,
+    keeping its spans and LLM calls in the caller's Trace.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def dump_metrics(path):
+    """Write the process-wide metrics to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_metrics.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def start_metrics_server(port=9100, host="0.0.0.0"):
+    """
+    Serve the process-wide metrics from a background thread: Prometheus text on /metrics
+    and JSON on /metrics.json.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = _metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = json.dumps(_metrics.to_dict()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
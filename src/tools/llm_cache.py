@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "./.llm_cache.sqlite")
+
+
+def make_cache_key(**request):
+    """Hash the inputs of a chat completion request (model, messages, schema, temperature, ...)."""
+    payload = json.dumps(request, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Content-addressed on-disk cache of LLM responses, backed by SQLite.
+
+    Entries are evicted least-recently-used first once the cache holds more than
+    max_entries, and are ignored once they are older than ttl_seconds (if set).
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=10000, ttl_seconds=None):
+        """
+        Initialize the LLMCache.
+
+        :param path: Path to the SQLite database file.
+        :param max_entries: Maximum number of cached responses.
+        :param ttl_seconds: Maximum age of a cached response in seconds, or None to keep them until evicted.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(self, key):
+        """Return the cached value for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._connection.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        """Store a value and evict the least recently used entries above max_entries."""
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._connection.commit()
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached responses."""
+        with self._lock:
+            size = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Return the process-wide LLMCache shared by all OpenAI call sites."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
@@ -0,0 +1,183 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+import openai
+from src.tools.llm_cache import get_default_cache, make_cache_key
+from src.tools.instrumentation import record_llm_call, record_cache_hit
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def openai_client(**kwargs):
+    """
+    Return an OpenAI client with the SDK retries disabled.
+
+    create_chat_completion retries transient errors itself, behind the shared rate limiter; SDK retries
+    on top of it would multiply the attempts of a failing request (3 x 6 with the defaults).
+
+    :param kwargs: Arguments passed to openai.OpenAI, e.g. base_url or api_key.
+    """
+    return openai.OpenAI(max_retries=0, **kwargs)
+
+
+def estimate_tokens(text):
+    """Roughly estimate the number of tokens in a text (about 4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Initialize the TokenBucket.
+
+        :param rate_per_minute: Number of tokens added to the bucket per minute.
+        :param capacity: Maximum number of tokens in the bucket. Defaults to one minute worth of tokens.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount=1):
+        """Block until the requested amount of tokens is available and take it."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits shared by concurrent LLM calls."""
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        """
+        Initialize the RateLimiter.
+
+        :param requests_per_minute: Maximum number of requests per minute, or None for no limit.
+        :param tokens_per_minute: Maximum number of (estimated) tokens per minute, or None for no limit.
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens=1):
+        """Block until one request with the given number of tokens is allowed."""
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.tokens is not None:
+            self.tokens.acquire(tokens)
+
+
+def is_retryable(error):
+    """Check if an OpenAI error is transient (rate limit, server error or connection problem)."""
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def retry_after(error):
+    """
+    Return the delay in seconds the server asked for with a retry-after-ms or Retry-After header, or None.
+
+    Retry-After may be a number of seconds or an HTTP date.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def create_chat_completion(client, rate_limiter=None, max_retries=5, base_delay=1.0, max_delay=60.0,
+                           call_site="chat_completion", **kwargs):
+    """
+    Call client.chat.completions.create with rate limiting and exponential backoff.
+
+    A Retry-After header on a failed response sets the delay before the next attempt instead of the
+    backoff. The client should not retry on its own (see openai_client).
+
+    :param client: OpenAI client.
+    :param rate_limiter: Optional RateLimiter shared between concurrent callers.
+    :param max_retries: Number of retries on 429, 5xx and connection errors.
+    :param base_delay: Delay before the first retry in seconds, doubled on every attempt.
+    :param max_delay: Upper bound of the delay between retries in seconds, also applied to the delay
+                      asked for by a Retry-After header.
+    :param call_site: Name under which the latency and token usage of the calls are recorded.
+    :param kwargs: Arguments passed to client.chat.completions.create.
+    :return: The chat completion response.
+    """
+    tokens = sum(estimate_tokens(message.get("content") or "") for message in kwargs.get("messages", []))
+    tokens += kwargs.get("max_tokens") or 0
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire(tokens)
+        start = time.perf_counter()
+        try:
+            response = client.chat.completions.create(**kwargs)
+        except openai.OpenAIError as e:
+            record_llm_call(call_site, kwargs.get("model"), time.perf_counter() - start, error=True)
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            delay = retry_after(e)
+            if delay is None:
+                delay = min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            else:
+                delay = min(max_delay, delay)
+            print(f"OpenAI request failed ({e.__class__.__name__}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+            continue
+        usage = getattr(response, "usage", None)
+        record_llm_call(call_site, kwargs.get("model"), time.perf_counter() - start,
+                        getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
+        return response
+
+
+def cached_chat_completion(client, cache=None, use_cache=True, rate_limiter=None, call_site="chat_completion", **kwargs):
+    """
+    Return the message content of a chat completion, served from the LLM cache when possible.
+
+    :param client: OpenAI client.
+    :param cache: LLMCache to use. Defaults to the shared on-disk cache.
+    :param use_cache: Set to False to always call the API and not store the response.
+    :param rate_limiter: Optional RateLimiter shared between concurrent callers.
+    :param call_site: Name under which cache hits, latency and token usage are recorded.
+    :param kwargs: Arguments passed to client.chat.completions.create. They form the cache key.
+    :return: Content of the first choice message.
+    """
+    if not use_cache:
+        response = create_chat_completion(client, rate_limiter=rate_limiter, call_site=call_site, **kwargs)
+        return response.choices[0].message.content
+    cache = cache or get_default_cache()
+    key = make_cache_key(**kwargs)
+    content = cache.get(key)
+    if content is None:
+        response = create_chat_completion(client, rate_limiter=rate_limiter, call_site=call_site, **kwargs)
+        content = response.choices[0].message.content
+        cache.set(key, content)
+    else:
+        record_cache_hit(call_site)
+    return content
@@ -0,0 +1,58 @@
+import re
+from fuzzywuzzy import fuzz
+
+from src.tools.llm_utils import estimate_tokens
+
+WORD_PATTERN = re.compile(r"[\w'’ʼ-]+")
+
+
+def mentions_person(paragraph, person_name, threshold=75):
+    """
+    Check if a paragraph mentions a person.
+
+    A paragraph matches when a window of as many words as the name has a fuzz.ratio with the name
+    above the threshold, or when a word matches the surname (last word of the name, if it has at
+    least 5 characters), which covers inflected forms and surname-only references.
+    """
+    words = WORD_PATTERN.findall(paragraph)
+    name_words = person_name.split()
+    if not name_words:
+        return False
+    size = len(name_words)
+    for i in range(max(1, len(words) - size + 1)):
+        if fuzz.ratio(person_name, " ".join(words[i:i + size])) >= threshold:
+            return True
+    surname = name_words[-1]
+    if size > 1 and len(surname) >= 5:
+        return any(fuzz.ratio(surname, word) >= threshold for word in words)
+    return False
+
+
+def extract_mention_windows(content, person_names, context=1, threshold=75):
+    """
+    Keep only the paragraphs of an article that mention one of the persons, plus surrounding context.
+
+    :param content: Article content, paragraphs separated by newlines.
+    :param person_names: Names of the persons to keep the mentions of.
+    :param context: Number of paragraphs kept before and after every mention.
+    :param threshold: fuzz.ratio threshold for a name match.
+    :return: Tuple of the reduced content and the estimated number of prompt tokens saved.
+             The full content is returned if no paragraph mentions any of the persons.
+    """
+    paragraphs = [paragraph for paragraph in content.split("\n") if paragraph.strip()]
+    kept = set()
+    for i, paragraph in enumerate(paragraphs):
+        if any(mentions_person(paragraph, name, threshold) for name in person_names):
+            kept.update(range(max(0, i - context), min(len(paragraphs), i + context + 1)))
+    if not kept:
+        return content, 0
+
+    windows = []
+    previous = None
+    for i in sorted(kept):
+        if previous is not None and i != previous + 1:
+            windows.append("[...]")
+        windows.append(paragraphs[i])
+        previous = i
+    reduced = "\n".join(windows)
+    return reduced, max(0, estimate_tokens(content) - estimate_tokens(reduced))
@@ -1,8 +1,9 @@
 from textwrap import dedent
 import openai
 import json
+from src.tools.llm_utils import cached_chat_completion
 
-def openai_request(article, person_name, client):
+def openai_request(article, person_name, client, rate_limiter=None, use_cache=True):
     json_schema = {
         "type": "json_schema",
         "json_schema": {
@@ -38,7 +39,11 @@ def openai_request(article, person_name, client):
     model = "gpt-4o-mini"
 
     def get_response(prompt, model, json_schema, client):
-        response = client.chat.completions.create(
+        content = cached_chat_completion(
+            client,
+            use_cache=use_cache,
+            rate_limiter=rate_limiter,
+            call_site="article_analysis",
             model=model,
             messages=[
                 {
@@ -53,7 +58,98 @@ def openai_request(article, person_name, client):
             temperature=0.1,
             response_format = json_schema
         )
-        event = response.choices[0].message
-        return json.loads(event.content)
+        return json.loads(content)
 
     return get_response(prompt, model, json_schema, client)
+
+
+def openai_request_multi(article, person_names, client, rate_limiter=None, use_cache=True):
+    """
+    Analyze several persons of the same article in a single request.
+
+    :param article: Article data (dict) with "content".
+    :param person_names: Names of the persons to analyze.
+    :param client: OpenAI client.
+    :return: Dictionary mapping every person name to its four flags. Persons missing from the response
+             are analyzed with separate openai_request calls.
+    """
+    flags = ["negative_mentions", "suspicious_activity", "suspicious_gifts_and_other", "finished_investigation"]
+    json_schema = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "article_multi_person_analysis",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "persons": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "person_name": {"type": "string", "description": "Name of the person exactly as given in the list."},
+                                "negative_mentions": {"type": "boolean", "description": "Indicates if the person was negatively mentioned in the article."},
+                                "suspicious_activity": {"type": "boolean", "description": "Indicates if the person is involved in any suspicious activities."},
+                                "suspicious_gifts_and_other": {"type": "boolean", "description": "Indicates if the article mentions suspicious gifts or other unusual financial behaviors."},
+                                "finished_investigation": {"type": "boolean", "description": "Indicates if the investigation mentioned in the article has been concluded."}
+                            },
+                            "required": ["person_name"] + flags,
+                            "additionalProperties": False
+                        }
+                    }
+                },
+                "required": ["persons"],
+                "additionalProperties": False
+            },
+            "strict": True
+        }
+    }
+
+    persons_list = "\n".join(f'- "{name}"' for name in person_names)
+    prompt = dedent("""
+    Analyze the following article content and determine, for each of the specified persons, whether they are involved in specific activities.
+    Return one entry per person, in the same order, with "person_name" copied exactly from the list below, in JSON format that adheres to the schema below.
+
+    Persons:
+    {persons_list}
+
+    Schema:
+    - negative_mentions: Indicates if the person was negatively mentioned in the article.
+    - suspicious_activity: Indicates if the person is involved in any suspicious activities.
+    - suspicious_gifts_and_other: Indicates if the article mentions suspicious gifts or other unusual financial behaviors.
+    - finished_investigation: Indicates if the investigation mentioned in the article has been concluded.
+
+    Article Content:
+    {content}
+    """).format(persons_list=persons_list, content=article["content"])
+
+    content = cached_chat_completion(
+        client,
+        use_cache=use_cache,
+        rate_limiter=rate_limiter,
+        call_site="article_analysis_multi",
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that extracts information following a strict JSON schema."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=0.1,
+        response_format=json_schema
+    )
+    entries = json.loads(content).get("persons", [])
+
+    by_name = {entry.get("person_name"): entry for entry in entries}
+    results = {name: {flag: by_name[name].get(flag, False) for flag in flags}
+               for name in person_names if name in by_name}
+    missing = [name for name in person_names if name not in results]
+    if missing:
+        # Persons left out or renamed by the model are analyzed one by one instead of defaulting to False
+        print(f"{len(missing)} of {len(person_names)} persons missing from the response, analyzing them separately.")
+        for name in missing:
+            results[name] = openai_request(article, name, client, rate_limiter=rate_limiter, use_cache=use_cache)
+    return results
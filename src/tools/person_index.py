@@ -0,0 +1,208 @@
+import os
+import json
+from collections import Counter
+import numpy as np
+from fuzzywuzzy import fuzz
+
+
+def gram_counts(text, n=2):
+    """Return the multiset (Counter) of character n-grams of a string padded with one space on each side."""
+    padded = f" {text} "
+    return Counter(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+def max_common_subsequence(shared, len_a, len_b, n):
+    """
+    Upper bound on the longest common subsequence of two strings from their shared n-grams.
+
+    With L the longest common subsequence, at most len_a - L characters of the first string and
+    len_b - L characters of the second are unmatched. Every unmatched character of the first string
+    breaks at most n of its padded n-grams, every gap in the second string at most n - 1, and every
+    other n-gram also occurs in the second string, so shared >= (2n - 1) * L - (n - 1) * (len_a + len_b) + 3 - n.
+
+    :param shared: Number of shared padded n-grams (size of the multiset intersection of gram_counts).
+    :return: Largest L consistent with the shared n-grams. Works on ints and NumPy arrays alike.
+    """
+    return (shared + (n - 1) * (len_a + len_b) + n - 3) // (2 * n - 1)
+
+
+def can_reach_ratio(max_common, len_a, len_b, threshold):
+    """
+    Check if strings with at most max_common characters in common can reach the fuzz.ratio threshold.
+
+    fuzz.ratio is round(100 * 2 * M / (len_a + len_b)) where M, the characters matched by
+    SequenceMatcher (or python-Levenshtein), never exceeds the longest common subsequence.
+    """
+    return 400 * max_common >= (2 * threshold - 1) * (len_a + len_b)
+
+
+class PersonIndex:
+    """
+    Inverted index from person names (PER entities) to the articles mentioning them.
+
+    A lookup only runs fuzz.ratio against names that pass a q-gram count filter: from the number
+    of characters and of padded character n-grams a name shares with the target, the filter bounds
+    their longest common subsequence, and so their fuzz.ratio (see max_common_subsequence). The bound
+    never drops a name that reaches the threshold, so lookups return the same matches as comparing
+    every name with ArticleAnalyzer.is_fuzzy_match. The gram postings are kept as
+    {gram: {name id: count}} and evaluated with NumPy for all names at once, and they are
+    persisted, so loading the index does not recompute them.
+    """
+    def __init__(self, path=None, n=2):
+        """
+        Initialize the PersonIndex.
+
+        :param path: Path to the JSON file the index is persisted to. Loaded if it exists.
+        :param n: Size of the character n-grams used next to single characters for filtering.
+        """
+        self.path = path
+        self.n = n
+        self.articles = {}
+        self._names = {}
+        self._ids = {}
+        self._id_names = []
+        self._lengths = []
+        self._grams = {}
+        self._arrays = {}
+        self._length_array = None
+        self._lookup_cache = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def __contains__(self, article_id):
+        return article_id in self.articles
+
+    def __len__(self):
+        return len(self.articles)
+
+    def _name_grams(self, name):
+        grams = gram_counts(name, 1)
+        grams.update(gram_counts(name, self.n))
+        return grams
+
+    def _add_name(self, person):
+        name_id = len(self._id_names)
+        self._ids[person] = name_id
+        self._id_names.append(person)
+        self._lengths.append(len(person))
+        for gram, count in self._name_grams(person).items():
+            self._grams.setdefault(gram, {})[name_id] = count
+            self._arrays.pop(gram, None)
+        self._length_array = None
+
+    def _remove_name(self, person):
+        name_id = self._ids.pop(person)
+        self._id_names[name_id] = None
+        for gram in self._name_grams(person):
+            postings = self._grams[gram]
+            del postings[name_id]
+            if not postings:
+                del self._grams[gram]
+            self._arrays.pop(gram, None)
+
+    def add_article(self, article_id, persons):
+        """Add or replace the person names of a single article."""
+        if article_id in self.articles:
+            self.remove_article(article_id)
+        persons = list(dict.fromkeys(persons))
+        self.articles[article_id] = persons
+        for person in persons:
+            if person not in self._names:
+                self._names[person] = set()
+                self._add_name(person)
+            self._names[person].add(article_id)
+        self._lookup_cache.clear()
+
+    def remove_article(self, article_id):
+        """Remove an article from the index."""
+        for person in self.articles.pop(article_id, []):
+            article_ids = self._names[person]
+            article_ids.discard(article_id)
+            if not article_ids:
+                del self._names[person]
+                self._remove_name(person)
+        self._lookup_cache.clear()
+
+    def _postings(self, gram):
+        """Return the (name ids, counts) arrays of a gram."""
+        if gram not in self._arrays:
+            postings = self._grams.get(gram, {})
+            self._arrays[gram] = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                                  np.fromiter(postings.values(), dtype=np.int64, count=len(postings)))
+        return self._arrays[gram]
+
+    def _max_common(self, target_name, n, lengths):
+        """Bound the longest common subsequence of the target with every indexed name from their shared n-grams."""
+        shared = np.zeros(len(lengths), dtype=np.int64)
+        for gram, count in gram_counts(target_name, n).items():
+            name_ids, counts = self._postings(gram)
+            shared[name_ids] += np.minimum(counts, count)
+        return max_common_subsequence(shared, len(target_name), lengths, n)
+
+    def candidates(self, target_name, threshold=75):
+        """Return indexed names whose shared characters and n-grams with the target can reach the threshold."""
+        if not self._ids:
+            return []
+        if self._length_array is None:
+            self._length_array = np.array(self._lengths, dtype=np.int64)
+        lengths = self._length_array
+        max_common = np.minimum(self._max_common(target_name, 1, lengths), self._max_common(target_name, self.n, lengths))
+        max_common = np.minimum(max_common, np.minimum(lengths, len(target_name)))
+        name_ids = np.flatnonzero(can_reach_ratio(max_common, len(target_name), lengths, threshold))
+        return [self._id_names[i] for i in name_ids if self._id_names[i] is not None]
+
+    def matching_names(self, target_name, threshold=75):
+        """Return indexed names whose fuzz.ratio with the target reaches the threshold."""
+        key = (target_name, threshold)
+        if key not in self._lookup_cache:
+            self._lookup_cache[key] = [
+                name for name in self.candidates(target_name, threshold)
+                if fuzz.ratio(target_name, name) >= threshold
+            ]
+        return self._lookup_cache[key]
+
+    def lookup(self, target_name, threshold=75):
+        """Return the ids of articles mentioning a person matching the target name."""
+        article_ids = set()
+        for name in self.matching_names(target_name, threshold):
+            article_ids.update(self._names[name])
+        return article_ids
+
+    def load(self):
+        """Load the index and its gram postings from its JSON file."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.articles = data.get("articles", {})
+        if data.get("n", self.n) != self.n or "names" not in data:
+            # Written with other grams (or before they were persisted): rebuild the postings
+            articles, self.articles = self.articles, {}
+            for article_id, persons in articles.items():
+                self.add_article(article_id, persons)
+            return
+        self._names = {person: set(article_ids) for person, article_ids in data["names"]}
+        self._id_names = list(self._names)
+        self._ids = {person: name_id for name_id, person in enumerate(self._id_names)}
+        self._lengths = [len(person) for person in self._id_names]
+        self._grams = {gram: dict(zip(name_ids, counts)) for gram, (name_ids, counts) in data["grams"].items()}
+        self._arrays = {}
+        self._length_array = None
+        self._lookup_cache.clear()
+
+    def save(self, path=None):
+        """Persist the index and its gram postings to its JSON file, renumbering the names without gaps."""
+        path = path or self.path
+        names = list(self._names)
+        new_ids = {self._ids[person]: name_id for name_id, person in enumerate(names)}
+        grams = {
+            gram: [[new_ids[name_id] for name_id in postings], list(postings.values())]
+            for gram, postings in self._grams.items()
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "n": self.n,
+                "articles": self.articles,
+                "names": [[person, sorted(self._names[person])] for person in names],
+                "grams": grams,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
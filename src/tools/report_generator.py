@@ -1,24 +1,57 @@
-from openai import OpenAI
-import plotly.graph_objects as go
 from markdown import markdown
-import gradio as gr
+
+from src.tools.llm_utils import cached_chat_completion, openai_client
 
 
 class ReportGenerator:
     """
     Generate Technical Reports Regarding Suspicious Activity
     """
-    def __init__(self, bihus_analysis, declarations_analysis, score):
+    def __init__(self, bihus_analysis, declarations_analysis, score, use_cache=True, client=None):
         self.bihus_analysis = bihus_analysis
         self.declarations_analysis = declarations_analysis
         self.score = score
-        self.client = OpenAI()
+        self.use_cache = use_cache
+        self.client = client or openai_client()
 
     def generate_report(self):
+        """
+        Generate the full HTML report: summary, declaration findings and Bihus articles.
+        """
+        return self._wrap_html(f"""
+    <div class="report-content">{self._generate_text_report()}</div>
+    {self._declarations_html()}
+    {self._articles_html()}""")
+
+    def generate_partial_report(self, pending_message="Generating summary..."):
+        """
+        Generate an HTML report with the findings available so far, without the summary.
+        """
+        return self._wrap_html(f"""
+    <div class="report-content"><i>{pending_message}</i></div>
+    {self._declarations_html()}
+    {self._articles_html()}""")
+
+    def _declarations_html(self):
+        """
+        Declaration findings section
+        """
+        declarations_html = ""
+        if self.declarations_analysis:
+            declarations_html += "<div class='bihus-section-title'>Declaration Findings:</div><ul class='bihus-list'>"
+            for key, details in self.declarations_analysis.items():
+                value = details.get("value")
+                explanation = details.get("explanation", "")
+                title = key.replace("_", " ").capitalize()
+                declarations_html += f"<li><b>{title}: {value}</b><br>{explanation}</li>"
+            declarations_html += "</ul>"
+        return declarations_html
+
+    def _articles_html(self):
         """
         Bihus articles section
         """
-        bihus_articles = self.bihus_analysis.get("detailed_results", [])
+        bihus_articles = (self.bihus_analysis or {}).get("detailed_results", [])
         articles_html = ""
         if bihus_articles:
             articles_html += "<div class='bihus-section-title'>Media Mentions and Investigations:</div><ul class='bihus-list'>"
@@ -27,8 +60,12 @@ class ReportGenerator:
                 link = article.get("link", "#")
                 articles_html += f"<li><a href='{link}' target='_blank'>{title}</a></li>"
             articles_html += "</ul>"
+        return articles_html
 
-        # Wrap the textual report and bihus articles in styled HTML
+    def _wrap_html(self, content):
+        """
+        Wrap report sections in styled HTML
+        """
         html_report = f"""
 <html>
 <head>
@@ -84,9 +121,7 @@ class ReportGenerator:
 </head>
 <body>
 <div class="report-container">
-    <div class="report-title">Suspicion Analysis Report</div>
-    <div class="report-content">{self._generate_text_report()}</div>
-    {articles_html}
+    <div class="report-title">Suspicion Analysis Report</div>{content}
 </div>
 </body>
 </html>
@@ -129,20 +164,24 @@ Final Combined Score: {self.score}
 Create a concise, investigative summary report that highlights key suspicious findings and their potential implications.
     """
 
-        response = self.client.chat.completions.create(
+        summary = cached_chat_completion(
+            self.client,
+            use_cache=self.use_cache,
+            call_site="report",
             model="gpt-4o-mini",
             messages=[{"role": "system", "content": "You are a helpful assistant that creates summary reports."},
                     {"role": "user", "content": prompt}],
             max_tokens=500,
             temperature=0.7
         )
-        summary = response.choices[0].message.content.strip()
-        return markdown(summary)
+        return markdown(summary.strip())
 
     def create_score_gauge(self):
         """
         Create a gauge visualization of the score.
         """
+        import plotly.graph_objects as go  # Imported here so headless runs never load plotly
+
         max_score = 10
 
         fig = go.Figure(go.Indicator(
@@ -0,0 +1,144 @@
+import os
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from src.tools.declaration_scrapping import ScrapingTool
+from src.tools.declaration_analysis import DeclarationAnalysisTool
+from src.tools.bihus_analyser import ArticleAnalyzer
+from src.tools.llm_utils import RateLimiter, openai_client
+from src.const import ARTICLE_ANALYSIS_MAX_WORKERS, OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE
+
+CORPUS_PATHS = ("./bihus_modified_identity_data", "./bihus_store", "./bihus_person_index.json")
+
+
+def corpus_signature(paths):
+    """
+    Return a cheap fingerprint of the Bihus corpus files.
+
+    Files contribute their modification time and size, directories their own modification time
+    and the latest modification time of their entries, so added, removed and rewritten articles
+    all change the signature.
+    """
+    signature = []
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                latest = max((entry.stat().st_mtime_ns for entry in entries), default=0)
+            signature.append((path, os.stat(path).st_mtime_ns, latest))
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        else:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+class SharedTools:
+    """
+    Analysis tools created once per process and shared by concurrent requests.
+
+    The ScrapingTool, DeclarationAnalysisTool, OpenAI client and RateLimiter hold no per-request state.
+    The ArticleAnalyzer is reloaded in a background thread when the corpus files change and swapped in
+    atomically: a request takes the current analyzer once with use_analyzer and keeps using it, so
+    in-flight requests are never blocked or switched mid-analysis. A replaced analyzer is closed as
+    soon as the last request using it releases it. Every analyzer uses the shared client and
+    RateLimiter, so the rate limits hold across reloads and closing an analyzer leaves the client open.
+    """
+    def __init__(self, corpus_paths=CORPUS_PATHS, reload_interval=60, max_workers=ARTICLE_ANALYSIS_MAX_WORKERS,
+                 requests_per_minute=OPENAI_REQUESTS_PER_MINUTE, tokens_per_minute=OPENAI_TOKENS_PER_MINUTE):
+        """
+        Initialize the SharedTools.
+
+        :param corpus_paths: Paths watched for changes of the Bihus corpus.
+        :param reload_interval: Seconds between checks of the corpus; None disables the background reload.
+        :param max_workers: Number of articles the ArticleAnalyzer analyzes concurrently.
+        :param requests_per_minute: OpenAI requests-per-minute limit of the article analysis.
+        :param tokens_per_minute: OpenAI tokens-per-minute limit of the article analysis.
+        """
+        self.client = openai_client()
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.scraping_tool = ScrapingTool()
+        self.declaration_analysis_tool = DeclarationAnalysisTool()
+        self.corpus_paths = corpus_paths
+        self.reload_interval = reload_interval
+        self.analyzer_options = {"max_workers": max_workers, "client": self.client, "rate_limiter": self.rate_limiter}
+        self._signature = corpus_signature(corpus_paths)
+        self._analyzer = ArticleAnalyzer(**self.analyzer_options)
+        self._reload_lock = threading.Lock()
+        self._users_lock = threading.Lock()
+        self._users = Counter()
+        if reload_interval:
+            threading.Thread(target=self._watch, daemon=True).start()
+
+    @property
+    def analyzer(self):
+        """
+        The ArticleAnalyzer of the latest loaded corpus.
+
+        It may be closed by a later reload; requests should hold it with use_analyzer instead.
+        """
+        return self._analyzer
+
+    @contextmanager
+    def use_analyzer(self):
+        """Hold the current ArticleAnalyzer for a request, so a reload does not close it while in use."""
+        with self._users_lock:
+            analyzer = self._analyzer
+            self._users[analyzer] += 1
+        try:
+            yield analyzer
+        finally:
+            with self._users_lock:
+                self._users[analyzer] -= 1
+                replaced = analyzer is not self._analyzer and not self._users[analyzer]
+                if not self._users[analyzer]:
+                    del self._users[analyzer]
+            if replaced:
+                analyzer.close()
+
+    def reload_if_changed(self):
+        """
+        Reload the ArticleAnalyzer if the corpus changed since it was loaded.
+
+        :return: True if a new analyzer was swapped in.
+        """
+        with self._reload_lock:
+            signature = corpus_signature(self.corpus_paths)
+            if signature == self._signature:
+                return False
+            analyzer = ArticleAnalyzer(**self.analyzer_options)
+            with self._users_lock:
+                previous, self._analyzer = self._analyzer, analyzer
+                in_use = previous in self._users
+            self._signature = signature
+        if not in_use:
+            previous.close()
+        print(f"Reloaded the Bihus corpus ({len(analyzer.articles)} articles).")
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"Failed to reload the Bihus corpus: {e}")
+
+
+_shared_tools = None
+_shared_tools_lock = threading.Lock()
+
+
+def get_shared_tools(**options):
+    """
+    Return the process-wide SharedTools, creating them on first use.
+
+    :param options: SharedTools arguments, only used by the call that creates them.
+    """
+    global _shared_tools
+    with _shared_tools_lock:
+        if _shared_tools is None:
+            _shared_tools = SharedTools(**options)
+        return _shared_tools
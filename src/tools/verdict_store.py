@@ -0,0 +1,84 @@
+import sqlite3
+import threading
+
+VERDICT_FIELDS = ["negative_mentions", "suspicious_activity", "suspicious_gifts_and_other", "finished_investigation"]
+
+
+class VerdictStore:
+    """
+    SQLite store of per-(person, article) analysis verdicts.
+
+    Every verdict records the hash of the article content it was computed on. A verdict whose hash
+    differs from the current content (the article was re-fetched or reprocessed) counts as missing.
+    """
+    def __init__(self, path="./bihus_verdicts.sqlite"):
+        """
+        Initialize the VerdictStore.
+
+        :param path: Path to the SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "person TEXT NOT NULL, article_id TEXT NOT NULL, content_hash TEXT, "
+            + ", ".join(f"{field} INTEGER NOT NULL" for field in VERDICT_FIELDS)
+            + ", PRIMARY KEY (person, article_id))"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(verdicts)")}
+        if "content_hash" not in columns:
+            # Verdicts stored without a hash never match, so they are recomputed
+            self._connection.execute("ALTER TABLE verdicts ADD COLUMN content_hash TEXT")
+        self._connection.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def get(self, person, article_id, content_hash):
+        """
+        Return the verdict of a person in an article.
+
+        :param content_hash: Hash of the current article content (see article_store.content_hash).
+        :return: The verdict, or None if it was not computed or was computed on other content.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(VERDICT_FIELDS)} FROM verdicts "
+                "WHERE person = ? AND article_id = ? AND content_hash = ?",
+                (person, article_id, content_hash)
+            ).fetchone()
+        if row is None:
+            return None
+        return {field: bool(value) for field, value in zip(VERDICT_FIELDS, row)}
+
+    def keys(self):
+        """Return a dictionary mapping the (person, article_id) pairs already computed to their content hash."""
+        with self._lock:
+            return {(person, article_id): content_hash for person, article_id, content_hash
+                    in self._connection.execute("SELECT person, article_id, content_hash FROM verdicts")}
+
+    def put_many(self, verdicts):
+        """
+        Store verdicts in a single transaction.
+
+        :param verdicts: Iterable of (person, article_id, content_hash, verdict) tuples, verdict being
+                         a dict of the four flags.
+        """
+        rows = [
+            (person, article_id, content_hash, *(int(bool(verdict.get(field, False))) for field in VERDICT_FIELDS))
+            for person, article_id, content_hash, verdict in verdicts
+        ]
+        with self._lock:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO verdicts (person, article_id, content_hash, {', '.join(VERDICT_FIELDS)}) "
+                f"VALUES (?, ?, ?, {', '.join('?' for _ in VERDICT_FIELDS)})",
+                rows
+            )
+            self._connection.commit()
@@ -0,0 +1,15 @@
+import pytest
+import spacy
+
+from benchmarks.synthetic_corpus import people
+
+
+@pytest.fixture(scope="session")
+def model_path(tmp_path_factory):
+    """A blank spaCy pipeline tagging the fixture people as PER with an entity ruler."""
+    nlp = spacy.blank("xx")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PER", "pattern": person} for person in people(50)])
+    path = tmp_path_factory.mktemp("model") / "xx_fixture_people"
+    nlp.to_disk(path)
+    return str(path)
@@ -0,0 +1,180 @@
+import json
+import time
+
+import openai
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from src.tools.bihus_analyser import ArticleAnalyzer
+from src.tools.llm_utils import TokenBucket, create_chat_completion, openai_client
+
+FLAGS = ["negative_mentions", "suspicious_activity", "suspicious_gifts_and_other", "finished_investigation"]
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    server = FakeOpenAIServer(latency=0.2).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    yield server
+    server.stop()
+
+
+class RenamingOpenAIServer(FakeOpenAIServer):
+    """Fake server whose multi-person answers rename the first listed person and leave out the second."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.schemas = []
+
+    def complete(self, body):
+        self.schemas.append((body.get("response_format") or {}).get("json_schema", {}).get("name"))
+        content = super().complete(body)
+        if self.schemas[-1] != "article_multi_person_analysis":
+            return content
+        persons = json.loads(content)["persons"]
+        persons[0]["person_name"] = persons[0]["person_name"].upper()
+        return json.dumps({"persons": [persons[0]] + persons[2:]}, ensure_ascii=False)
+
+
+@pytest.fixture
+def renaming_openai(monkeypatch):
+    server = RenamingOpenAIServer().start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    articles_dir = tmp_path / "articles"
+    articles_dir.mkdir()
+    for i in range(16):
+        persons = ["Петро Іваненко", "Олена Шевченко"] if i % 4 else ["Олена Шевченко"]
+        article = {
+            "title": f"Розслідування {i}",
+            "link": f"https://bihus.info/news/{i}/",
+            "date": "2024-01-01",
+            "content": f"Стаття {i}: {', '.join(persons)}.",
+            "entities_included": {"PER": persons, "ORG": [], "LOC": []},
+        }
+        (articles_dir / f"{i:02d}-01-2024.json").write_text(json.dumps(article, ensure_ascii=False), encoding="utf-8")
+    return articles_dir
+
+
+def make_analyzer(data_dir, **kwargs):
+    return ArticleAnalyzer(data_dir=str(data_dir), index_path=None, store_dir=None, use_cache=False,
+                           verdicts_path=None, **kwargs)
+
+
+def test_concurrent_analysis_keeps_article_order(fake_openai, data_dir):
+    analyzer = make_analyzer(data_dir, max_workers=8, requests_per_minute=600, tokens_per_minute=100000)
+    expected_titles = [article["title"] for article in analyzer.articles if "Петро Іваненко" in article["content"]]
+
+    start = time.perf_counter()
+    result = analyzer.analyze_person("Петро Іваненко")
+    elapsed = time.perf_counter() - start
+
+    assert [item["title"] for item in result["detailed_results"]] == expected_titles
+    assert all(isinstance(item[flag], bool) for item in result["detailed_results"] for flag in FLAGS)
+    assert fake_openai.requests == len(expected_titles) == 12
+    assert fake_openai.max_in_flight > 1
+    assert elapsed < len(expected_titles) * 0.2
+
+
+def test_serial_analysis_matches_concurrent(fake_openai, data_dir):
+    serial = make_analyzer(data_dir).analyze_person("Олена Шевченко")
+    concurrent = make_analyzer(data_dir, max_workers=8).analyze_person("Олена Шевченко")
+
+    assert serial == concurrent
+    assert len(serial["detailed_results"]) == 16
+
+
+def test_analyze_people_sends_every_article_once(fake_openai, data_dir):
+    analyzer = make_analyzer(data_dir, max_workers=8)
+
+    results = analyzer.analyze_people(["Петро Іваненко", "Олена Шевченко"])
+
+    assert fake_openai.requests == 16
+    assert len(results["Петро Іваненко"]["detailed_results"]) == 12
+    assert len(results["Олена Шевченко"]["detailed_results"]) == 16
+    assert [item["title"] for item in results["Олена Шевченко"]["detailed_results"]] == \
+        [article["title"] for article in analyzer.articles]
+
+
+def test_analyze_people_falls_back_to_single_requests(renaming_openai, data_dir):
+    analyzer = make_analyzer(data_dir, max_workers=8)
+
+    results = analyzer.analyze_people(["Петро Іваненко", "Олена Шевченко"])
+
+    # 12 articles mention both persons: one multi-person request, then one request per lost person
+    assert renaming_openai.schemas.count("article_multi_person_analysis") == 12
+    assert renaming_openai.schemas.count("article_analysis") == 2 * 12 + 4
+    for name, count in [("Петро Іваненко", 12), ("Олена Шевченко", 16)]:
+        detailed_results = results[name]["detailed_results"]
+        assert len(detailed_results) == count
+        assert all(isinstance(item[flag], bool) for item in detailed_results for flag in FLAGS)
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_create_chat_completion_retries_transient_errors(status):
+    server = FakeOpenAIServer(fail_first=2, fail_status=status).start()
+    try:
+        client = openai_client(base_url=server.base_url, api_key="fake")
+        response = create_chat_completion(client, base_delay=0.01, model="gpt-4o-mini",
+                                          messages=[{"role": "user", "content": "Summarize."}])
+    finally:
+        server.stop()
+
+    assert response.choices[0].message.content
+    assert server.requests == 3
+
+
+def test_create_chat_completion_gives_up_after_max_retries():
+    server = FakeOpenAIServer(fail_first=10).start()
+    try:
+        client = openai_client(base_url=server.base_url, api_key="fake")
+        with pytest.raises(openai.RateLimitError):
+            create_chat_completion(client, max_retries=2, base_delay=0.01, model="gpt-4o-mini",
+                                   messages=[{"role": "user", "content": "Summarize."}])
+    finally:
+        server.stop()
+
+    assert server.requests == 3
+
+
+def test_create_chat_completion_waits_for_retry_after():
+    server = FakeOpenAIServer(fail_first=1, retry_after=0.5).start()
+    try:
+        client = openai_client(base_url=server.base_url, api_key="fake")
+        start = time.perf_counter()
+        create_chat_completion(client, base_delay=0.01, model="gpt-4o-mini",
+                               messages=[{"role": "user", "content": "Summarize."}])
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    assert server.requests == 2
+    assert elapsed >= 0.5
+
+
+def test_openai_client_leaves_retries_to_create_chat_completion():
+    server = FakeOpenAIServer(fail_first=10, fail_status=503).start()
+    try:
+        client = openai_client(base_url=server.base_url, api_key="fake")
+        with pytest.raises(openai.InternalServerError):
+            create_chat_completion(client, max_retries=1, base_delay=0.01, model="gpt-4o-mini",
+                                   messages=[{"role": "user", "content": "Summarize."}])
+    finally:
+        server.stop()
+
+    assert server.requests == 2
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.perf_counter() - start >= 0.45
@@ -0,0 +1,122 @@
+import os
+import json
+
+import pytest
+
+from benchmarks.synthetic_corpus import generate_articles
+from src.tools.article_store import ArticleStore
+
+
+@pytest.fixture
+def articles():
+    return list(generate_articles(20, n_people=20))
+
+
+def test_put_and_get_round_trip(tmp_path, articles):
+    store = ArticleStore(str(tmp_path))
+    for article_id, article in articles:
+        store.put(article_id, article)
+
+    assert store.ids() == [article_id for article_id, _ in articles]
+    for article_id, article in articles:
+        assert store.get(article_id) == article
+        assert store.metadata(article_id) == {key: value for key, value in article.items() if key != "content"}
+    assert store.links() == {article["link"] for _, article in articles}
+    store.close()
+
+
+def test_overwrite_keeps_order_and_body(tmp_path, articles):
+    store = ArticleStore(str(tmp_path))
+    for article_id, article in articles:
+        store.put(article_id, article)
+    first_id, first = articles[0]
+
+    store.put(first_id, {**first, "content": "Новий текст статті"})
+    store.put(first_id, {"title": "Новий заголовок"})
+    store.update_entities(first_id, {"PER": ["Петро Іваненко"]})
+
+    assert store.ids()[0] == first_id and len(store) == len(articles)
+    assert store.get(first_id) == {"title": "Новий заголовок", "entities_included": {"PER": ["Петро Іваненко"]},
+                                   "content": "Новий текст статті"}
+    store.close()
+
+
+def test_compact_drops_replaced_bodies(tmp_path, articles):
+    store = ArticleStore(str(tmp_path))
+    for article_id, article in articles:
+        store.put(article_id, article)
+    for article_id, article in articles[::2]:
+        store.put(article_id, {**article, "content": article["content"].upper()})
+    assert store.stale_bytes == sum(len(article["content"].encode("utf-8")) for _, article in articles[::2])
+
+    store.compact()
+
+    assert store.stale_bytes == 0
+    for i, (article_id, article) in enumerate(articles):
+        expected = article["content"].upper() if i % 2 == 0 else article["content"]
+        assert store.read_content(article_id) == expected
+    store.close()
+
+
+def test_reopen_reads_what_was_written(tmp_path, articles):
+    store = ArticleStore(str(tmp_path))
+    for article_id, article in articles:
+        store.put(article_id, article)
+    store.put(articles[3][0], {**articles[3][1], "content": ""})
+    store.compact()
+    store.close()
+
+    reopened = ArticleStore(str(tmp_path))
+
+    assert reopened.ids() == [article_id for article_id, _ in articles]
+    assert reopened.get(articles[3][0])["content"] == ""
+    assert all(reopened.get(article_id) == article for article_id, article in articles if article_id != articles[3][0])
+    assert reopened.new_id(articles[0][1]["date"]) not in reopened
+    reopened.close()
+
+
+def write_legacy_store(path, articles):
+    """Write the content.bin and metadata.jsonl layout of earlier store versions."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, ArticleStore.CONTENT_FILE), "wb") as content, \
+            open(os.path.join(path, ArticleStore.LEGACY_METADATA_FILE), "w", encoding="utf-8") as metadata:
+        for article_id, article in articles:
+            data = article["content"].encode("utf-8")
+            record = {"id": article_id, "offset": content.tell(), "length": len(data),
+                      "metadata": {key: value for key, value in article.items() if key != "content"}}
+            content.write(data)
+            metadata.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def test_imports_legacy_metadata(tmp_path, articles):
+    write_legacy_store(str(tmp_path), articles)
+
+    store = ArticleStore(str(tmp_path))
+
+    assert store.ids() == [article_id for article_id, _ in articles]
+    assert all(store.get(article_id) == article for article_id, article in articles)
+    assert not os.path.exists(tmp_path / ArticleStore.LEGACY_METADATA_FILE)
+    store.close()
+
+
+def test_skips_incomplete_last_legacy_record(tmp_path, articles):
+    write_legacy_store(str(tmp_path), articles)
+    metadata_path = tmp_path / ArticleStore.LEGACY_METADATA_FILE
+    with open(metadata_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "31-12-2024_9.json", "offset": 0, "len')
+
+    store = ArticleStore(str(tmp_path))
+
+    assert store.ids() == [article_id for article_id, _ in articles]
+    store.close()
+
+
+def test_corrupt_legacy_record_before_the_last_fails(tmp_path, articles):
+    write_legacy_store(str(tmp_path), articles)
+    metadata_path = tmp_path / ArticleStore.LEGACY_METADATA_FILE
+    lines = metadata_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[2] = lines[2][:20] + "\n"
+    metadata_path.write_text("".join(lines), encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        ArticleStore(str(tmp_path))
@@ -0,0 +1,108 @@
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from src.tools.bihus_pipeline import BihusPipeline
+from src.tools.bihus_post_processing import IdentityIdentifier
+from src.tools.bihus_scrapper import BihusParser
+
+UNTIL_DATE = "2024-12-12"  # Articles 0-59 of the fixture list, three a day
+LISTED = 60
+
+
+@pytest.fixture
+def fixture_server():
+    servers = []
+
+    def start(**kwargs):
+        server = FixtureServer(n_people=50, n_articles=90, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def make_pipeline(server, tmp_path, model_path, **kwargs):
+    parser = BihusParser(base_url=f"{server.base_url}/wp-admin/admin-ajax.php", save_dir=str(tmp_path / "json"),
+                         store_dir=str(tmp_path / "store"), state_path=str(tmp_path / "state.json"),
+                         min_interval=0, timeout=5, retries=1)
+    parser.fetcher.backoff = 0.01
+    identifier = IdentityIdentifier(model_name=model_path, index_path=str(tmp_path / "index.json"),
+                                    manifest_path=str(tmp_path / "manifest.json"))
+    return BihusPipeline(parser, identifier, **kwargs)
+
+
+def test_pipeline_stores_and_indexes_new_articles(fixture_server, tmp_path, model_path):
+    server = fixture_server()
+    pipeline = make_pipeline(server, tmp_path, model_path)
+
+    stored_ids = pipeline.run(UNTIL_DATE, posts_per_page=10)
+
+    assert len(stored_ids) == len(pipeline.store) == LISTED
+    assert all(pipeline.store.metadata(article_id)["entities_included"]["PER"] for article_id in stored_ids)
+    assert len(pipeline.identifier.person_index) == LISTED
+    assert pipeline.parser.state.last_link == f"{server.base_url}/news/0/"
+
+    pipeline = make_pipeline(server, tmp_path, model_path)
+    assert pipeline.run(UNTIL_DATE, posts_per_page=10) == []
+
+
+def test_pipeline_fetches_articles_while_listing(fixture_server, tmp_path, model_path):
+    server = fixture_server()
+    pipeline = make_pipeline(server, tmp_path, model_path, queue_size=4)
+
+    pipeline.run(UNTIL_DATE, posts_per_page=10)
+
+    listing_requests = [i for i, path in enumerate(server.paths) if path == "/wp-admin/admin-ajax.php"]
+    article_requests = [i for i, path in enumerate(server.paths) if path.startswith("/news/")]
+    assert len(listing_requests) == LISTED // 10 + 1
+    assert article_requests[0] < listing_requests[1]
+
+
+def test_pipeline_skips_failed_articles_until_they_are_fetched(fixture_server, tmp_path, model_path):
+    server = fixture_server(article_failures={5: 2})
+    failed_link = f"{server.base_url}/news/5/"
+    pipeline = make_pipeline(server, tmp_path, model_path)
+
+    assert len(pipeline.run(UNTIL_DATE, posts_per_page=10)) == LISTED - 1
+    assert failed_link not in pipeline.store.links()
+    assert failed_link not in pipeline.parser.state
+    assert pipeline.parser.state.last_link is None
+
+    pipeline = make_pipeline(server, tmp_path, model_path)
+    stored_ids = pipeline.run(UNTIL_DATE, posts_per_page=10)
+
+    assert [pipeline.store.metadata(article_id)["link"] for article_id in stored_ids] == [failed_link]
+    assert pipeline.store.get(stored_ids[0])["content"]
+    assert pipeline.parser.state.last_link == f"{server.base_url}/news/0/"
+
+
+def test_producer_stops_when_the_consumer_fails(fixture_server, tmp_path, model_path, monkeypatch):
+    server = fixture_server()
+    pipeline = make_pipeline(server, tmp_path, model_path, queue_size=2)
+    produced = []
+    produce = pipeline._produce
+
+    def record_produce(*args):
+        produce(*args)
+        produced.append(True)
+
+    monkeypatch.setattr(pipeline, "_produce", record_produce)
+    put = pipeline.store.put
+    stored = []
+
+    def failing_put(article_id, article):
+        if len(stored) == 5:
+            raise OSError("disk full")
+        put(article_id, article)
+        stored.append(article["link"])
+
+    monkeypatch.setattr(pipeline.store, "put", failing_put)
+
+    with pytest.raises(OSError):
+        pipeline.run(UNTIL_DATE, posts_per_page=10)
+
+    assert produced == [True]
+    assert server.requests < LISTED
+    assert all(link in pipeline.parser.state for link in stored)
@@ -0,0 +1,107 @@
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from src.tools.bihus_scrapper import BihusParser
+
+UNTIL_DATE = "2024-12-22"  # Articles 0-29 of the fixture list, three a day
+LISTED = 30
+
+
+@pytest.fixture
+def fixture_server():
+    servers = []
+
+    def start(**kwargs):
+        server = FixtureServer(n_people=50, n_articles=60, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def make_parser(server, tmp_path, **kwargs):
+    parser = BihusParser(base_url=f"{server.base_url}/wp-admin/admin-ajax.php", save_dir=str(tmp_path / "json"),
+                         store_dir=str(tmp_path / "store"), state_path=str(tmp_path / "state.json"),
+                         min_interval=0, timeout=5, **kwargs)
+    parser.fetcher.backoff = 0.01
+    return parser
+
+
+def stored_articles(parser):
+    return {metadata["link"]: parser.store.get(article_id) for article_id, metadata in parser.store.iter_metadata()}
+
+
+def test_crawl_saves_every_listed_article(fixture_server, tmp_path):
+    server = fixture_server()
+    parser = make_parser(server, tmp_path)
+
+    parser.parse_until_date(UNTIL_DATE, posts_per_page=10)
+
+    articles = stored_articles(parser)
+    assert set(articles) == {f"{server.base_url}/news/{i}/" for i in range(LISTED)}
+    assert all(article["content"] and "<p>" not in article["content"] for article in articles.values())
+    assert parser.state.last_link == f"{server.base_url}/news/0/"
+
+
+def test_incremental_crawl_fetches_nothing_new(fixture_server, tmp_path):
+    server = fixture_server()
+    make_parser(server, tmp_path).parse_until_date(UNTIL_DATE, posts_per_page=10)
+    requests = server.requests
+
+    parser = make_parser(server, tmp_path)
+    parser.parse_until_date(UNTIL_DATE, posts_per_page=10)
+
+    assert server.requests == requests + 1  # The first listing page reaches the watermark
+    assert len(parser.store) == LISTED
+
+
+def test_transient_article_failures_are_retried(fixture_server, tmp_path):
+    server = fixture_server(article_failures={3: 1, 7: 2})
+    parser = make_parser(server, tmp_path, retries=2)
+
+    parser.parse_until_date(UNTIL_DATE, posts_per_page=10)
+
+    assert len(parser.store) == LISTED
+    assert server.article_requests[3] == 2 and server.article_requests[7] == 3
+
+
+def test_failed_article_is_not_saved_and_fetched_again(fixture_server, tmp_path):
+    server = fixture_server(article_failures={5: 2})
+    failed_link = f"{server.base_url}/news/5/"
+    parser = make_parser(server, tmp_path, retries=1)
+
+    parser.parse_until_date(UNTIL_DATE, posts_per_page=10)
+
+    assert failed_link not in stored_articles(parser)
+    assert failed_link not in parser.state
+    assert parser.state.last_link is None
+
+    parser = make_parser(server, tmp_path, retries=1)
+    parser.parse_until_date(UNTIL_DATE, posts_per_page=10)
+
+    assert stored_articles(parser)[failed_link]["content"]
+    assert len(parser.store) == LISTED
+    assert server.article_requests[5] == 3
+    assert all(server.article_requests[i] == 1 for i in range(LISTED) if i != 5)
+
+
+def test_fetch_article_contents_bounds_requests_in_flight(fixture_server, tmp_path):
+    server = fixture_server(latency=0.02)
+    parser = make_parser(server, tmp_path, max_workers=4, max_per_host=4)
+    links = [f"{server.base_url}/news/{i}/" for i in range(40)]
+    submitted = []
+
+    def lazy_links():
+        for link in links:
+            submitted.append(link)
+            yield link
+
+    contents = parser.fetch_article_contents(lazy_links(), max_in_flight=6)
+    first = next(contents)
+    assert len(submitted) == 6
+
+    contents = [first, *contents]
+    assert contents == [parser.fetch_article_content(link) for link in links]
+    assert 1 < server.max_in_flight <= 4
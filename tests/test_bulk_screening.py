@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.synthetic_corpus import generate_articles, write_store
+from src.tools.bihus_analyser import ArticleAnalyzer
+from src.tools.bulk_screening import BulkScreener
+from src.tools.declaration_analysis import DeclarationAnalysisTool
+from src.tools.declaration_scrapping import ScrapingTool
+from src.tools.instrumentation import trace
+
+PEOPLE = 10
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    server = FixtureServer(n_people=PEOPLE).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    server = FakeOpenAIServer().start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    path = str(tmp_path / "store")
+    write_store(path, generate_articles(60, n_people=PEOPLE, persons_per_article=4))
+    return path
+
+
+def make_screener(fixtures, store_dir, tmp_path, **kwargs):
+    scraping_tool = ScrapingTool(use_cache=False, store_path=None)
+    scraping_tool.base_url = fixtures.base_url
+    analyzer = ArticleAnalyzer(store_dir=store_dir, index_path=None, use_cache=False, verdicts_path=None, max_workers=4)
+    return BulkScreener(str(tmp_path / "results.jsonl"), max_workers=2, scraping_tool=scraping_tool,
+                        declaration_analysis_tool=DeclarationAnalysisTool(use_cache=False), analyzer=analyzer,
+                        **kwargs)
+
+
+def read_results(screener):
+    with open(screener.output_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_batch_sends_shared_articles_once(fixtures, fake_openai, store_dir, tmp_path):
+    screener = make_screener(fixtures, store_dir, tmp_path, batch_size=4)
+    urls = [fixtures.person_url(i) for i in range(4)]
+
+    with trace() as run_trace:
+        assert screener.run(urls) == 4
+
+    results = read_results(screener)
+    assert [result["url"] for result in results] == urls
+    matched = [item["link"] for result in results for item in result["bihus_analysis"]["detailed_results"]]
+    assert all(result["bihus_analysis"]["detailed_results"] for result in results)
+    llm = run_trace.to_dict()["llm"]
+    article_requests = llm["article_analysis_multi"]["calls"] + llm.get("article_analysis", {}).get("calls", 0)
+    assert article_requests == len(set(matched)) < len(matched)
+
+
+def test_rerun_skips_screened_politicians(fixtures, fake_openai, store_dir, tmp_path):
+    urls = [fixtures.person_url(i) for i in range(4)]
+    make_screener(fixtures, store_dir, tmp_path, batch_size=2).run(urls)
+    requests = fixtures.requests
+
+    screener = make_screener(fixtures, store_dir, tmp_path, batch_size=2)
+
+    assert screener.completed_urls() == set(urls)
+    assert screener.run(urls + urls[:2]) == 0
+    assert fixtures.requests == requests
+    assert [result["url"] for result in read_results(screener)] == urls
+
+
+def test_resumes_after_an_interrupted_write(fixtures, fake_openai, store_dir, tmp_path):
+    urls = [fixtures.person_url(i) for i in range(4)]
+    screener = make_screener(fixtures, store_dir, tmp_path, batch_size=2)
+    screener.run(urls)
+    with open(screener.output_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(screener.output_path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:-1])
+        f.write(lines[-1][:len(lines[-1]) // 2])
+
+    screener = make_screener(fixtures, store_dir, tmp_path, batch_size=2)
+
+    assert screener.completed_urls() == set(urls[:-1])
+    assert screener.run(urls) == 1
+    assert screener.completed_urls() == set(urls)
+    with open(screener.output_path, "r", encoding="utf-8") as f:
+        assert json.loads(f.readlines()[-1])["url"] == urls[-1]
+
+
+def test_failed_politicians_are_retried(fixtures, fake_openai, store_dir, tmp_path):
+    missing_url = f"{fixtures.base_url}/missing/"
+    urls = [fixtures.person_url(0), missing_url, fixtures.person_url(1)]
+    screener = make_screener(fixtures, store_dir, tmp_path, batch_size=3)
+
+    assert screener.run(urls) == 2
+    assert screener.completed_urls() == set(urls) - {missing_url}
+
+    assert screener.run(urls) == 0
+    results = read_results(screener)
+    assert [result["url"] for result in results if "error" in result] == [missing_url, missing_url]
+    assert len(results) == 4
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from src.const import CURRENCY_RATES_UAH_BY_YEAR, LARGE_GIFT_THRESHOLD_UAH, SUDDEN_CHANGE_MIN_UAH
+from src.tools.declaration_metrics import compute_declaration_indicators
+
+
+def declaration(year="2023", income=(), assets=(), real_estate=(), vehicles=(), gifts=()):
+    """A declaration in the SCRAPING_RESPONSE_SCHEMA layout, every amount given as (amount, currency)."""
+    return {
+        "year": year,
+        "financial_data": {
+            "income_including_gifts": (
+                [{"amount": amount, "currency": currency, "type": "Заробітна плата", "source": ""}
+                 for amount, currency in income]
+                + [{"amount": amount, "currency": currency, "type": "Подарунок у грошовій формі", "source": ""}
+                   for amount, currency in gifts]
+            ),
+            "assets": [{"amount": amount, "currency": currency} for amount, currency in assets],
+        },
+        "real_estate": [{"price": price, "currency": currency} for price, currency in real_estate],
+        "vehicles": [{"price": price, "currency": currency} for price, currency in vehicles],
+    }
+
+
+def test_unknown_currency_is_left_out_of_cash_totals():
+    indicators = compute_declaration_indicators([
+        declaration(assets=[(1000, "USD"), (5, "BTC")]),
+    ])
+
+    assert indicators["declarations"][0]["cash_and_assets_uah"] == round(1000 * CURRENCY_RATES_UAH_BY_YEAR[2023]["USD"], 2)
+    assert indicators["currency_conversion"] == {"unknown_currencies": ["BTC"], "unconverted_items": 1,
+                                                 "approximate_rate_years": []}
+    assert not indicators["clearly_zero"]
+
+
+def test_missing_year_uses_an_approximate_rate_shown_as_null():
+    indicators = compute_declaration_indicators([
+        declaration(year="", assets=[(100, "EUR")]),
+        declaration(year="2031", assets=[(100, "EUR")]),
+    ])
+
+    latest_eur = CURRENCY_RATES_UAH_BY_YEAR[max(CURRENCY_RATES_UAH_BY_YEAR)]["EUR"]
+    assert [row["cash_and_assets_uah"] for row in indicators["declarations"]] == [100 * latest_eur] * 2
+    assert indicators["currency_conversion"]["approximate_rate_years"] == [None, 2031]
+    assert json.loads(json.dumps(indicators))["currency_conversion"]["approximate_rate_years"] == [None, 2031]
+    assert not indicators["clearly_zero"]
+
+
+def test_uah_amounts_need_no_rate():
+    indicators = compute_declaration_indicators([declaration(year="", assets=[(100, "")], income=[(50, "грн")])])
+
+    assert indicators["declarations"][0]["cash_and_assets_uah"] == 100
+    assert indicators["currency_conversion"]["approximate_rate_years"] == []
+
+
+def test_zero_price_property_does_not_count():
+    indicators = compute_declaration_indicators([
+        declaration(income=[(100000, "")], real_estate=[(0, ""), (0, "USD")], vehicles=[(0, "")]),
+    ])
+
+    discrepancy = indicators["discrepancy_between_income_and_property"]
+    assert discrepancy["value"] == 0
+    assert discrepancy["max_property_uah"] == 0
+    assert discrepancy["property_to_income_ratio"] == 0
+    assert indicators["clearly_zero"]
+
+
+def test_property_without_income_has_no_ratio():
+    indicators = compute_declaration_indicators([declaration(real_estate=[(500000, "")])])
+
+    discrepancy = indicators["discrepancy_between_income_and_property"]
+    assert discrepancy["value"] == 2
+    assert discrepancy["property_to_income_ratio"] is None
+    assert json.dumps(indicators, allow_nan=False)
+    assert not indicators["clearly_zero"]
+
+
+@pytest.mark.parametrize("property_uah, expected", [(100000, 0), (100001, 1), (300000, 1), (300001, 2)])
+def test_discrepancy_ratio_boundaries(property_uah, expected):
+    indicators = compute_declaration_indicators([
+        declaration(year="2022", income=[(60000, "")], real_estate=[(property_uah, "")]),
+        declaration(year="2023", income=[(40000, "")], real_estate=[(property_uah, "")]),
+    ])
+
+    assert indicators["discrepancy_between_income_and_property"]["value"] == expected
+
+
+@pytest.mark.parametrize("gift_uah, expected", [(LARGE_GIFT_THRESHOLD_UAH - 1, False), (LARGE_GIFT_THRESHOLD_UAH, True)])
+def test_large_gift_threshold(gift_uah, expected):
+    indicators = compute_declaration_indicators([
+        declaration(gifts=[(gift_uah, "")], income=[(10 * LARGE_GIFT_THRESHOLD_UAH, "")]),
+    ])
+
+    assert indicators["presence_of_large_gifts"]["value"] is expected
+    assert indicators["presence_of_large_gifts"]["largest_gift_uah"] == gift_uah
+
+
+@pytest.mark.parametrize("change_uah, income_uah, expected", [
+    (SUDDEN_CHANGE_MIN_UAH, 0, False),
+    (SUDDEN_CHANGE_MIN_UAH + 1, 0, True),
+    (SUDDEN_CHANGE_MIN_UAH + 1, SUDDEN_CHANGE_MIN_UAH + 1, False),
+    (2 * SUDDEN_CHANGE_MIN_UAH, SUDDEN_CHANGE_MIN_UAH, True),
+])
+def test_sudden_change_threshold(change_uah, income_uah, expected):
+    indicators = compute_declaration_indicators([
+        declaration(year="2022", assets=[(1000000, "")]),
+        declaration(year="2023", assets=[(1000000 - change_uah, "")], income=[(income_uah, "")]),
+    ])
+
+    sudden = indicators["sudden_changes_in_declared_money"]
+    assert sudden["value"] is expected
+    assert sudden["declarations_with_sudden_change"] == ([2] if expected else [])
+    assert sudden["largest_change_uah"] == change_uah
+
+
+def test_first_declaration_is_never_a_sudden_change():
+    indicators = compute_declaration_indicators([declaration(assets=[(10 * SUDDEN_CHANGE_MIN_UAH, "")])])
+
+    assert not indicators["sudden_changes_in_declared_money"]["value"]
+
+
+@pytest.mark.parametrize("change_uah, property_uah, expected", [
+    (SUDDEN_CHANGE_MIN_UAH / 2 - 1, 50000, True),
+    (SUDDEN_CHANGE_MIN_UAH / 2, 50000, False),
+    (0, 50001, False),
+])
+def test_clearly_zero_margins(change_uah, property_uah, expected):
+    indicators = compute_declaration_indicators([
+        declaration(year="2022", assets=[(500000, "")], income=[(50000, "")]),
+        declaration(year="2023", assets=[(500000 + change_uah, "")], income=[(50000, "")],
+                    real_estate=[(property_uah, "")]),
+    ])
+
+    assert indicators["clearly_zero"] is expected
+
+
+def test_no_declarations():
+    indicators = compute_declaration_indicators([])
+
+    assert indicators["declarations"] == []
+    assert indicators["clearly_zero"]
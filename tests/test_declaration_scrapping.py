@@ -0,0 +1,52 @@
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.fixture_server import FixtureServer
+from src.tools.declaration_scrapping import ScrapingTool
+from src.tools.instrumentation import trace
+
+DECLARATIONS = 4
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    server = FixtureServer(n_people=10, declarations_per_person=DECLARATIONS, llm_every=2).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    server = FakeOpenAIServer().start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    yield server
+    server.stop()
+
+
+def make_tool(fixtures, **kwargs):
+    tool = ScrapingTool(use_cache=False, store_path=None, **kwargs)
+    tool.base_url = fixtures.base_url
+    return tool
+
+
+def test_records_fetch_and_extraction_spans(fixtures, fake_openai):
+    tool = make_tool(fixtures, use_fast_path=True)
+
+    with trace() as active:
+        declarations = tool.extract_declarations_data(fixtures.person_url(0))
+
+    stages = active.to_dict()["stages"]
+    assert len(declarations) == DECLARATIONS
+    assert stages["declaration_page_fetch"]["count"] == DECLARATIONS
+    assert stages["declaration_extraction_fast_path"]["count"] == tool.fast_path_stats["fast_path"]
+    assert stages["declaration_extraction_llm"]["count"] == tool.fast_path_stats["llm"] == fake_openai.requests
+    assert fake_openai.requests > 0
+
+
+def test_reports_fast_path_ratio_only_when_enabled(fixtures, fake_openai, capsys):
+    make_tool(fixtures).extract_declarations_data(fixtures.person_url(1))
+    assert "Fast path served" not in capsys.readouterr().out
+
+    make_tool(fixtures, use_fast_path=True).extract_declarations_data(fixtures.person_url(1))
+    assert "Fast path served" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+from fuzzywuzzy import fuzz as fuzzywuzzy_fuzz
+from rapidfuzz import fuzz
+
+from benchmarks.synthetic_corpus import generate_articles, people, name_variant, ORGS, PLACES
+from src.tools.entity_clustering import merge_entity_variants
+
+
+def pairwise_merge(entity_list, threshold=80, ratio=lambda a, b: round(fuzz.ratio(a, b))):
+    """Compare every entity with every kept entity, as merge_variants originally did."""
+    unique_entities = []
+    for entity in entity_list:
+        if not any(ratio(entity, unique_entity) > threshold for unique_entity in unique_entities):
+            unique_entities.append(entity)
+    return unique_entities
+
+
+def test_merges_name_variants_in_order():
+    entities = ["Петро Іваненко", "НАБУ", "Петра Іваненка", "Петро Іваненко", "Олена Шевченко", "Петро Іваненк"]
+
+    assert merge_entity_variants(entities) == ["Петро Іваненко", "НАБУ", "Олена Шевченко"]
+
+
+def test_same_clusters_as_pairwise_merge_on_fixture_articles():
+    for _, article in generate_articles(200, persons_per_article=6):
+        for entity_list in article["entities_included"].values():
+            entity_list = entity_list + entity_list[::-1]
+            clusters = merge_entity_variants(entity_list)
+
+            assert clusters == pairwise_merge(entity_list)
+            assert clusters == pairwise_merge(entity_list, ratio=fuzzywuzzy_fuzz.ratio)
+
+
+def test_same_clusters_as_pairwise_merge_on_large_entity_lists():
+    rng = random.Random(1)
+    population = people(2000)
+    entities = [rng.choice([name_variant(rng.choice(population), rng), rng.choice(ORGS), rng.choice(PLACES)])
+                for _ in range(2000)]
+
+    assert merge_entity_variants(entities) == pairwise_merge(entities)
+
+
+@pytest.mark.parametrize("threshold", [30, 50, 70, 80, 90])
+def test_filter_never_drops_a_merge(threshold):
+    # Short strings over a small alphabet, spaces included, exercise the edge cases of the q-gram bound
+    rng = random.Random(threshold)
+    for _ in range(500):
+        entities = ["".join(rng.choice("ab c") for _ in range(rng.randint(0, 7))) for _ in range(rng.randint(1, 30))]
+
+        assert merge_entity_variants(entities, threshold) == pairwise_merge(entities, threshold)
@@ -0,0 +1,106 @@
+import os
+import re
+import json
+import copy
+from collections import Counter
+
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.fixture_server import FIXTURES_DIR, FixtureServer
+from src.tools.declaration_scrapping import ScrapingTool
+from src.tools.html_reducer import DROPPED_TAGS, reduce_declaration_html
+
+SECTIONS = {"real_estate": "Об'єкти нерухомості", "vehicles": "Транспортні засоби"}
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    server = FixtureServer(n_people=50)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_openai():
+    server = FakeOpenAIServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def scraping_tool(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    return ScrapingTool(store_path=None, reduce_html=True)
+
+
+def saved_pages(fixtures):
+    """Rendered samples of every saved page template in benchmarks/fixtures, keyed by template name."""
+    return {
+        "youcontrol_declaration": [fixtures.declaration_page(i, k) for i in range(8) for k in range(4)],
+        "youcontrol_person": [fixtures.person_page(i) for i in range(4)],
+        "bihus_article": [fixtures.bihus_article(i) for i in range(4)],
+        "bihus_list_item": [f"<main>{json.loads(fixtures.bihus_list(offset, 24))['html']}</main>" for offset in (0, 24)],
+    }
+
+
+def page_node(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.find("div", class_="wrapper") or soup.find("main") or soup
+
+
+def tokens(text):
+    """Whitespace tokens of a text, without the table, heading and bullet markup of the reduced text."""
+    return Counter(token for token in text.split() if not re.fullmatch(r"[|#-]+", token))
+
+
+def test_every_saved_page_has_samples(fixtures):
+    templates = {name[:-len(".html")] for name in os.listdir(FIXTURES_DIR) if name.endswith(".html")}
+
+    assert templates == set(saved_pages(fixtures))
+
+
+def test_reduced_text_keeps_every_visible_token(fixtures):
+    for name, pages in saved_pages(fixtures).items():
+        for html in pages:
+            node = page_node(html)
+            visible = copy.copy(node)
+            for tag in visible.find_all(DROPPED_TAGS):
+                tag.decompose()
+
+            assert tokens(reduce_declaration_html(node)) == tokens(visible.get_text(separator=" ")), name
+
+
+def test_extraction_matches_with_and_without_reduction(fixtures, fake_openai, scraping_tool):
+    for i in range(8):
+        for k in range(4):
+            soup = BeautifulSoup(fixtures.declaration_page(i, k), "html.parser")
+            wrapper = soup.find("div", class_="wrapper")
+            extracted = {}
+            for reduce_html in (False, True):
+                scraping_tool.reduce_html = reduce_html
+                body = {
+                    "messages": [{"role": "system", "content": scraping_tool.prompt},
+                                 {"role": "user", "content": scraping_tool.build_question(wrapper)}],
+                    "response_format": scraping_tool.response_format,
+                }
+                extracted[reduce_html] = fake_openai.complete(body)
+
+            assert extracted[False] == extracted[True]
+            declaration = scraping_tool.parser.parse(wrapper)[0]
+            surname, name = fixtures._full_name(i).split()[:2]
+            assert (declaration["politician_surname"], declaration["politician_name"]) == (surname, name)
+            assert declaration["year"] == str(2024 - k)
+            for section, heading in SECTIONS.items():
+                table = soup.find("h2", string=heading).find_next("table")
+                assert len(declaration[section]) == len(table.find_all("tr")) - 1
+
+
+def test_reduced_question_is_smaller(fixtures, scraping_tool):
+    wrapper = page_node(fixtures.declaration_page(0, 0))
+    scraping_tool.reduce_html = False
+    full_question = scraping_tool.build_question(wrapper)
+    scraping_tool.reduce_html = True
+
+    assert len(scraping_tool.build_question(wrapper)) < len(full_question)
@@ -0,0 +1,87 @@
+import socket
+import time
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from src.tools.http_client import HttpFetcher
+
+
+@pytest.fixture
+def fixture_server():
+    servers = []
+
+    def start(**kwargs):
+        server = FixtureServer(n_people=10, n_articles=50, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def article_url(server, i):
+    return f"{server.base_url}/news/{i}/"
+
+
+def test_retries_transient_status_then_succeeds(fixture_server):
+    server = fixture_server(article_failures={0: 2})
+    fetcher = HttpFetcher(retries=3, backoff=0.01)
+
+    response = fetcher.get(article_url(server, 0))
+
+    assert response.status_code == 200
+    assert server.article_requests[0] == 3
+
+
+def test_gives_up_after_max_retries(fixture_server):
+    server = fixture_server(article_failures={0: 10})
+    fetcher = HttpFetcher(retries=2, backoff=0.01)
+
+    response = fetcher.get(article_url(server, 0))
+
+    assert response.status_code == 503
+    assert server.article_requests[0] == 3
+
+
+def test_does_not_retry_client_errors(fixture_server):
+    server = fixture_server()
+    fetcher = HttpFetcher(retries=3, backoff=0.01)
+
+    response = fetcher.get(f"{server.base_url}/missing/")
+
+    assert response.status_code == 404
+    assert server.requests == 1
+
+
+def test_returns_none_when_every_attempt_raises():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    fetcher = HttpFetcher(retries=1, backoff=0.01, timeout=1)
+
+    assert fetcher.get(f"http://127.0.0.1:{port}/news/0/") is None
+
+
+def test_caps_concurrent_requests_per_host(fixture_server):
+    server = fixture_server(latency=0.1)
+    fetcher = HttpFetcher(max_workers=8, max_per_host=2)
+    urls = [article_url(server, i) for i in range(8)]
+
+    responses = fetcher.fetch_all(urls)
+
+    assert [response.status_code for response in responses] == [200] * 8
+    assert [response.url for response in responses] == urls
+    assert server.max_in_flight == 2
+
+
+def test_spaces_requests_to_a_host_by_min_interval(fixture_server):
+    server = fixture_server()
+    fetcher = HttpFetcher(max_workers=8, max_per_host=8, min_interval=0.1)
+
+    start = time.perf_counter()
+    fetcher.fetch_all([article_url(server, i) for i in range(5)])
+
+    assert time.perf_counter() - start >= 0.4
+    assert server.requests == 5
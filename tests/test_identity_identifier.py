@@ -0,0 +1,79 @@
+import os
+import json
+
+import pytest
+
+from benchmarks.synthetic_corpus import generate_articles, write_json
+from src.tools.article_store import ArticleStore
+from src.tools.bihus_post_processing import IdentityIdentifier
+
+
+@pytest.fixture
+def articles():
+    return list(generate_articles(30, n_people=50))
+
+
+def make_identifier(tmp_path, model_path, **kwargs):
+    identifier = IdentityIdentifier(str(tmp_path / "json"), str(tmp_path / "identity"), model_name=model_path,
+                                    index_path=str(tmp_path / "index.json"),
+                                    manifest_path=str(tmp_path / "manifest.json"), **kwargs)
+    processed = []
+    process_articles = identifier.process_articles
+
+    def record(items):
+        for article_id, article in process_articles(items):
+            processed.append(article_id)
+            yield article_id, article
+
+    identifier.process_articles = record
+    return identifier, processed
+
+
+def test_second_json_run_skips_unchanged_articles(tmp_path, model_path, articles):
+    write_json(str(tmp_path / "json"), articles)
+    identifier, processed = make_identifier(tmp_path, model_path)
+    identifier.process_all_jsons()
+    assert sorted(processed) == sorted(article_id for article_id, _ in articles)
+
+    # Rewriting a file with other formatting and metadata keeps its content, and so its hash
+    first_id, first = articles[0]
+    with open(tmp_path / "json" / first_id, "w", encoding="utf-8") as f:
+        json.dump(dict(first, title="Новий заголовок"), f, ensure_ascii=False, indent=4)
+    changed_id, changed = articles[1]
+    with open(tmp_path / "json" / changed_id, "w", encoding="utf-8") as f:
+        json.dump(dict(changed, content=changed["content"] + "\nПетро Іваненко"), f, ensure_ascii=False)
+
+    identifier, processed = make_identifier(tmp_path, model_path)
+    identifier.process_all_jsons()
+
+    assert processed == [changed_id]
+
+
+def test_second_store_run_skips_unchanged_articles(tmp_path, model_path, articles):
+    store = ArticleStore(str(tmp_path / "store"))
+    for article_id, article in articles:
+        store.put(article_id, article)
+    store.close()
+    identifier, processed = make_identifier(tmp_path, model_path, store_dir=str(tmp_path / "store"))
+    identifier.process_store()
+    assert processed == [article_id for article_id, _ in articles]
+
+    identifier, processed = make_identifier(tmp_path, model_path, store_dir=str(tmp_path / "store"))
+    identifier.process_store()
+
+    assert processed == []
+
+
+def test_json_and_store_runs_share_the_manifest(tmp_path, model_path, articles):
+    write_json(str(tmp_path / "json"), articles)
+    identifier, _ = make_identifier(tmp_path, model_path)
+    identifier.process_all_jsons()
+
+    store = ArticleStore(str(tmp_path / "store"))
+    store.import_json(str(tmp_path / "identity"))
+    store.close()
+    identifier, processed = make_identifier(tmp_path, model_path, store_dir=str(tmp_path / "store"))
+    identifier.process_store()
+
+    assert processed == []
+    assert len(os.listdir(tmp_path / "identity")) == len(articles)
@@ -0,0 +1,119 @@
+import json
+import re
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.tools import instrumentation
+from src.tools.instrumentation import (Metrics, current_trace, estimate_cost, propagate, record_cache_hit,
+                                       record_llm_call, span, start_metrics_server, trace)
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    """Give every test its own process-wide Metrics."""
+    metrics = Metrics()
+    monkeypatch.setattr(instrumentation, "_metrics", metrics)
+    return metrics
+
+
+def test_trace_collects_spans_and_llm_calls(fresh_metrics):
+    with trace() as active:
+        with span("declaration_fetch"):
+            pass
+        record_llm_call("article_analysis", "gpt-4o-mini", 0.5, prompt_tokens=1000, completion_tokens=100)
+        record_cache_hit("article_analysis")
+    record_llm_call("article_analysis", "gpt-4o-mini", 0.5)
+
+    data = active.to_dict()
+    assert [item["stage"] for item in data["spans"]] == ["declaration_fetch"]
+    assert data["llm"]["article_analysis"]["calls"] == 1
+    assert data["llm"]["article_analysis"]["cache_hits"] == 1
+    assert data["llm"]["article_analysis"]["cost_usd"] == estimate_cost("gpt-4o-mini", 1000, 100) > 0
+    assert fresh_metrics.to_dict()["llm"]["article_analysis"]["calls"] == 2
+    assert current_trace() is None
+
+
+def test_propagate_keeps_thread_pool_work_in_the_caller_trace(fresh_metrics):
+    def work(i):
+        with span("article_analysis"):
+            record_llm_call("article_analysis", "gpt-4o-mini", 0.1, prompt_tokens=i)
+        return current_trace()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with trace() as first:
+            first_traces = list(executor.map(propagate(work), range(8)))
+        with trace() as second:
+            second_traces = list(executor.map(propagate(work), range(3)))
+        untraced = list(executor.map(work, range(2)))
+
+    assert first_traces == [first] * 8 and second_traces == [second] * 3 and untraced == [None] * 2
+    assert first.to_dict()["stages"]["article_analysis"]["count"] == 8
+    assert first.to_dict()["llm"]["article_analysis"]["prompt_tokens"] == sum(range(8))
+    assert second.to_dict()["stages"]["article_analysis"]["count"] == 3
+    assert fresh_metrics.to_dict()["stages"]["article_analysis"]["count"] == 13
+
+
+def test_concurrent_traces_stay_separate():
+    results = {}
+
+    def screen(name):
+        with trace() as active:
+            for _ in range(50):
+                with span(name):
+                    pass
+        results[name] = active.to_dict()["stages"]
+
+    threads = [threading.Thread(target=screen, args=(f"stage_{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert {name: list(stages) for name, stages in results.items()} == {f"stage_{i}": [f"stage_{i}"] for i in range(4)}
+    assert all(stages[name]["count"] == 50 for name, stages in results.items())
+
+
+def test_prometheus_output(fresh_metrics):
+    with span("extraction"):
+        pass
+    with span("extraction"):
+        pass
+    record_llm_call("declaration_extraction", "gpt-4o-2024-08-06", 1.5, prompt_tokens=10, completion_tokens=5,
+                    error=True)
+
+    text = fresh_metrics.to_prometheus()
+
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            assert re.fullmatch(r"# (HELP govwatcher_\w+ .+|TYPE govwatcher_\w+ (counter|gauge))", line)
+        else:
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    assert text.endswith("\n")
+    assert samples['govwatcher_stage_runs_total{stage="extraction"}'] == 2
+    assert samples['govwatcher_stage_seconds_total{stage="extraction"}'] >= \
+        samples['govwatcher_stage_seconds_max{stage="extraction"}']
+    assert samples['govwatcher_llm_calls_total{call_site="declaration_extraction"}'] == 1
+    assert samples['govwatcher_llm_errors_total{call_site="declaration_extraction"}'] == 1
+    assert samples['govwatcher_llm_latency_seconds_total{call_site="declaration_extraction"}'] == 1.5
+    assert samples['govwatcher_llm_prompt_tokens_total{call_site="declaration_extraction"}'] == 10
+
+
+def test_metrics_server(fresh_metrics):
+    with span("extraction"):
+        pass
+    server = start_metrics_server(port=0, host="127.0.0.1")
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base_url}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert 'govwatcher_stage_runs_total{stage="extraction"} 1' in response.read().decode("utf-8")
+        with urllib.request.urlopen(f"{base_url}/metrics.json") as response:
+            assert json.load(response)["stages"]["extraction"]["count"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
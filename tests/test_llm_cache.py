@@ -0,0 +1,104 @@
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from src.tools import llm_cache
+from src.tools.llm_cache import LLMCache, make_cache_key
+from src.tools.llm_utils import cached_chat_completion, openai_client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache clock with one that only moves when advanced."""
+    class Clock:
+        now = 1_000_000.0
+
+        def time(self):
+            return self.now
+
+        def advance(self, seconds):
+            self.now += seconds
+
+    fake = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", fake.time)
+    return fake
+
+
+def fill(cache, clock, keys):
+    for key in keys:
+        cache.set(key, f"value of {key}")
+        clock.advance(1)
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), max_entries=3)
+    fill(cache, clock, ["a", "b", "c"])
+
+    assert cache.get("a") == "value of a"
+    clock.advance(1)
+    fill(cache, clock, ["d"])
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ["a", "c", "d"]] == ["value of a", "value of c", "value of d"]
+    assert cache.stats() == {"hits": 4, "misses": 1, "entries": 3}
+
+
+def test_overwriting_a_key_refreshes_it(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    fill(cache, clock, ["a", "b"])
+
+    cache.set("a", "new value")
+    clock.advance(1)
+    fill(cache, clock, ["c"])
+
+    assert cache.get("a") == "new value"
+    assert cache.get("b") is None
+
+
+def test_expires_entries_older_than_ttl(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), ttl_seconds=60)
+    cache.set("old", "old value")
+    clock.advance(30)
+    cache.set("new", "new value")
+
+    clock.advance(30)
+    assert cache.get("old") == "old value"
+
+    # Reading an entry does not extend its lifetime
+    clock.advance(1)
+    assert cache.get("old") is None
+    assert cache.get("new") == "new value"
+    assert cache.stats()["entries"] == 1
+
+
+def test_entries_survive_reopening(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite")
+    LLMCache(path).set("key", "value")
+
+    assert LLMCache(path).get("key") == "value"
+
+
+def test_cache_key_ignores_argument_order():
+    messages = [{"role": "user", "content": "Привіт"}]
+
+    assert make_cache_key(model="gpt-4o-mini", messages=messages, temperature=0.1) == \
+        make_cache_key(temperature=0.1, messages=messages, model="gpt-4o-mini")
+    assert make_cache_key(model="gpt-4o-mini", messages=messages) != \
+        make_cache_key(model="gpt-4o-mini", messages=messages, temperature=0.1)
+
+
+def test_cached_chat_completion_calls_the_api_once(tmp_path):
+    server = FakeOpenAIServer().start()
+    try:
+        client = openai_client(base_url=server.base_url, api_key="fake")
+        cache = LLMCache(str(tmp_path / "cache.sqlite"))
+        request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Summarize."}]}
+
+        first = cached_chat_completion(client, cache=cache, **request)
+        second = cached_chat_completion(client, cache=cache, **request)
+        uncached = cached_chat_completion(client, cache=cache, use_cache=False, **request)
+    finally:
+        server.stop()
+
+    assert first == second == uncached
+    assert server.requests == 2
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
@@ -0,0 +1,87 @@
+import pytest
+
+from src.tools.mention_windows import extract_mention_windows, mentions_person
+
+FILLER = "Депутати обговорили бюджет області на наступний рік"
+
+
+def article(*mentions, length=10):
+    """Article paragraphs with the given {index: sentence} mentions and filler everywhere else."""
+    mentions = dict(mentions)
+    return "\n".join(mentions.get(i, f"{FILLER} ({i}).") for i in range(length))
+
+
+@pytest.mark.parametrize("paragraph, expected", [
+    ("Петро Іваненко отримав подарунок.", True),
+    ("Іваненко Петро отримав подарунок.", True),       # Surname still matches on its own
+    ("Слідчі допитали Петра Іваненка.", True),         # Inflected full name
+    ("Про це заявив Іваненко.", True),                  # Surname-only reference
+    ("Про це заявив Іваненку.", True),                  # Inflected surname
+    ("Олена Шевченко отримала подарунок.", False),
+    ("Про це заявив Петро.", False),                    # First name alone is not enough
+])
+def test_mentions_person(paragraph, expected):
+    assert mentions_person(paragraph, "Петро Іваненко") is expected
+
+
+def test_short_surname_needs_the_full_name():
+    # A surname under 5 characters (e.g. "Кац") is too ambiguous to match alone
+    assert mentions_person("Борис Кац прокоментував рішення.", "Борис Кац")
+    assert not mentions_person("Про це заявив Кац.", "Борис Кац")
+
+
+def test_single_word_name_matches_only_as_a_whole():
+    assert mentions_person("Заява Бойко щодо бюджету.", "Бойко")
+    assert not mentions_person("Заява Бойченка щодо бюджету.", "Бойко")
+
+
+def test_keeps_context_around_every_mention():
+    content = article((2, "Петро Іваненко купив квартиру."), (7, "Іваненко відмовився коментувати."))
+
+    reduced, tokens_saved = extract_mention_windows(content, ["Петро Іваненко"], context=1)
+
+    paragraphs = content.split("\n")
+    assert reduced.split("\n") == paragraphs[1:4] + ["[...]"] + paragraphs[6:9]
+    assert tokens_saved > 0
+
+
+def test_merges_overlapping_and_adjacent_windows():
+    content = article((2, "Петро Іваненко купив квартиру."), (5, "Олена Шевченко продала авто."))
+    paragraphs = content.split("\n")
+
+    overlapping, _ = extract_mention_windows(content, ["Петро Іваненко", "Олена Шевченко"], context=2)
+    adjacent, _ = extract_mention_windows(content, ["Петро Іваненко", "Олена Шевченко"], context=1)
+
+    assert overlapping.split("\n") == paragraphs[0:8]
+    assert adjacent.split("\n") == paragraphs[1:7]
+
+
+def test_windows_are_clipped_to_the_article():
+    content = article((0, "Петро Іваненко купив квартиру."), (9, "Іваненко відмовився коментувати."))
+    paragraphs = content.split("\n")
+
+    reduced, _ = extract_mention_windows(content, ["Петро Іваненко"], context=3)
+
+    assert reduced.split("\n") == paragraphs[0:4] + ["[...]"] + paragraphs[6:10]
+
+
+def test_zero_context_keeps_only_mentions():
+    content = article((3, "Петро Іваненко купив квартиру."), (4, "Іваненко відмовився коментувати."))
+
+    reduced, _ = extract_mention_windows(content, ["Петро Іваненко"], context=0)
+
+    assert reduced == "Петро Іваненко купив квартиру.\nІваненко відмовився коментувати."
+
+
+def test_returns_full_content_without_mentions():
+    content = article()
+
+    assert extract_mention_windows(content, ["Петро Іваненко"]) == (content, 0)
+
+
+def test_ignores_blank_lines():
+    content = "Петро Іваненко купив квартиру.\n\n\n" + article(length=3)
+
+    reduced, _ = extract_mention_windows(content, ["Петро Іваненко"], context=1)
+
+    assert reduced == "Петро Іваненко купив квартиру.\n" + f"{FILLER} (0)."
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from benchmarks.synthetic_corpus import generate_articles, people, name_variant
+from src.tools.person_index import PersonIndex
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return dict(generate_articles(400, n_people=150, persons_per_article=4))
+
+
+def build_index(corpus, path=None):
+    index = PersonIndex(path)
+    for article_id, article in corpus.items():
+        index.add_article(article_id, article["entities_included"]["PER"])
+    return index
+
+
+def brute_force_lookup(articles, target_name, threshold=75):
+    """Scan every person of every article with fuzz.ratio, as ArticleAnalyzer.is_fuzzy_match did."""
+    return {
+        article_id for article_id, persons in articles.items()
+        if any(fuzz.ratio(target_name, person) >= threshold for person in persons)
+    }
+
+
+def targets(n, seed=0):
+    rng = random.Random(seed)
+    population = people(150)
+    return [name_variant(rng.choice(population), rng) for _ in range(n)] + ["Петро", "Невідома Особа", "І. І."]
+
+
+@pytest.mark.parametrize("threshold", [60, 75, 90])
+def test_lookup_matches_brute_force_scan(corpus, threshold):
+    index = build_index(corpus)
+    articles = {article_id: article["entities_included"]["PER"] for article_id, article in corpus.items()}
+
+    for target_name in targets(40, seed=threshold):
+        assert index.lookup(target_name, threshold) == brute_force_lookup(articles, target_name, threshold), target_name
+
+
+def test_lookup_after_removing_and_replacing_articles(corpus):
+    index = build_index(corpus)
+    removed = list(corpus)[::3]
+    for article_id in removed:
+        index.remove_article(article_id)
+    replaced = list(corpus)[1::7]
+    for article_id in replaced:
+        index.add_article(article_id, ["Замінена Особа"])
+    articles = {article_id: index.articles[article_id] for article_id in index.articles}
+
+    assert not (set(removed) - set(replaced)) & set(index.articles)
+    for target_name in targets(30) + ["Замінена Особа"]:
+        assert index.lookup(target_name) == brute_force_lookup(articles, target_name)
+
+
+def test_save_load_round_trip_with_removed_articles(corpus, tmp_path):
+    path = str(tmp_path / "index.json")
+    index = build_index(corpus, path)
+    for article_id in list(corpus)[::2]:
+        index.remove_article(article_id)
+    index.add_article("new.json", ["Нова Особа", "Петро Іваненко"])
+    index.save()
+
+    loaded = PersonIndex(path)
+
+    assert loaded.articles == index.articles
+    for target_name in targets(30) + ["Нова Особа"]:
+        assert loaded.lookup(target_name) == index.lookup(target_name)
+    loaded.add_article("newer.json", ["Нова Особа"])
+    assert loaded.lookup("Нова Особа") == {"new.json", "newer.json"}
+
+
+def test_load_rebuilds_index_saved_with_other_grams(corpus, tmp_path):
+    path = str(tmp_path / "index.json")
+    build_index(corpus, path).save()
+
+    loaded = PersonIndex(path, n=3)
+
+    assert loaded.lookup("Петро Іваненко") == build_index(corpus).lookup("Петро Іваненко")
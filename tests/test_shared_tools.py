@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic_corpus import generate_articles, write_store
+from src.tools.shared_tools import SharedTools
+from src.tools.verdict_store import VerdictStore
+
+
+@pytest.fixture
+def corpus_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    write_store("./bihus_store", generate_articles(20, n_people=50))
+    VerdictStore("./bihus_verdicts.sqlite").close()
+    return tmp_path
+
+
+def add_articles(seed):
+    write_store("./bihus_store", ((f"new-{seed}-{article_id}", article)
+                                  for article_id, article in generate_articles(5, n_people=50, seed=seed)))
+
+
+def is_closed(analyzer):
+    try:
+        len(analyzer.verdicts)
+    except sqlite3.ProgrammingError:
+        return analyzer.store._mmap is None
+    return False
+
+
+def test_reload_closes_unused_analyzer(corpus_dir):
+    tools = SharedTools(reload_interval=None)
+    previous = tools.analyzer
+
+    add_articles(seed=1)
+    assert tools.reload_if_changed()
+
+    assert tools.analyzer is not previous
+    assert len(tools.analyzer.articles) == 25
+    assert is_closed(previous)
+    assert not is_closed(tools.analyzer)
+
+
+def test_reloaded_analyzers_share_the_client_and_rate_limiter(corpus_dir):
+    tools = SharedTools(reload_interval=None)
+    previous = tools.analyzer
+
+    add_articles(seed=1)
+    assert tools.reload_if_changed()
+
+    assert tools.analyzer._client is previous._client is tools.client
+    assert tools.analyzer.rate_limiter is previous.rate_limiter is tools.rate_limiter
+    assert is_closed(previous)
+    assert not tools.client.is_closed()
+
+
+def test_reload_closes_analyzer_once_released(corpus_dir):
+    tools = SharedTools(reload_interval=None)
+
+    with tools.use_analyzer() as analyzer:
+        add_articles(seed=1)
+        assert tools.reload_if_changed()
+        assert not is_closed(analyzer)
+        assert analyzer.analyze_person("Неіснуюча Особа")["detailed_results"] == []
+        with tools.use_analyzer() as current:
+            assert current is tools.analyzer is not analyzer
+    assert is_closed(analyzer)
+    assert not is_closed(tools.analyzer)
+
+    with tools.use_analyzer() as analyzer:
+        pass
+    assert not is_closed(analyzer)
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.synthetic_corpus import generate_articles, write_store
+from src.tools.article_store import ArticleStore
+from src.tools.bihus_analyser import ArticleAnalyzer
+from src.tools.bihus_precompute import VerdictPrecomputer
+from src.tools.verdict_store import VERDICT_FIELDS, VerdictStore
+
+VERDICT = {"negative_mentions": True, "suspicious_activity": False, "suspicious_gifts_and_other": True,
+           "finished_investigation": False}
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    server = FakeOpenAIServer().start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    yield server
+    server.stop()
+
+
+def test_verdict_is_tied_to_the_content_hash(tmp_path):
+    store = VerdictStore(str(tmp_path / "verdicts.sqlite"))
+    store.put_many([("Петро Іваненко", "01-01-2024.json", "hash-1", VERDICT)])
+
+    assert store.get("Петро Іваненко", "01-01-2024.json", "hash-1") == VERDICT
+    assert store.get("Петро Іваненко", "01-01-2024.json", "hash-2") is None
+    assert store.get("Олена Шевченко", "01-01-2024.json", "hash-1") is None
+
+    store.put_many([("Петро Іваненко", "01-01-2024.json", "hash-2", dict.fromkeys(VERDICT_FIELDS, False))])
+
+    assert store.get("Петро Іваненко", "01-01-2024.json", "hash-1") is None
+    assert store.get("Петро Іваненко", "01-01-2024.json", "hash-2") == dict.fromkeys(VERDICT_FIELDS, False)
+    assert store.keys() == {("Петро Іваненко", "01-01-2024.json"): "hash-2"}
+    assert len(store) == 1
+    store.close()
+
+
+def test_verdicts_stored_without_a_hash_never_match(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE verdicts (person TEXT NOT NULL, article_id TEXT NOT NULL, "
+                       + ", ".join(f"{field} INTEGER NOT NULL" for field in VERDICT_FIELDS)
+                       + ", PRIMARY KEY (person, article_id))")
+    connection.execute("INSERT INTO verdicts VALUES ('Петро Іваненко', '01-01-2024.json', 1, 0, 1, 0)")
+    connection.commit()
+    connection.close()
+
+    store = VerdictStore(path)
+
+    assert store.keys() == {("Петро Іваненко", "01-01-2024.json"): None}
+    assert store.get("Петро Іваненко", "01-01-2024.json", "hash-1") is None
+    store.close()
+
+
+def test_changed_article_is_recomputed(tmp_path, fake_openai):
+    store_dir = str(tmp_path / "store")
+    articles = list(generate_articles(20, n_people=20))
+    write_store(store_dir, articles)
+    verdicts_path = str(tmp_path / "verdicts.sqlite")
+
+    def analyzer():
+        return ArticleAnalyzer(store_dir=store_dir, index_path=None, use_cache=False, verdicts_path=verdicts_path)
+
+    VerdictPrecomputer(analyzer(), verdicts_path).run()
+    pairs = sum(len(set(article["entities_included"]["PER"])) for _, article in articles)
+    assert len(VerdictStore(verdicts_path)) == pairs
+
+    target = articles[0][1]["entities_included"]["PER"][0]
+    requests = fake_openai.requests
+    precomputed = analyzer().analyze_person(target)
+    assert fake_openai.requests == requests
+
+    changed_id, changed = articles[0]
+    article_store = ArticleStore(store_dir)
+    article_store.put(changed_id, dict(changed, content=changed["content"] + "\nОновлено."))
+    article_store.close()
+
+    assert analyzer().analyze_person(target)["detailed_results"][1:] == precomputed["detailed_results"][1:]
+    assert fake_openai.requests == requests + 1
+
+    precomputer = VerdictPrecomputer(analyzer(), verdicts_path)
+    assert [(article_id, persons) for article_id, _, _, persons in precomputer.pending_articles()] == \
+        [(changed_id, list(dict.fromkeys(changed["entities_included"]["PER"])))]